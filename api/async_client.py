@@ -0,0 +1,157 @@
+"""
+Asynchronous HTTP client wrapper for the RESTful Booker API.
+
+Mirrors BaseClient (api/client.py) but runs on an asyncio transport provided by
+httpx. A single pooled httpx.AsyncClient is shared by all calls made through the
+client, and an asyncio.Semaphore caps how many requests may be in flight at once,
+so tests can fan out many booking operations concurrently without opening an
+unbounded number of connections.
+
+httpx is an optional dependency, imported on first use: importing this module
+costs nothing and works without it installed, but instantiating AsyncBaseClient
+then raises an ImportError with a hint.
+
+Calls made inside an api.deadline.deadline() block -- which follows asyncio tasks
+-- are cancelled when the remaining budget runs out, including time spent waiting
+for a concurrency slot.
+"""
+
+from api import deadline as deadlines
+from api import throttle as throttling
+from config import config
+
+
+class AsyncBaseClient:
+    """
+    Base asynchronous HTTP client for interacting with a REST API.
+
+    Attributes:
+        base_url (str): Base URL for the API (trailing slash is normalized away).
+        max_concurrency (int): Maximum number of requests allowed in flight at once.
+        throttle (Throttle | None): Rate and adaptive concurrency limit, when enabled.
+        client (httpx.AsyncClient): Shared, connection-pooled asyncio client.
+
+    Usage:
+        async with AsyncBookingAPI(BASE_URL) as api:
+            responses = await asyncio.gather(*(api.get_booking(i) for i in ids))
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, max_concurrency: int = 50, throttle=None):
+        """
+        Initialize the AsyncBaseClient.
+
+        Args:
+            base_url (str): Base URL of the target API. Any trailing slash is removed
+                            to ensure consistent endpoint concatenation.
+            max_connections (int): Upper bound on open connections in the pool.
+            max_keepalive_connections (int): Idle connections kept alive for reuse.
+            max_concurrency (int): Upper bound on concurrently awaited requests; extra
+                                   callers wait for a free slot instead of failing.
+            throttle (Throttle | bool): Rate and adaptive concurrency limit, as for
+                BaseClient; pass the sync client's instance to share its limits.
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("AsyncBaseClient requires httpx: pip install httpx") from None
+        # Normalize base_url by removing trailing slash for consistent endpoint formation
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        # One pooled client for the lifetime of this object; connections are reused
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+        )
+        # Created lazily so the client can be constructed outside a running event loop
+        self._semaphore = None
+        if throttle is None and config.THROTTLE_ENABLED:
+            throttle = throttling.shared(self.base_url)
+        elif throttle is True:
+            throttle = throttling.Throttle()
+        self.throttle = throttle or None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+
+    def set_token(self, token: str):
+        """
+        Set an authentication token on the client headers.
+
+        Args:
+            token (str): Authentication token value to include in request cookies.
+        """
+        # Same header contract as BaseClient.set_token
+        self.client.headers.update({
+            "Cookie": f"token={token}",
+            "Content-Type": "application/json"
+        })
+
+    async def _request(self, method: str, endpoint: str, **kwargs):
+        """
+        Send a request once a concurrency slot is available.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Path of the endpoint (should start with a slash).
+            **kwargs: Passed through to httpx.AsyncClient.request (e.g. json=).
+
+        Returns:
+            httpx.Response: The raw response object from httpx.
+
+        Raises:
+            DeadlineExceeded: If the active deadline (api/deadline.py) expired before
+                or during the call.
+        """
+        limit = deadlines.current()
+        if limit is None:
+            return await self._send(method, endpoint, **kwargs)
+        import asyncio  # already loaded by the running event loop
+
+        limit.check(f"{method} {endpoint}")
+        try:
+            return await asyncio.wait_for(self._send(method, endpoint, **kwargs), limit.remaining())
+        except asyncio.TimeoutError:
+            raise deadlines.DeadlineExceeded(
+                f"{limit.budget:g}s deadline exceeded during {method} {endpoint}") from None
+
+    async def _send(self, method: str, endpoint: str, **kwargs):
+        """Send one request once a concurrency slot (and throttle slot) is free."""
+        if self._semaphore is None:
+            import asyncio  # already loaded by the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            if self.throttle is None:
+                return await self.client.request(method, f"{self.base_url}{endpoint}", **kwargs)
+            url = f"{self.base_url}{endpoint}"
+            async with self.throttle.slot_async(method, url) as slot:
+                resp = await self.client.request(method, url, **kwargs)
+                slot.observe(resp)
+                return resp
+
+    async def get(self, endpoint: str):
+        """Send a GET request to the given endpoint."""
+        return await self._request("GET", endpoint)
+
+    async def post(self, endpoint: str, payload: dict):
+        """Send a POST request with a JSON payload."""
+        return await self._request("POST", endpoint, json=payload)
+
+    async def put(self, endpoint: str, payload: dict):
+        """Send a PUT request with a JSON payload (full resource replacement)."""
+        return await self._request("PUT", endpoint, json=payload)
+
+    async def patch(self, endpoint: str, payload: dict):
+        """Send a PATCH request with a JSON payload (partial resource update)."""
+        return await self._request("PATCH", endpoint, json=payload)
+
+    async def delete(self, endpoint: str):
+        """Send a DELETE request to the given endpoint."""
+        return await self._request("DELETE", endpoint)
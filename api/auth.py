@@ -0,0 +1,164 @@
+"""
+Cached authentication tokens for BookingAPI.
+
+TokenManager caches tokens per (base_url, username) so a process authenticates
+once instead of once per test or client. Tokens are reused until `ttl` seconds
+have passed or the service rejects them (BookingAPI refreshes on 403).
+
+Optionally the cache is also kept in a JSON file guarded by a file lock
+(`cache_file`), which lets parallel worker processes -- e.g. pytest-xdist
+workers of one run -- share a single token. The file holds test credentials'
+tokens in plain text; point it at a run-specific temporary path.
+
+filelock is an optional dependency, imported only once a cache file is in use:
+without it the file cache is disabled and tokens are only shared within the
+process.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import config
+
+
+def _file_lock(path: str):
+    """A FileLock for `path`, or None when filelock is not installed."""
+    try:
+        from filelock import FileLock
+    except ImportError:
+        return None
+    return FileLock(path)
+
+
+class AuthenticationError(Exception):
+    """The auth endpoint did not return a token (e.g. bad credentials)."""
+
+
+class TokenManager:
+    """
+    Thread-safe token cache keyed by (base_url, username).
+
+    Attributes:
+        ttl (float): Seconds a token is reused before a new one is requested.
+        cache_file (str | None): Shared JSON cache file; None keeps tokens in memory only.
+    """
+
+    def __init__(self, ttl: float = None, cache_file: Optional[str] = None):
+        """
+        Args:
+            ttl (float): Token lifetime in seconds (default: config.TOKEN_TTL).
+            cache_file (str | None): Path of the cross-process cache file
+                (default: config.TOKEN_CACHE_FILE; empty disables it).
+        """
+        self.ttl = config.TOKEN_TTL if ttl is None else ttl
+        self.cache_file = cache_file if cache_file is not None else (config.TOKEN_CACHE_FILE or None)
+        self._tokens: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        # Keys being authenticated right now; set once the attempt has finished
+        self._fetching: Dict[Tuple[str, str], threading.Event] = {}
+
+    @staticmethod
+    def _file_key(base_url: str, username: str) -> str:
+        return f"{base_url}|{username}"
+
+    def get_token(self, api, username: str, password: str, force_refresh: bool = False) -> str:
+        """
+        Return a valid token for `username` on `api.base_url`, authenticating if needed.
+
+        Args:
+            api (BookingAPI): Client used to call /auth on a cache miss.
+            username (str): Username to authenticate.
+            password (str): Password to authenticate.
+            force_refresh (bool): Ignore cached tokens (e.g. after a 403).
+
+        Raises:
+            AuthenticationError: if the service does not return a token.
+        """
+        key = (api.base_url, username)
+        with self._lock:
+            cached = self._tokens.get(key)
+            rejected = cached[0] if cached and force_refresh else None
+        while True:
+            with self._lock:
+                now = time.time()
+                cached = self._tokens.get(key)
+                if cached and cached[0] != rejected and cached[1] > now:
+                    return cached[0]
+                fetching = self._fetching.get(key)
+                if fetching is None:
+                    fetching = self._fetching[key] = threading.Event()
+                    break
+            # Another thread is authenticating for this key: wait for its token
+            # (or, if it failed, take over) instead of calling /auth as well
+            fetching.wait()
+        try:
+            # Outside self._lock: other keys, and cache hits, are not held up by /auth
+            token, expires_at = self._fetch(api, key, username, password, rejected, now)
+            with self._lock:
+                self._tokens[key] = (token, expires_at)
+            return token
+        finally:
+            with self._lock:
+                del self._fetching[key]
+            fetching.set()
+
+    def _fetch(self, api, key, username: str, password: str, rejected: Optional[str], now: float):
+        """A token from the shared file if it has a usable one, else from /auth."""
+        lock = _file_lock(self.cache_file + ".lock") if self.cache_file else None
+        if lock is None:
+            return self._authenticate(api, username, password)
+        with lock:
+            token, expires_at = self._from_file(key, rejected, now)
+            if token is None:
+                token, expires_at = self._authenticate(api, username, password)
+                self._to_file(key, token, expires_at)
+        return token, expires_at
+
+    def invalidate(self, base_url: str, username: str):
+        """Forget the in-process token for (base_url, username)."""
+        with self._lock:
+            self._tokens.pop((base_url, username), None)
+
+    def clear(self):
+        """Forget every in-process token (the shared file is left untouched)."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _authenticate(self, api, username: str, password: str) -> Tuple[str, float]:
+        resp = api.create_token(username, password)
+        try:
+            token = resp.json().get("token")
+        except ValueError:
+            token = None
+        if not token:
+            raise AuthenticationError(f"no token from {api.base_url}/auth (status {resp.status_code})")
+        return token, time.time() + self.ttl
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _from_file(self, key, rejected: Optional[str], now: float):
+        """Token from the shared file, unless expired or the one just rejected."""
+        entry = self._read_file().get(self._file_key(*key))
+        if entry and entry.get("expires_at", 0) > now and entry.get("token") != rejected:
+            return entry["token"], entry["expires_at"]
+        return None, 0.0
+
+    def _to_file(self, key, token: str, expires_at: float):
+        data = self._read_file()
+        data[self._file_key(*key)] = {"token": token, "expires_at": expires_at}
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.cache_file)
+
+
+# Process-wide default manager used by BookingAPI.authenticate
+token_manager = TokenManager()
@@ -1,9 +1,24 @@
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, List
+
+from api.async_client import AsyncBaseClient
+from api.auth import TokenManager, token_manager
+from api.bulk import DEFAULT_MAX_IN_FLIGHT, BulkResult, run_bulk, run_bulk_async, run_one
 from api.client import BaseClient
+from api.streaming import iter_json_array
+from config import config
+
+if TYPE_CHECKING:
+    # api.models pulls in pydantic; it is imported where a model method is first used
+    from api.models import BookingRecord
 
 # Module-level docstring:
 # This module provides a BookingAPI client that wraps the RESTful Booker API endpoints.
 # It extends BaseClient to reuse common HTTP methods (get, post, put, patch, delete)
 # and offers convenience methods for auth, booking CRUD, and health checks.
+# AsyncBookingAPI exposes the same methods as coroutines on top of AsyncBaseClient.
 
 class BookingAPI(BaseClient):
     """
@@ -17,8 +32,47 @@ class BookingAPI(BaseClient):
         - create authentication token
         - create, retrieve, update, partially update, delete bookings
         - perform a health check (ping)
+        - create, retrieve and delete many bookings concurrently (bulk methods)
+        - authenticate with a cached, shared token that is refreshed on 403
     """
 
+    # Set by authenticate(); enables the refresh-and-retry on 403 for writes
+    _credentials = None
+    _token_manager = None
+
+    def authenticate(self, username: str = config.USERNAME, password: str = config.PASSWORD,
+                     manager: TokenManager = None) -> str:
+        """
+        Authenticate using a cached token and set it on the session.
+
+        Tokens are cached per (base_url, username) by a TokenManager, so repeated
+        calls -- across clients, threads and, with a cache file, processes -- do not
+        hit /auth again. After this call, update/partial_update/delete requests that
+        get a 403 refresh the token once and are retried.
+
+        Args:
+            username (str): The username for authentication.
+            password (str): The password for authentication.
+            manager (TokenManager): Cache to use (default: api.auth.token_manager).
+
+        Returns:
+            str: The token now set on the session.
+        """
+        self._token_manager = manager or token_manager
+        self._credentials = (username, password)
+        token = self._token_manager.get_token(self, username, password)
+        self.set_token(token)
+        return token
+
+    def _with_auth_retry(self, send):
+        """Call `send()`; on 403 with cached credentials, refresh the token and retry once."""
+        resp = send()
+        if resp.status_code == 403 and self._credentials is not None:
+            username, password = self._credentials
+            self.set_token(self._token_manager.get_token(self, username, password, force_refresh=True))
+            resp = send()
+        return resp
+
     def create_token(self, username: str, password: str):
         """
         Create an authentication token for a user.
@@ -64,6 +118,48 @@ class BookingAPI(BaseClient):
         # Fetch booking details
         return self.get(f"/booking/{booking_id}")
 
+    def create_booking_model(self, booking: "BookingRecord"):
+        """
+        Create a booking from a BookingRecord and return the validated result.
+
+        The payload is sent with BookingRecord.to_json_bytes and the response is
+        validated with the fast-path models in api/models.py.
+
+        Args:
+            booking (BookingRecord): Booking to create.
+
+        Returns:
+            tuple[int, BookingRecord]: The new booking id and the booking as stored.
+
+        Raises:
+            requests.HTTPError: if the service answers with an error status.
+            BookingValidationError: if the response does not match the schema.
+        """
+        from api.models import BookingRecord
+
+        resp = self._request("POST", "/booking", data=booking.to_json_bytes(),
+                             headers={"Content-Type": "application/json"})
+        resp.raise_for_status()
+        data = resp.json()
+        return data["bookingid"], BookingRecord.from_dict(data["booking"])
+
+    def get_booking_model(self, booking_id: int) -> "BookingRecord":
+        """
+        Retrieve a booking by ID as a validated BookingRecord.
+
+        Args:
+            booking_id (int): The ID of the booking to retrieve.
+
+        Raises:
+            requests.HTTPError: if the service answers with an error status (e.g. 404).
+            BookingValidationError: if the response does not match the schema.
+        """
+        from api.models import BookingRecord
+
+        resp = self.get_booking(booking_id)
+        resp.raise_for_status()
+        return BookingRecord.from_json(resp.content)
+
     def update_booking(self, booking_id: int, booking_data: dict):
         """
         Replace an existing booking with new data.
@@ -76,7 +172,7 @@ class BookingAPI(BaseClient):
             The response from BaseClient.put for the /booking/{id} endpoint.
         """
         # Perform a full update (PUT) of the booking resource
-        return self.put(f"/booking/{booking_id}", booking_data)
+        return self._with_auth_retry(lambda: self.put(f"/booking/{booking_id}", booking_data))
 
     def partial_update(self, booking_id: int, data: dict):
         """
@@ -90,7 +186,7 @@ class BookingAPI(BaseClient):
             The response from BaseClient.patch for the /booking/{id} endpoint.
         """
         # Perform a partial update (PATCH) of the booking resource
-        return self.patch(f"/booking/{booking_id}", data)
+        return self._with_auth_retry(lambda: self.patch(f"/booking/{booking_id}", data))
 
     def delete_booking(self, booking_id: int):
         """
@@ -103,7 +199,93 @@ class BookingAPI(BaseClient):
             The response from BaseClient.delete for the /booking/{id} endpoint.
         """
         # Delete the booking resource
-        return self.delete(f"/booking/{booking_id}")
+        return self._with_auth_retry(lambda: self.delete(f"/booking/{booking_id}"))
+
+    def create_bookings(self, bookings: Iterable[dict], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> List[BulkResult]:
+        """
+        Create many bookings concurrently.
+
+        Args:
+            bookings (Iterable[dict]): Booking payloads to create.
+            max_in_flight (int): Maximum number of concurrent requests.
+
+        Returns:
+            list[BulkResult]: One result per payload, in input order. Failed items
+            are reported on their result (see BulkResult.ok) instead of raising.
+        """
+        return run_bulk(self.create_booking, bookings, max_in_flight)
+
+    def get_bookings(self, booking_ids: Iterable[int], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> List[BulkResult]:
+        """
+        Retrieve many bookings concurrently.
+
+        Args:
+            booking_ids (Iterable[int]): IDs of the bookings to retrieve.
+            max_in_flight (int): Maximum number of concurrent requests.
+
+        Returns:
+            list[BulkResult]: One result per id, in input order.
+        """
+        return run_bulk(self.get_booking, booking_ids, max_in_flight)
+
+    def delete_bookings(self, booking_ids: Iterable[int], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> List[BulkResult]:
+        """
+        Delete many bookings concurrently. Requires a token (see set_token).
+
+        Args:
+            booking_ids (Iterable[int]): IDs of the bookings to delete.
+            max_in_flight (int): Maximum number of concurrent requests.
+
+        Returns:
+            list[BulkResult]: One result per id, in input order.
+        """
+        return run_bulk(self.delete_booking, booking_ids, max_in_flight)
+
+    def iter_bookings(self, hydrate: bool = False, prefetch: int = 8, chunk_size: int = 16 * 1024,
+                      **filters) -> Iterator:
+        """
+        Stream the GET /booking listing, optionally fetching each booking's details.
+
+        The listing is parsed incrementally as it arrives, so memory does not grow
+        with the number of bookings.
+
+        Args:
+            hydrate (bool): If True, also GET /booking/{id} for each id, keeping at
+                            most `prefetch` detail requests in flight.
+            prefetch (int): Maximum concurrent detail requests when hydrating.
+            chunk_size (int): Bytes read from the listing response at a time.
+            **filters: Server-side filters: firstname, lastname, checkin, checkout.
+
+        Yields:
+            int: Booking ids, in listing order (hydrate=False).
+            BulkResult: item=booking id, response=its GET /booking/{id} response
+                        (hydrate=True), in listing order.
+
+        Raises:
+            requests.HTTPError: if the listing request fails.
+        """
+        resp = self._request("GET", "/booking", params=filters or None, stream=True)
+        with resp:
+            resp.raise_for_status()
+            ids = (item["bookingid"] for item in iter_json_array(resp.iter_content(chunk_size)))
+            if not hydrate:
+                yield from ids
+                return
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix="hydrate") as pool:
+                try:
+                    for booking_id in ids:
+                        # Carry the consumer's context (e.g. the active trace) into the worker
+                        pending.append(pool.submit(contextvars.copy_context().run,
+                                                   run_one, self.get_booking, booking_id))
+                        if len(pending) >= prefetch:
+                            yield pending.popleft().result()
+                    while pending:
+                        yield pending.popleft().result()
+                finally:
+                    # Consumer stopped early: don't start the queued detail requests
+                    for future in pending:
+                        future.cancel()
 
     def health_check(self):
         """
@@ -115,3 +297,59 @@ class BookingAPI(BaseClient):
         """
         # Simple ping endpoint to verify service availability
         return self.get("/ping")
+
+
+class AsyncBookingAPI(AsyncBaseClient):
+    """
+    Asynchronous BookingAPI client.
+
+    Inherits:
+        AsyncBaseClient: provides pooled, concurrency-limited async HTTP methods.
+
+    Purpose:
+        Same method surface as BookingAPI, but every method is a coroutine returning
+        an httpx.Response, so many booking operations can be awaited concurrently.
+    """
+
+    async def create_token(self, username: str, password: str):
+        """Create an authentication token for a user (POST /auth)."""
+        return await self.post("/auth", {
+            "username": username,
+            "password": password
+        })
+
+    async def create_booking(self, booking_data: dict):
+        """Create a new booking (POST /booking)."""
+        return await self.post("/booking", booking_data)
+
+    async def get_booking(self, booking_id: int):
+        """Retrieve a booking by ID (GET /booking/{id})."""
+        return await self.get(f"/booking/{booking_id}")
+
+    async def update_booking(self, booking_id: int, booking_data: dict):
+        """Replace an existing booking with new data (PUT /booking/{id})."""
+        return await self.put(f"/booking/{booking_id}", booking_data)
+
+    async def partial_update(self, booking_id: int, data: dict):
+        """Partially update an existing booking (PATCH /booking/{id})."""
+        return await self.patch(f"/booking/{booking_id}", data)
+
+    async def delete_booking(self, booking_id: int):
+        """Delete a booking by ID (DELETE /booking/{id})."""
+        return await self.delete(f"/booking/{booking_id}")
+
+    async def health_check(self):
+        """Check API health/status (GET /ping)."""
+        return await self.get("/ping")
+
+    async def create_bookings(self, bookings: Iterable[dict], max_in_flight: int = None) -> List[BulkResult]:
+        """Create many bookings concurrently; results are in input order."""
+        return await run_bulk_async(self.create_booking, bookings, max_in_flight or self.max_concurrency)
+
+    async def get_bookings(self, booking_ids: Iterable[int], max_in_flight: int = None) -> List[BulkResult]:
+        """Retrieve many bookings concurrently; results are in input order."""
+        return await run_bulk_async(self.get_booking, booking_ids, max_in_flight or self.max_concurrency)
+
+    async def delete_bookings(self, booking_ids: Iterable[int], max_in_flight: int = None) -> List[BulkResult]:
+        """Delete many bookings concurrently; results are in input order."""
+        return await run_bulk_async(self.delete_booking, booking_ids, max_in_flight or self.max_concurrency)
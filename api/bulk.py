@@ -0,0 +1,96 @@
+"""
+Helpers for running many API calls with bounded concurrency.
+
+BookingAPI / AsyncBookingAPI use these to implement their bulk methods
+(create_bookings, get_bookings, delete_bookings). Every input item produces
+exactly one BulkResult, in input order; a failing item never aborts the batch.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+from config import config
+
+# Default number of requests allowed in flight for a bulk call. Matches the
+# per-host pool size BaseClient configures so threads don't queue on the pool.
+DEFAULT_MAX_IN_FLIGHT = config.HTTP_POOL_MAXSIZE
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of one item in a bulk operation.
+
+    Attributes:
+        item: The input item (payload or booking id) this result belongs to.
+        response: The response object, or None if the call raised.
+        error (Exception | None): The exception raised by the call, if any.
+    """
+    item: Any
+    response: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """True when the call completed with a non-error HTTP status."""
+        if self.error is not None or self.response is None:
+            return False
+        return getattr(self.response, "status_code", 0) < 400
+
+
+def run_one(func: Callable, item) -> BulkResult:
+    """Run func(item), capturing an exception on the result instead of raising."""
+    try:
+        return BulkResult(item, func(item))
+    except Exception as e:
+        return BulkResult(item, error=e)
+
+
+def run_bulk(func: Callable, items: Iterable, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> List[BulkResult]:
+    """
+    Apply `func` to every item using a thread pool.
+
+    Args:
+        func (Callable): Called once per item; usually a bound BookingAPI method.
+        items (Iterable): Inputs to process.
+        max_in_flight (int): Maximum number of concurrent calls.
+
+    Returns:
+        list[BulkResult]: One result per item, in input order.
+    """
+    items = list(items)
+    if not items:
+        return []
+    workers = max(1, min(max_in_flight, len(items)))
+    # Worker threads see the caller's context variables (e.g. the active trace)
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as pool:
+        return list(pool.map(lambda item: context.copy().run(run_one, func, item), items))
+
+
+async def run_bulk_async(func: Callable, items: Iterable, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> List[BulkResult]:
+    """
+    Await `func(item)` for every item with at most `max_in_flight` pending at once.
+
+    Args:
+        func (Callable): Coroutine function called once per item.
+        items (Iterable): Inputs to process.
+        max_in_flight (int): Maximum number of concurrently awaited calls.
+
+    Returns:
+        list[BulkResult]: One result per item, in input order.
+    """
+    import asyncio  # already loaded by the running event loop
+
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def _one(item):
+        async with semaphore:
+            try:
+                return BulkResult(item, await func(item))
+            except Exception as e:
+                return BulkResult(item, error=e)
+
+    return list(await asyncio.gather(*(_one(item) for item in items)))
@@ -0,0 +1,172 @@
+"""
+Opt-in read-through cache for GET responses, used by BaseClient.
+
+Entries are kept in LRU order up to `maxsize` and served without a request while
+younger than `ttl` seconds. Older entries are revalidated with a conditional
+request (If-None-Match / If-Modified-Since from the stored ETag / Last-Modified);
+a 304 answer refreshes the entry and returns the cached response.
+
+BaseClient invalidates a resource (and its parent collection listing) whenever it
+sends a write to it, so update_booking, partial_update and delete_booking never
+leave a stale GET /booking/{id} behind -- as long as writes go through the same
+client. Hit/miss counters are kept per cache and summed in `totals`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlsplit
+
+from config import config
+
+
+class CacheStats:
+    """
+    Counters for response cache lookups.
+
+    Attributes:
+        hits (int): Served from cache without a request.
+        revalidated (int): Served from cache after a 304 to a conditional request.
+        misses (int): Fetched in full from the server.
+        invalidations (int): Entries dropped because of a write.
+    """
+
+    __slots__ = ("hits", "revalidated", "misses", "invalidations")
+
+    def __init__(self):
+        self.hits = self.revalidated = self.misses = self.invalidations = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.revalidated + self.misses
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Process-wide counters across every ResponseCache (reported in the session summary)
+totals = CacheStats()
+_totals_lock = threading.Lock()
+
+
+class CacheEntry:
+    __slots__ = ("response", "stored_at", "etag", "last_modified")
+
+    def __init__(self, response, stored_at: float):
+        self.response = response
+        self.stored_at = stored_at
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU/TTL cache of GET responses keyed by full URL.
+
+    Attributes:
+        maxsize (int): Maximum number of cached responses.
+        ttl (float): Seconds an entry is served without revalidation.
+        stats (CacheStats): Counters for this cache.
+    """
+
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        self.maxsize = config.RESPONSE_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _count(self, name: str):
+        # Called without self._lock held; clients may share the cache across threads
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+        with _totals_lock:
+            setattr(totals, name, getattr(totals, name) + 1)
+
+    def lookup(self, url: str):
+        """
+        Return (entry, fresh) for `url`; entry is None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(url)
+            return entry, time.monotonic() - entry.stored_at < self.ttl
+
+    def store(self, url: str, response):
+        with self._lock:
+            self._entries[url] = CacheEntry(response, time.monotonic())
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def refresh(self, url: str):
+        """Mark `url` fresh again after a successful revalidation."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate(self, url: str):
+        """
+        Drop `url` and any cached listing of its parent collection.
+
+        For ".../booking/5" this removes ".../booking/5" and ".../booking" with or
+        without a query string.
+        """
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/")
+        parent = f"{parts.scheme}://{parts.netloc}{path.rsplit('/', 1)[0]}" if "/" in path else None
+        with self._lock:
+            stale = [key for key in self._entries
+                     if key == url or (parent and (key == parent or key.startswith(parent + "?")))]
+            for key in stale:
+                del self._entries[key]
+        for _ in stale:
+            self._count("invalidations")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def fetch(self, url: str, send, headers: Optional[dict] = None):
+        """
+        Read-through GET.
+
+        Args:
+            url (str): Full URL (the cache key).
+            send (Callable): send(headers) performs the GET with the given headers.
+            headers (dict | None): Caller's request headers.
+
+        Returns:
+            The cached or freshly fetched response.
+        """
+        entry, fresh = self.lookup(url)
+        if entry is not None and fresh:
+            self._count("hits")
+            return entry.response
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+        resp = send(request_headers)
+        if resp.status_code == 304 and entry is not None:
+            self.refresh(url)
+            self._count("revalidated")
+            return entry.response
+        self._count("misses")
+        if resp.status_code == 200:
+            self.store(url, resp)
+        return resp
@@ -1,9 +1,30 @@
 import requests
 
+from api import deadline as deadlines
+from api import throttle as throttling
+from api import tracing
+from api.cache import ResponseCache
+from api.transport import make_adapter
+from config import config
+
 # Module docstring:
 # Provides a lightweight HTTP client wrapper (BaseClient) used by API-specific
 # client classes. It centralizes session handling and convenience methods for
-# common HTTP verbs used in the project.
+# common HTTP verbs used in the project. Connection pooling, timeouts and the
+# retry policy are configured here, with defaults taken from config/config.py.
+# Calls are traced (api/tracing.py) when the client's tracer has an exporter.
+# The session's transport adapter is pluggable (api/transport.py): HTTP/1.1 via
+# urllib3 by default, or HTTP/2 multiplexing requests over one connection.
+# Inside an api.deadline.deadline() block every attempt's timeouts and retries
+# are bounded by the remaining time budget.
+
+# Methods that are safe to retry after the request may have reached the server.
+# POST and PATCH are not: they are only retried when the connection could not be
+# established at all, i.e. when nothing was sent.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Transient gateway/overload statuses worth retrying for idempotent methods
+RETRY_STATUSES = (429, 502, 503, 504)
 
 class BaseClient:
     """
@@ -13,20 +34,94 @@ class BaseClient:
         base_url (str): Base URL for the API (trailing slash is normalized away).
         session (requests.Session): Reused HTTP session for connection pooling,
                                     default headers and cookies.
+        transport (str | BaseAdapter): Transport adapter mounted on the session.
+        timeout (tuple): (connect, read) timeout in seconds applied to every request.
+        cache (ResponseCache | None): Read-through GET cache, when enabled.
+        tracer (Tracer | None): Receives a span per call while it is enabled.
+        throttle (Throttle | None): Rate and adaptive concurrency limit, when enabled.
     """
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, pool_connections: int = None, pool_maxsize: int = None,
+                 pool_block: bool = None, connect_timeout: float = None, read_timeout: float = None,
+                 max_retries: int = None, backoff_factor: float = None, cache=None, tracer=None,
+                 throttle=None, transport=None):
         """
         Initialize the BaseClient.
 
+        Any argument left as None falls back to the matching HTTP_* value in
+        config/config.py (itself overridable through the environment).
+
         Args:
             base_url (str): Base URL of the target API. Any trailing slash is removed
                             to ensure consistent endpoint concatenation.
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum connections kept per host; raise it to match
+                                the number of threads sharing this client.
+            pool_block (bool): If True, wait for a free pooled connection instead of
+                               opening (and discarding) extra ones under load.
+            connect_timeout (float): Seconds allowed to establish a connection.
+            read_timeout (float): Seconds allowed between bytes of the response.
+            max_retries (int): Retries for idempotent methods on connection errors
+                               and transient statuses (see RETRY_STATUSES).
+            backoff_factor (float): Exponential backoff factor between retries.
+            cache (bool | ResponseCache): Opt-in GET response cache (see api/cache.py).
+                True creates one with the config defaults; writes sent through this
+                client invalidate the affected entries.
+            tracer (Tracer | bool): Tracer receiving a span per call (see api/tracing.py);
+                None uses the shared api.tracing.tracer, which records only once it
+                has an exporter (e.g. pytest --trace-file). False disables tracing.
+            throttle (Throttle | bool): Client-side rate limit and adaptive concurrency
+                limit (see api/throttle.py); share one instance between clients of the
+                same target. True creates one with the config defaults. None uses the
+                per-target shared Throttle when BOOKER_THROTTLE is set, else none.
+            transport (str | BaseAdapter): "http1" (requests/urllib3) or "http2"
+                (multiplexed over one connection per host; needs httpx[http2]), see
+                api/transport.py; or a requests adapter instance, mounted as given.
+                Default: config.HTTP_TRANSPORT. With http2 the pool_connections and
+                pool_block arguments do not apply.
+
+        Raises:
+            ValueError: For an unknown transport.
         """
         # Normalize base_url by removing trailing slash for consistent endpoint formation
         self.base_url = base_url.rstrip('/')
+        self.timeout = (
+            config.HTTP_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            config.HTTP_READ_TIMEOUT if read_timeout is None else read_timeout,
+        )
+        retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        retry = deadlines.DeadlineAwareRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            allowed_methods=IDEMPOTENT_METHODS,
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=config.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+            # Hand the last response back to the caller instead of raising MaxRetryError
+            raise_on_status=False,
+        )
+        self.transport = config.HTTP_TRANSPORT if transport is None else transport
+        adapter = make_adapter(
+            self.transport,
+            pool_connections=config.HTTP_POOL_CONNECTIONS if pool_connections is None else pool_connections,
+            pool_maxsize=config.HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize,
+            pool_block=config.HTTP_POOL_BLOCK if pool_block is None else pool_block,
+            max_retries=retry,
+        )
         # Use a persistent session for connection reuse and shared headers/cookies
         self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache if isinstance(cache, ResponseCache) else None
+        self.tracer = tracing.tracer if tracer is None else (tracer or None)
+        if throttle is None and config.THROTTLE_ENABLED:
+            throttle = throttling.shared(self.base_url)
+        elif throttle is True:
+            throttle = throttling.Throttle()
+        self.throttle = throttle or None
 
     def set_token(self, token: str):
         """
@@ -44,67 +139,145 @@ class BaseClient:
             "Content-Type": "application/json"
         })
 
-    def get(self, endpoint: str):
+    def _request(self, method: str, endpoint: str, **kwargs):
+        """
+        Send a request through the session, applying the client's default timeout.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Path of the endpoint (should start with a slash).
+            **kwargs: Passed through to requests.Session.request (e.g. json=, timeout=).
+
+        Returns:
+            requests.Response: The raw response object from requests.
+
+        Raises:
+            DeadlineExceeded: If the active deadline (api/deadline.py) expired before
+                or during the call.
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        url = f"{self.base_url}{endpoint}"
+        if self.cache is None:
+            return self._send(method, url, endpoint, **kwargs)
+        if method == "GET" and not kwargs.get("stream"):
+            headers = kwargs.pop("headers", None)
+            return self.cache.fetch(
+                url, lambda h: self._send(method, url, endpoint, headers=h, **kwargs), headers)
+        if method in ("POST", "PUT", "PATCH", "DELETE"):
+            # Drop before and after the write so no reader caches the old state meanwhile
+            self.cache.invalidate(url)
+            try:
+                return self._send(method, url, endpoint, **kwargs)
+            finally:
+                self.cache.invalidate(url)
+        return self._send(method, url, endpoint, **kwargs)
+
+    def _send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Send one request, within the throttle's limits and the active deadline."""
+        limit = deadlines.current()
+        if limit is None:
+            return self._throttled_send(method, url, endpoint, **kwargs)
+        kwargs["timeout"] = deadlines.apply(kwargs["timeout"], limit)
+        try:
+            return self._throttled_send(method, url, endpoint, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if not limit.expired or isinstance(e, deadlines.DeadlineExceeded):
+                raise
+            raise deadlines.DeadlineExceeded(
+                f"{limit.budget:g}s deadline exceeded during {method} {endpoint}: {e}",
+                request=e.request) from e
+
+    def _throttled_send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Send one request, within the throttle's limits when one is set."""
+        if self.throttle is None:
+            return self._traced_send(method, url, endpoint, **kwargs)
+        with self.throttle.slot(method, url) as slot:
+            resp = self._traced_send(method, url, endpoint, **kwargs)
+            slot.observe(resp)
+            return resp
+
+    def _traced_send(self, method: str, url: str, endpoint: str, **kwargs):
+        """Send one request over the network, inside a tracing span when enabled."""
+        tracer = self.tracer
+        if tracer is None or not tracer.enabled:
+            return self.session.request(method, url, **kwargs)
+        headers = kwargs.pop("headers", None)
+        return tracer.request(
+            method, url, endpoint,
+            lambda h: self.session.request(method, url, headers=h, **kwargs), headers)
+
+    def get(self, endpoint: str, timeout=None):
         """
         Send a GET request to the given endpoint.
 
         Args:
             endpoint (str): Path of the endpoint (should start with a slash).
+            timeout (float | tuple): Seconds, or (connect, read), for this call only;
+                default: the client's timeout. An active deadline still caps it.
 
         Returns:
             requests.Response: The raw response object from requests.
         """
-        # Concatenate base_url and endpoint and perform GET
-        return self.session.get(f"{self.base_url}{endpoint}")
+        # Perform GET via the shared helper (prefixes base_url, applies timeout)
+        return self._request("GET", endpoint, timeout=timeout)
 
-    def post(self, endpoint: str, payload: dict):
+    def post(self, endpoint: str, payload: dict, timeout=None):
         """
         Send a POST request with a JSON payload.
 
         Args:
             endpoint (str): Path of the endpoint (should start with a slash).
             payload (dict): JSON-serializable body to send.
+            timeout (float | tuple): Seconds, or (connect, read), for this call only;
+                default: the client's timeout. An active deadline still caps it.
 
         Returns:
             requests.Response: The raw response object from requests.
         """
         # Use json= to automatically serialize the payload and set appropriate header
-        return self.session.post(f"{self.base_url}{endpoint}", json=payload)
+        return self._request("POST", endpoint, json=payload, timeout=timeout)
 
-    def put(self, endpoint: str, payload: dict):
+    def put(self, endpoint: str, payload: dict, timeout=None):
         """
         Send a PUT request with a JSON payload (full resource replacement).
 
         Args:
             endpoint (str): Path of the endpoint (should start with a slash).
             payload (dict): JSON-serializable body to send.
+            timeout (float | tuple): Seconds, or (connect, read), for this call only;
+                default: the client's timeout. An active deadline still caps it.
 
         Returns:
             requests.Response: The raw response object from requests.
         """
-        return self.session.put(f"{self.base_url}{endpoint}", json=payload)
+        return self._request("PUT", endpoint, json=payload, timeout=timeout)
 
-    def patch(self, endpoint: str, payload: dict):
+    def patch(self, endpoint: str, payload: dict, timeout=None):
         """
         Send a PATCH request with a JSON payload (partial resource update).
 
         Args:
             endpoint (str): Path of the endpoint (should start with a slash).
             payload (dict): JSON-serializable partial data to send.
+            timeout (float | tuple): Seconds, or (connect, read), for this call only;
+                default: the client's timeout. An active deadline still caps it.
 
         Returns:
             requests.Response: The raw response object from requests.
         """
-        return self.session.patch(f"{self.base_url}{endpoint}", json=payload)
+        return self._request("PATCH", endpoint, json=payload, timeout=timeout)
 
-    def delete(self, endpoint: str):
+    def delete(self, endpoint: str, timeout=None):
         """
         Send a DELETE request to the given endpoint.
 
         Args:
             endpoint (str): Path of the endpoint (should start with a slash).
+            timeout (float | tuple): Seconds, or (connect, read), for this call only;
+                default: the client's timeout. An active deadline still caps it.
 
         Returns:
             requests.Response: The raw response object from requests.
         """
-        return self.session.delete(f"{self.base_url}{endpoint}")
+        return self._request("DELETE", endpoint, timeout=timeout)
@@ -0,0 +1,181 @@
+"""
+Time budgets for API calls and multi-call flows.
+
+A deadline bounds the total time of everything run inside it, however many
+requests, retries and backoff sleeps that takes:
+
+    with deadline(5.0):            # the whole flow gets 5 s
+        booking_id = api.create_booking(payload).json()["bookingid"]
+        api.get_booking(booking_id)
+
+The active Deadline lives in a context variable, so it follows the flow into the
+thread pools of the bulk operations and the scenario engine, and into asyncio
+tasks. Nested deadlines can only shorten the budget, never extend it.
+
+BaseClient applies the remaining time to every attempt: the connect and read
+timeouts of each request (and of each retry) are capped by what is left, a retry
+is abandoned when its backoff would outlast the budget (DeadlineAwareRetry), and a
+call made or failing after expiry raises DeadlineExceeded. The recorder marks
+such calls in the captured data (CallRecord.timed_out).
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+import requests
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError, ResponseError
+from urllib3.util import Timeout
+from urllib3.util.retry import Retry
+
+# Shortest timeout handed to a socket; 0 would switch it to non-blocking mode
+MIN_TIMEOUT = 0.001
+
+
+class DeadlineExceeded(requests.exceptions.Timeout, TimeoutError):
+    """The time budget of the active deadline ran out."""
+
+
+class Deadline:
+    """
+    A point in time (monotonic clock) by which work has to finish.
+
+    Attributes:
+        budget (float): Seconds the deadline was given.
+        expires (float): time.monotonic() value at which it expires.
+    """
+
+    __slots__ = ("budget", "expires")
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left; negative once expired."""
+        return self.expires - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, what: str = "call"):
+        """Raise DeadlineExceeded if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded(f"{self.budget:g}s deadline exceeded before {what}")
+
+    def cap(self, timeout: float) -> float:
+        """`timeout` shortened to the remaining time (None means no limit of its own)."""
+        remaining = max(self.remaining(), MIN_TIMEOUT)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __repr__(self):
+        return f"Deadline({self.budget:g}s, {self.remaining():.3f}s left)"
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("booker_deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    """The innermost active Deadline, or None."""
+    return _current.get()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """
+    Run the body with a total time budget of `seconds`.
+
+    Inside an existing deadline the earlier of the two expiry times applies.
+
+    Yields:
+        Deadline: The effective deadline.
+    """
+    new = Deadline(seconds)
+    outer = _current.get()
+    if outer is not None and outer.expires < new.expires:
+        new = outer
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
+
+
+class DeadlineTimeout(Timeout):
+    """
+    urllib3 Timeout whose connect/read values are capped by a Deadline.
+
+    The caps are evaluated when urllib3 reads them, i.e. for every attempt, so a
+    retry only gets the time that is left.
+    """
+
+    def __init__(self, connect: float, read: float, limit: Deadline):
+        super().__init__(connect=connect, read=read)
+        self.limit = limit
+
+    def clone(self) -> "DeadlineTimeout":
+        return DeadlineTimeout(self._connect, self._read, self.limit)
+
+    @property
+    def connect_timeout(self):
+        return self.limit.cap(super().connect_timeout)
+
+    @property
+    def read_timeout(self):
+        return self.limit.cap(super().read_timeout)
+
+
+def apply(timeout: Union[float, Tuple[float, float], None], limit: Optional[Deadline] = None):
+    """
+    The requests `timeout` argument bounded by a deadline (default: the active one).
+
+    Args:
+        timeout (float | tuple | None): Seconds, or (connect, read) seconds.
+        limit (Deadline | None): Deadline to apply; None uses current().
+
+    Returns:
+        `timeout` unchanged without a deadline, else a DeadlineTimeout.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    limit = current() if limit is None else limit
+    if limit is None:
+        return timeout
+    limit.check("sending the request")
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return DeadlineTimeout(connect, read, limit)
+
+
+class DeadlineAwareRetry(Retry):
+    """
+    urllib3 Retry that gives up once the active deadline cannot fit another attempt.
+
+    A retry is abandoned when the backoff (or Retry-After) wait would use up the
+    remaining time; the last response is then returned (raise_on_status=False), or
+    the last error raised, as when the retries are exhausted. A read timeout that
+    ends the retries is raised as is, so requests reports a ReadTimeout rather
+    than a generic ConnectionError.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        try:
+            new = super().increment(method, url, response, error, _pool, _stacktrace)
+        except MaxRetryError as e:
+            if isinstance(e.reason, ReadTimeoutError):
+                raise e.reason from None
+            raise
+        limit = current()
+        if limit is None:
+            return new
+        wait = new.get_backoff_time()
+        if response is not None and new.respect_retry_after_header:
+            wait = max(wait, new.get_retry_after(response) or 0)
+        if limit.remaining() > wait:
+            return new
+        if isinstance(error, ReadTimeoutError):
+            # Raised as is, requests reports it as a ReadTimeout
+            raise error
+        raise MaxRetryError(_pool, url, error or ResponseError(f"{limit.budget:g}s deadline leaves no time to retry"))
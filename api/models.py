@@ -5,6 +5,10 @@ This module defines Pydantic models used to validate and document booking-relate
 payloads exchanged with the API. Use these models in tests or client code to
 ensure payloads conform to the expected schema.
 
+BookingRecord / BookingDatesRecord (bottom of the module) are a fast path for the
+same schema -- __slots__ classes with a precompiled validator and a direct-to-bytes
+JSON encoder -- cheap enough to validate every response under load.
+
 Note about __init__.py:
     The package-level __init__.py file is intentionally empty in this project.
     An empty __init__.py simply marks the directory as a Python package and
@@ -12,6 +16,10 @@ Note about __init__.py:
     when no package initialization logic is required.
 """
 
+from json import loads as _json_loads
+from json.encoder import encode_basestring_ascii as _encode_str
+from typing import List
+
 from pydantic import BaseModel
 
 class BookingDates(BaseModel):
@@ -52,3 +60,186 @@ class Booking(BaseModel):
 
     # Any optional additional requirements for the booking
     additionalneeds: str
+
+
+# ---------------------------------------------------------------------------
+# Fast path
+#
+# Pydantic v1 validation is too slow to keep on for every response under load.
+# The records below validate the same schema with a precompiled table of field
+# checks and encode straight to JSON bytes. They are strict where pydantic
+# coerces: strings must be str, totalprice an int (not bool), depositpaid a bool.
+# additionalneeds is optional, as the service omits it when it was never set.
+# ---------------------------------------------------------------------------
+
+class BookingValidationError(ValueError):
+    """A payload does not match the booking schema."""
+
+
+def _is_int(value) -> bool:
+    return type(value) is int
+
+
+def _is_str(value) -> bool:
+    return type(value) is str
+
+
+def _is_bool(value) -> bool:
+    return type(value) is bool
+
+
+def _validate(data, fields, where: str):
+    """Run a precompiled (name, check, type name) table against a dict."""
+    if type(data) is not dict:
+        raise BookingValidationError(f"{where}: expected an object, got {type(data).__name__}")
+    for name, check, expected in fields:
+        try:
+            value = data[name]
+        except KeyError:
+            raise BookingValidationError(f"{where}.{name}: field required") from None
+        if not check(value):
+            raise BookingValidationError(f"{where}.{name}: expected {expected}, got {type(value).__name__}")
+
+
+def _problems(data, fields, where: str, optional=()) -> List[str]:
+    """Like _validate, but collect every mismatch, including fields the schema doesn't know."""
+    if type(data) is not dict:
+        return [f"{where}: expected an object, got {type(data).__name__}"]
+    problems = []
+    for name, check, expected in fields:
+        if name not in data:
+            problems.append(f"{where}.{name}: field required")
+        elif not check(data[name]):
+            problems.append(f"{where}.{name}: expected {expected}, got {type(data[name]).__name__}")
+    known = {name for name, _, _ in fields} | set(optional)
+    problems.extend(f"{where}.{name}: unexpected field" for name in data if name not in known)
+    return problems
+
+
+class BookingDatesRecord:
+    """Slotted, validated equivalent of BookingDates."""
+
+    __slots__ = ("checkin", "checkout")
+
+    _FIELDS = (("checkin", _is_str, "str"), ("checkout", _is_str, "str"))
+
+    def __init__(self, checkin: str, checkout: str):
+        self.checkin = checkin
+        self.checkout = checkout
+
+    @classmethod
+    def from_dict(cls, data: dict, where: str = "bookingdates") -> "BookingDatesRecord":
+        _validate(data, cls._FIELDS, where)
+        return cls(data["checkin"], data["checkout"])
+
+    @classmethod
+    def problems(cls, data, where: str = "bookingdates") -> List[str]:
+        """Every way `data` deviates from the schema (empty when it matches)."""
+        return _problems(data, cls._FIELDS, where)
+
+    def to_dict(self) -> dict:
+        return {"checkin": self.checkin, "checkout": self.checkout}
+
+    def __eq__(self, other):
+        return isinstance(other, BookingDatesRecord) and self.to_dict() == other.to_dict()
+
+
+class BookingRecord:
+    """
+    Slotted, validated equivalent of Booking.
+
+    Build with from_dict() (validates) or from_json() (parses then validates);
+    serialize with to_dict() or to_json_bytes().
+    """
+
+    __slots__ = ("firstname", "lastname", "totalprice", "depositpaid", "bookingdates", "additionalneeds")
+
+    _FIELDS = (
+        ("firstname", _is_str, "str"),
+        ("lastname", _is_str, "str"),
+        ("totalprice", _is_int, "int"),
+        ("depositpaid", _is_bool, "bool"),
+        ("bookingdates", lambda v: type(v) is dict, "object"),
+    )
+
+    def __init__(self, firstname: str, lastname: str, totalprice: int, depositpaid: bool,
+                 bookingdates: BookingDatesRecord, additionalneeds: str = None):
+        self.firstname = firstname
+        self.lastname = lastname
+        self.totalprice = totalprice
+        self.depositpaid = depositpaid
+        self.bookingdates = bookingdates
+        self.additionalneeds = additionalneeds
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BookingRecord":
+        """
+        Validate a decoded booking payload.
+
+        Raises:
+            BookingValidationError: naming the first offending field.
+        """
+        _validate(data, cls._FIELDS, "booking")
+        needs = data.get("additionalneeds")
+        if needs is not None and type(needs) is not str:
+            raise BookingValidationError(f"booking.additionalneeds: expected str, got {type(needs).__name__}")
+        return cls(data["firstname"], data["lastname"], data["totalprice"], data["depositpaid"],
+                   BookingDatesRecord.from_dict(data["bookingdates"], "booking.bookingdates"), needs)
+
+    @classmethod
+    def problems(cls, data, where: str = "booking") -> List[str]:
+        """
+        Every way `data` deviates from the schema, without raising.
+
+        Unlike from_dict, which stops at the first error, this also reports nested
+        and unexpected fields -- used to report schema drift (utils/contract.py).
+        """
+        problems = _problems(data, cls._FIELDS, where, optional=("additionalneeds",))
+        if type(data) is not dict:
+            return problems
+        needs = data.get("additionalneeds")
+        if needs is not None and type(needs) is not str:
+            problems.append(f"{where}.additionalneeds: expected str, got {type(needs).__name__}")
+        if type(data.get("bookingdates")) is dict:
+            problems.extend(BookingDatesRecord.problems(data["bookingdates"], f"{where}.bookingdates"))
+        return problems
+
+    @classmethod
+    def from_json(cls, raw) -> "BookingRecord":
+        """Parse JSON text/bytes and validate it."""
+        return cls.from_dict(_json_loads(raw))
+
+    def to_dict(self) -> dict:
+        data = {
+            "firstname": self.firstname,
+            "lastname": self.lastname,
+            "totalprice": self.totalprice,
+            "depositpaid": self.depositpaid,
+            "bookingdates": self.bookingdates.to_dict(),
+        }
+        if self.additionalneeds is not None:
+            data["additionalneeds"] = self.additionalneeds
+        return data
+
+    def to_json_bytes(self) -> bytes:
+        """Encode directly to compact JSON bytes, without an intermediate dict."""
+        dates = self.bookingdates
+        parts = [
+            '{"firstname":', _encode_str(self.firstname),
+            ',"lastname":', _encode_str(self.lastname),
+            ',"totalprice":', str(int(self.totalprice)),
+            ',"depositpaid":', "true" if self.depositpaid else "false",
+            ',"bookingdates":{"checkin":', _encode_str(dates.checkin),
+            ',"checkout":', _encode_str(dates.checkout), "}",
+        ]
+        if self.additionalneeds is not None:
+            parts += [',"additionalneeds":', _encode_str(self.additionalneeds)]
+        parts.append("}")
+        # encode_basestring_ascii output is pure ASCII
+        return "".join(parts).encode("ascii")
+
+    def __eq__(self, other):
+        return isinstance(other, BookingRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"BookingRecord({self.to_dict()!r})"
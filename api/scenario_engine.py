@@ -0,0 +1,377 @@
+"""
+Declarative multi-step scenarios executed as a dependency graph.
+
+A Scenario is an ordered list of Steps, each calling one BookingAPI method. Step
+arguments may contain Ref placeholders for values from an earlier step's response
+(Ref("create", "bookingid")); every reference becomes an edge of the graph. Steps
+acting on the same resource -- by default, the first Ref in their arguments, i.e.
+the booking they address -- additionally run in declaration order, so a booking's
+update waits for its read and its delete for the update. Everything else is free
+to overlap: the engine runs each step as soon as its dependencies have finished,
+on a bounded thread pool, so many independent flows share their network waits.
+
+    scenario = Scenario()
+    for i, payload in enumerate(payloads):
+        scenario.extend(crud_steps(payload, prefix=f"b{i}:"))
+    run = scenario.run(api, max_in_flight=16)
+    run.raise_for_failures()
+
+A step fails when its call raises, its status is not in `expect` or its `check`
+reports a problem. Steps depending on a failed step (by reference, resource or
+`after`) are skipped; unrelated steps still run.
+
+References and `after` may only name earlier steps, so the graph is acyclic by
+construction and declaration order is always a valid sequential execution.
+"""
+
+import contextvars
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Collection, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from api import deadline as deadlines
+from api.bulk import DEFAULT_MAX_IN_FLIGHT
+from api.scenarios import ScenarioError
+
+
+class Ref:
+    """
+    Placeholder for a value taken from an earlier step's JSON response.
+
+    Ref("create", "bookingid") is response.json()["bookingid"] of step "create";
+    Ref("create", "booking", "firstname") walks nested keys; Ref("create") is the
+    whole JSON body.
+    """
+
+    __slots__ = ("step", "path")
+
+    def __init__(self, step: str, *path):
+        self.step = step
+        self.path: Tuple = path
+
+    @property
+    def key(self) -> Tuple:
+        return (self.step,) + self.path
+
+    def resolve(self, results: Dict[str, "StepResult"]):
+        value = results[self.step].response.json()
+        for key in self.path:
+            value = value[key]
+        return value
+
+    def __repr__(self):
+        return f"Ref({', '.join(repr(part) for part in self.key)})"
+
+
+def _refs(value) -> Iterable[Ref]:
+    """Every Ref in `value`, searching nested lists, tuples and dict values."""
+    if isinstance(value, Ref):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _refs(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _refs(item)
+
+
+def _resolve(value, results: Dict[str, "StepResult"]):
+    if isinstance(value, Ref):
+        return value.resolve(results)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(item, results) for item in value)
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    return value
+
+
+@dataclass
+class Step:
+    """
+    One call in a scenario.
+
+    Attributes:
+        name (str): Unique name; Refs and `after` address the step by it.
+        call (str | Callable): BookingAPI method name, or call(api, *args, **kwargs).
+        args (tuple): Positional arguments; may contain Refs (also nested).
+        kwargs (dict): Keyword arguments; may contain Refs.
+        expect (Collection[int]): Acceptable response statuses.
+        check (Callable | None): check(response) returns an error message, or None
+            when the response is as expected (e.g. a field was updated).
+        resource (Hashable | None): Steps with the same resource run in declaration
+            order. None uses the key of the first Ref in the arguments, if any.
+        after (tuple[str]): Names of earlier steps to wait for, beyond the above.
+    """
+    name: str
+    call: Union[str, Callable]
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    expect: Collection[int] = (200,)
+    check: Optional[Callable[[Any], Optional[str]]] = None
+    resource: Optional[Hashable] = None
+    after: Tuple[str, ...] = ()
+
+    def refs(self) -> List[Ref]:
+        return list(_refs(self.args)) + list(_refs(self.kwargs))
+
+    def resource_key(self) -> Optional[Hashable]:
+        if self.resource is not None:
+            return self.resource
+        refs = self.refs()
+        return refs[0].key if refs else None
+
+
+@dataclass
+class StepResult:
+    """
+    Outcome of one step.
+
+    Attributes:
+        name (str): Step name.
+        response: The response, or None if the call raised or the step was skipped.
+        error (Exception | None): Why the step failed (ScenarioError for an
+            unexpected response); for a skipped step, why it was skipped.
+        skipped (bool): True if the step never ran because a dependency failed.
+        started (float): perf_counter() when the call started (0 if skipped).
+        duration (float): Seconds the call took.
+    """
+    name: str
+    response: Any = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+    started: float = 0.0
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+class ScenarioRun:
+    """
+    Results of Scenario.run().
+
+    Attributes:
+        results (dict[str, StepResult]): Per step, in declaration order.
+        elapsed (float): Wall-clock seconds for the whole run.
+    """
+
+    def __init__(self, results: Dict[str, StepResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    def __getitem__(self, name: str) -> StepResult:
+        return self.results[name]
+
+    @property
+    def failures(self) -> List[StepResult]:
+        """Steps that ran and failed (skipped steps are not counted)."""
+        return [r for r in self.results.values() if r.error is not None and not r.skipped]
+
+    @property
+    def skipped(self) -> List[StepResult]:
+        return [r for r in self.results.values() if r.skipped]
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results.values())
+
+    def raise_for_failures(self):
+        """Raise the first failure (a ScenarioError tagged with its step), if any."""
+        for result in self.failures:
+            if isinstance(result.error, ScenarioError):
+                raise result.error
+            raise ScenarioError(result.name, f"{type(result.error).__name__}: {result.error}") from result.error
+
+
+class Scenario:
+    """
+    Ordered collection of Steps, run as a dependency graph.
+
+    Attributes:
+        steps (list[Step]): Steps in declaration order.
+    """
+
+    def __init__(self, steps: Iterable[Step] = ()):
+        self.steps: List[Step] = []
+        self._index: Dict[str, int] = {}
+        self.extend(steps)
+
+    def add(self, name: str, call: Union[str, Callable], *args, expect: Collection[int] = (200,),
+            check: Callable = None, resource: Hashable = None, after: Tuple[str, ...] = (),
+            **kwargs) -> Step:
+        """Append a step built from the arguments and return it."""
+        step = Step(name, call, args, kwargs, expect, check, resource, tuple(after))
+        self.append(step)
+        return step
+
+    def append(self, step: Step):
+        """
+        Append `step`.
+
+        Raises:
+            ValueError: If the name is taken or a Ref/`after` names an unknown or
+                later step.
+        """
+        if step.name in self._index:
+            raise ValueError(f"duplicate step name {step.name!r}")
+        for name in [ref.step for ref in step.refs()] + list(step.after):
+            if name not in self._index:
+                raise ValueError(f"step {step.name!r} depends on {name!r}, which is not an earlier step")
+        self._index[step.name] = len(self.steps)
+        self.steps.append(step)
+
+    def extend(self, steps: Iterable[Step]):
+        for step in steps:
+            self.append(step)
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Step name -> names of the steps it waits for (references, resource order, after)."""
+        graph = {}
+        last_on_resource: Dict[Hashable, str] = {}
+        for step in self.steps:
+            deps = {ref.step for ref in step.refs()} | set(step.after)
+            resource = step.resource_key()
+            if resource is not None:
+                if resource in last_on_resource:
+                    deps.add(last_on_resource[resource])
+                last_on_resource[resource] = step.name
+            graph[step.name] = sorted(deps, key=self._index.__getitem__)
+        return graph
+
+    def run(self, api, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, deadline: float = None) -> ScenarioRun:
+        """
+        Execute the scenario against `api`.
+
+        Args:
+            api (BookingAPI): Client the steps call (authenticated if steps need it).
+            max_in_flight (int): Maximum number of steps running at once.
+            deadline (float | None): Total time budget in seconds (api/deadline.py).
+                Requests are cut short when it runs out; steps failing with
+                DeadlineExceeded skip their dependents like any other failure.
+
+        Returns:
+            ScenarioRun: One StepResult per step.
+        """
+        graph = self.dependencies()
+        waiting = {name: len(deps) for name, deps in graph.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in graph}
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        failed_dependency: Dict[str, str] = {}
+        results: Dict[str, StepResult] = {}
+        # Ready steps, earliest declared first: (index, name)
+        ready = [(self._index[name], name) for name, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+
+        def finish(result: StepResult):
+            # Record a result and release (or skip) the steps waiting for it
+            pending = [result]
+            while pending:
+                result = pending.pop()
+                results[result.name] = result
+                for child in dependents[result.name]:
+                    if not result.ok:
+                        failed_dependency.setdefault(child, result.name)
+                    waiting[child] -= 1
+                    if waiting[child]:
+                        continue
+                    if child in failed_dependency:
+                        reason = ScenarioError(child, f"skipped: {failed_dependency[child]} did not succeed")
+                        pending.append(StepResult(child, error=reason, skipped=True))
+                    else:
+                        heapq.heappush(ready, (self._index[child], child))
+
+        started = time.perf_counter()
+        # Worker threads see the caller's context variables (e.g. the active trace
+        # and deadline)
+        with deadlines.deadline(deadline) if deadline is not None else nullcontext():
+            context = contextvars.copy_context()
+        workers = max(1, min(max_in_flight, len(self.steps)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scenario") as pool:
+            running = {}
+            while ready or running:
+                while ready and len(running) < workers:
+                    _, name = heapq.heappop(ready)
+                    step = self.steps[self._index[name]]
+                    running[pool.submit(context.copy().run, execute_step, api, step, results)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    finish(future.result())
+        ordered = {step.name: results[step.name] for step in self.steps}
+        return ScenarioRun(ordered, time.perf_counter() - started)
+
+
+def execute_step(api, step: Step, results: Dict[str, StepResult]) -> StepResult:
+    """
+    Run one step; never raises (failures are recorded on the result).
+
+    Args:
+        api (BookingAPI): Client the step calls.
+        step (Step): The step to run.
+        results (dict[str, StepResult]): Results of earlier steps, for its Refs.
+    """
+    started = time.perf_counter()
+    try:
+        args = _resolve(step.args, results)
+        kwargs = _resolve(step.kwargs, results)
+        if isinstance(step.call, str):
+            response = getattr(api, step.call)(*args, **kwargs)
+        else:
+            response = step.call(api, *args, **kwargs)
+    except Exception as e:
+        return StepResult(step.name, error=e, started=started, duration=time.perf_counter() - started)
+    duration = time.perf_counter() - started
+    error = None
+    status = getattr(response, "status_code", None)
+    if step.expect and status not in step.expect:
+        error = ScenarioError(step.name, f"status {status}")
+    elif step.check is not None:
+        try:
+            message = step.check(response)
+        except Exception as e:
+            # e.g. a 200 response without the JSON body the check reads
+            message = f"check failed: {e}"
+        if message:
+            error = ScenarioError(step.name, message)
+    return StepResult(step.name, response, error, started=started, duration=duration)
+
+
+def crud_steps(booking: dict, prefix: str = "") -> List[Step]:
+    """
+    Create -> read -> update -> verify -> delete one booking, as declarative steps.
+
+    The one definition of the CRUD flow: scenarios.crud_flow runs these steps one
+    after the other. They all address the created booking, so they run in this
+    order while other flows in the same Scenario interleave freely.
+
+    Args:
+        booking (dict): Booking payload to create.
+        prefix (str): Prepended to the step names, to combine several flows.
+    """
+    create = f"{prefix}create"
+    booking_id = Ref(create, "bookingid")
+
+    def created(response) -> Optional[str]:
+        if response.json().get("bookingid") is None:
+            return "no bookingid in response"
+        return None
+
+    def updated(response) -> Optional[str]:
+        if response.json().get("firstname") != "UpdatedName":
+            return "update not applied"
+        return None
+
+    return [
+        Step(create, "create_booking", (booking,), check=created),
+        Step(f"{prefix}read", "get_booking", (booking_id,)),
+        Step(f"{prefix}update", "update_booking", (booking_id, dict(booking, firstname="UpdatedName")),
+             expect=(200, 201)),
+        Step(f"{prefix}verify", "get_booking", (booking_id,), check=updated),
+        Step(f"{prefix}delete", "delete_booking", (booking_id,), expect=(200, 201, 204)),
+    ]
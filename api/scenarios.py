@@ -0,0 +1,55 @@
+"""
+Reusable multi-step booking scenarios built on BookingAPI.
+
+A scenario is a plain function taking an authenticated BookingAPI, a booking
+payload and a `step` context-manager factory. Each network step runs inside
+`with step("<name>"):` so callers can time it (the load runner does) or ignore it
+(the default). Failed expectations raise ScenarioError, tagged with the step.
+For running many flows concurrently, see the declarative api/scenario_engine.py.
+"""
+
+from contextlib import nullcontext
+
+
+class ScenarioError(AssertionError):
+    """A scenario step got an unexpected response."""
+
+    def __init__(self, step: str, message: str):
+        super().__init__(f"{step}: {message}")
+        self.step = step
+
+
+def _no_step(name: str):
+    return nullcontext()
+
+
+def crud_flow(api, booking: dict, step=_no_step) -> int:
+    """
+    Create -> read -> update -> verify -> delete one booking.
+
+    Runs the steps of api.scenario_engine.crud_steps (the one definition of the
+    flow) sequentially, in declaration order; tests/test_e2e_booking_flow.py and
+    the load runner both drive it.
+
+    Args:
+        api (BookingAPI): Client with a token set (update/delete need auth).
+        booking (dict): Booking payload to create.
+        step (Callable[[str], ContextManager]): Wraps each step, e.g. for timing.
+
+    Returns:
+        int: The id of the booking that was created (and deleted).
+    """
+    # Imported here: the engine itself imports ScenarioError from this module
+    from api.scenario_engine import crud_steps, execute_step
+
+    results = {}
+    for flow_step in crud_steps(booking):
+        with step(flow_step.name):
+            result = execute_step(api, flow_step, results)
+            # Transport errors fail the step itself; a wrong response fails the flow
+            if result.error is not None and not isinstance(result.error, ScenarioError):
+                raise result.error
+        if result.error is not None:
+            raise result.error
+        results[flow_step.name] = result
+    return results["create"].response.json()["bookingid"]
@@ -0,0 +1,96 @@
+"""
+Incremental parsing of large JSON array responses.
+
+iter_json_array() turns a stream of byte chunks (e.g. Response.iter_content)
+holding one top-level JSON array into a generator of its elements, keeping only
+the unparsed tail of the stream in memory. BookingAPI.iter_bookings uses it for
+the GET /booking listing, which can hold tens of thousands of ids.
+"""
+
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Yield the elements of a JSON array delivered in arbitrary byte chunks.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded pieces of the document.
+
+    Raises:
+        ValueError: if the document is not a well-formed JSON array.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    exhausted = False
+    started = False
+
+    def more() -> bool:
+        nonlocal buf, pos, exhausted
+        for chunk in chunks:
+            if chunk:
+                # Drop what was consumed so memory holds only the unparsed tail
+                buf = buf[pos:] + text.decode(chunk)
+                pos = 0
+                return True
+        buf = buf[pos:] + text.decode(b"", final=True)
+        pos = 0
+        exhausted = True
+        return False
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if exhausted:
+                raise ValueError("unexpected end of JSON array")
+            more()
+            continue
+        char = buf[pos]
+        if not started:
+            if char != "[":
+                raise ValueError(f"expected a JSON array, got {char!r}")
+            started = True
+            pos += 1
+            expect_value = True
+            first = True
+            continue
+        if char == "]" and (first or not expect_value):
+            # Read the stream to its end (only whitespace may follow), so the
+            # connection can be reused and tee-ing consumers see the whole body
+            pos += 1
+            while True:
+                if buf[pos:].strip(_WHITESPACE):
+                    raise ValueError(f"unexpected data after the JSON array at offset {pos}")
+                pos = len(buf)
+                if exhausted or not more():
+                    return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' at offset {pos}, got {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError("malformed JSON array element") from None
+            more()
+            continue
+        if not exhausted and (end == len(buf) or buf[end] not in _DELIMITERS):
+            # A number may continue in the next chunk ("1" + ".5"); decode again with more data
+            more()
+            continue
+        pos = end
+        first = False
+        expect_value = False
+        yield value
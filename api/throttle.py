@@ -0,0 +1,357 @@
+"""
+Client-side rate limiting and adaptive concurrency for shared API targets.
+
+A Throttle combines
+  - a token bucket capping the request rate (requests/second with a burst), and
+  - an AIMD concurrency limit: the number of requests allowed in flight grows by
+    about one per window of successful calls and is cut multiplicatively when the
+    target pushes back -- a 429/503 (including ones urllib3 already retried), a
+    connection error or timeout, or latency well above the fastest recently seen
+    for the same endpoint (GET /booking/{id} and GET /booking differ in cost).
+
+so a suite finds the throughput the target sustains instead of overloading it.
+A Retry-After header pauses every caller for the requested time.
+
+One Throttle is thread-safe and can be shared by the sync and async clients at
+the same time: threads wait on a condition variable, coroutines on futures that
+releasing threads resolve through their event loop.
+
+    throttle = Throttle(rate=20, max_concurrency=16)
+    api = BookingAPI(BASE_URL, throttle=throttle)
+    async_api = AsyncBookingAPI(BASE_URL, throttle=throttle)
+
+With BOOKER_THROTTLE=1 every client shares one Throttle per target (shared()).
+"""
+
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from api import deadline as deadlines
+from config import config
+
+# Statuses meaning "slow down"
+OVERLOAD_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    reserve() takes a token immediately and returns how long the caller must wait
+    before using it, so the same bucket serves blocking and asyncio callers.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst or int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` and return the seconds to wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on requests in flight.
+
+    Attributes:
+        limit (float): Current concurrency limit; int(limit) calls may run at once.
+        in_flight (int): Calls currently holding a slot.
+        decreases (int): Times the limit was cut.
+    """
+
+    def __init__(self, initial: int = None, min_limit: int = 1, max_limit: int = None,
+                 backoff: float = 0.5, latency_tolerance: float = None):
+        """
+        Args:
+            initial (int): Starting limit (default: config.CONCURRENCY_INITIAL).
+            min_limit (int): The limit never drops below this.
+            max_limit (int): The limit never grows above this (default: config.CONCURRENCY_MAX).
+            backoff (float): Factor applied to the limit on overload.
+            latency_tolerance (float): A call slower than this many times the baseline
+                (fastest recent) latency of its endpoint counts as overload (default:
+                config.CONCURRENCY_LATENCY_TOLERANCE; 0 disables the latency signal).
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, config.CONCURRENCY_MAX if max_limit is None else max_limit)
+        initial = config.CONCURRENCY_INITIAL if initial is None else initial
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.backoff = backoff
+        self.latency_tolerance = (config.CONCURRENCY_LATENCY_TOLERANCE
+                                  if latency_tolerance is None else latency_tolerance)
+        self.in_flight = 0
+        self.decreases = 0
+        # Fastest recent latency per endpoint (see release())
+        self._baselines: Dict[Hashable, float] = {}
+        self._completed = 0
+        # No further cut until this many calls completed (one cut per window)
+        self._next_decrease_at = 0
+        self._cond = threading.Condition()
+        self._async_waiters = []
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a slot is free; False if `timeout` ran out first."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self):
+        """Wait for a slot without blocking the event loop."""
+        import asyncio  # already loaded by the running event loop
+
+        loop = asyncio.get_running_loop()
+        while not self.try_acquire():
+            future = loop.create_future()
+            with self._cond:
+                self._async_waiters.append((loop, future))
+            # A slot may have been freed between the check and registering
+            if self.try_acquire():
+                with self._cond:
+                    if (loop, future) in self._async_waiters:
+                        self._async_waiters.remove((loop, future))
+                return
+            await future
+
+    def release(self, latency: float, overloaded: bool = False, endpoint: Hashable = None):
+        """
+        Free a slot and adapt the limit to how the call went.
+
+        Args:
+            latency (float): Seconds the call took.
+            overloaded (bool): The target pushed back (429/503, timeout, refused).
+            endpoint (Hashable): The call's endpoint, e.g. ("GET", "/booking/{id}");
+                its latency is only compared with earlier calls to the same endpoint.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self._completed += 1
+            if not overloaded and latency > 0:
+                baseline = self._baselines.get(endpoint)
+                if baseline is None or latency < baseline:
+                    baseline = latency
+                else:
+                    # Let the baseline drift up slowly so one lucky fast call doesn't pin it
+                    baseline *= 1.01
+                self._baselines[endpoint] = baseline
+                if self.latency_tolerance and latency > baseline * self.latency_tolerance:
+                    overloaded = True
+            if overloaded:
+                if self._completed >= self._next_decrease_at:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self.decreases += 1
+                    self._next_decrease_at = self._completed + self.in_flight + 1
+            elif (self.in_flight + 1) * 2 >= self.limit:
+                # Only grow while at least half the limit is in use, not when callers are idle
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def endpoint_key(method: str, url: str) -> Tuple[str, str]:
+    """(METHOD, path template) of a call, numeric ids folded: ("GET", "/booking/{id}")."""
+    path = urlsplit(url).path or "/"
+    return method.upper(), "/".join("{id}" if part.isdigit() else part for part in path.split("/"))
+
+
+def _overload_error(error: BaseException) -> bool:
+    """A refused/reset connection or a timeout -- not a bad URL or our own deadline."""
+    if isinstance(error, deadlines.DeadlineExceeded):
+        return False
+    limit = deadlines.current()
+    if limit is not None and limit.expired:
+        # The timeout was shortened to fit the deadline; the target isn't to blame
+        return False
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    httpx = sys.modules.get("httpx")  # only async clients raise its errors
+    return httpx is not None and isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+
+
+class Slot:
+    """One admitted call; report its outcome with observe()."""
+
+    __slots__ = ("overloaded", "retry_after", "endpoint")
+
+    def __init__(self, endpoint: Hashable = None):
+        self.overloaded = False
+        self.retry_after = None
+        self.endpoint = endpoint
+
+    def observe(self, response=None, error: Optional[BaseException] = None):
+        """
+        Record the call's response (requests or httpx) or the error it raised.
+
+        Overload statuses urllib3 retried internally (response.raw.retries) count too,
+        as do connection errors and timeouts; other errors (e.g. an invalid URL) don't.
+        """
+        if error is not None:
+            self.overloaded = self.overloaded or _overload_error(error)
+            return
+        if response is None:
+            return
+        statuses = [response.status_code]
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        statuses += [h.status for h in getattr(retries, "history", ()) if h.status]
+        if any(status in OVERLOAD_STATUSES for status in statuses):
+            self.overloaded = True
+            self.retry_after = _retry_after(response.headers)
+
+
+class Throttle:
+    """
+    Rate limit plus adaptive concurrency limit for one target.
+
+    Attributes:
+        bucket (TokenBucket | None): Rate limit; None when the rate is unlimited.
+        limiter (AdaptiveLimiter): Concurrency limit.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, initial_concurrency: int = None,
+                 max_concurrency: int = None, min_concurrency: int = 1,
+                 latency_tolerance: float = None):
+        """
+        Args:
+            rate (float): Requests per second; 0 disables the rate limit
+                (default: config.RATE_LIMIT).
+            burst (int): Requests allowed at once above the rate (default: config.RATE_BURST).
+            initial_concurrency / max_concurrency / min_concurrency (int): Bounds of the
+                adaptive limit (see AdaptiveLimiter).
+            latency_tolerance (float): Latency overload factor (see AdaptiveLimiter).
+        """
+        rate = config.RATE_LIMIT if rate is None else rate
+        self.bucket = TokenBucket(rate, config.RATE_BURST if burst is None else burst) if rate else None
+        self.limiter = AdaptiveLimiter(initial_concurrency, min_concurrency, max_concurrency,
+                                       latency_tolerance=latency_tolerance)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        pause = self._paused_until - time.monotonic()
+        rate_wait = self.bucket.reserve() if self.bucket is not None else 0.0
+        return max(pause, rate_wait, 0.0)
+
+    def _finish(self, slot: Slot, started: float):
+        if slot.retry_after:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + slot.retry_after)
+        self.limiter.release(time.perf_counter() - started, slot.overloaded, slot.endpoint)
+
+    @contextmanager
+    def slot(self, method: str = None, url: str = None):
+        """
+        Wait for the rate limit and a concurrency slot; yields a Slot to observe().
+
+        Both waits count against the active deadline (api/deadline.py).
+
+        Args:
+            method / url (str): The call, to compare its latency per endpoint_key().
+
+        Raises:
+            DeadlineExceeded: If the deadline runs out before the call may start.
+        """
+        limit = deadlines.current()
+        delay = self._delay()
+        if delay:
+            if limit is not None and delay >= limit.remaining():
+                raise deadlines.DeadlineExceeded(
+                    f"{limit.budget:g}s deadline exceeded waiting {delay:.3g}s for the rate limit")
+            time.sleep(delay)
+        if not self.limiter.acquire(None if limit is None else max(0.0, limit.remaining())):
+            raise deadlines.DeadlineExceeded(f"{limit.budget:g}s deadline exceeded waiting for a concurrency slot")
+        slot = Slot(endpoint_key(method, url) if method else None)
+        started = time.perf_counter()
+        try:
+            yield slot
+        except Exception as e:
+            slot.observe(error=e)
+            raise
+        finally:
+            self._finish(slot, started)
+
+    @asynccontextmanager
+    async def slot_async(self, method: str = None, url: str = None):
+        """Coroutine version of slot(); the async client cancels it at the deadline."""
+        import asyncio  # already loaded by the running event loop
+
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        await self.limiter.acquire_async()
+        slot = Slot(endpoint_key(method, url) if method else None)
+        started = time.perf_counter()
+        try:
+            yield slot
+        except Exception as e:
+            slot.observe(error=e)
+            raise
+        finally:
+            self._finish(slot, started)
+
+    def stats(self) -> dict:
+        return {"limit": round(self.limiter.limit, 2), "in_flight": self.limiter.in_flight,
+                "decreases": self.limiter.decreases}
+
+
+_shared: Dict[str, Throttle] = {}
+_shared_lock = threading.Lock()
+
+
+def shared(base_url: str) -> Throttle:
+    """The process-wide Throttle for `base_url`, created with the config defaults."""
+    with _shared_lock:
+        throttle = _shared.get(base_url)
+        if throttle is None:
+            throttle = _shared[base_url] = Throttle()
+        return throttle
@@ -0,0 +1,441 @@
+"""
+Request-level tracing spans for BaseClient.
+
+Every call made through a BaseClient while tracing is enabled becomes a span
+with phase timings taken from the underlying connection:
+
+    prepare   request preparation in requests until the adapter sends it
+    dns       name resolution          (new connections only)
+    connect   TCP connect              (new connections only)
+    tls       TLS handshake            (new HTTPS connections only)
+    send      writing the request
+    ttfb      waiting for the response headers (server latency + network)
+    download  reading the body and finishing the response in requests
+
+so client overhead (prepare, download) can be told apart from server latency
+(ttfb). Retries add to the same span. Phases are measured by connection classes
+that TracingHTTPAdapter installs in its urllib3 pools; they only do work while a
+span is active in the calling thread. The HTTP/2 transport (api/transport.py)
+reports the same phases from httpcore's trace events (httpcore_trace()); there
+name resolution is part of connect.
+
+Spans carry the running test's node id and a correlation id. Calls inside one
+`tracer.trace(name)` block -- conftest.py opens one per test -- share a trace,
+and the id is propagated to the server as X-Correlation-ID plus a W3C
+`traceparent` header. Finished spans are exported as OTLP/JSON: one
+ExportTraceServiceRequest document per line, appended to a local file that
+OpenTelemetry tooling (e.g. the collector's file receiver) can ingest.
+
+    pytest --trace-file=spans.jsonl
+
+Tracing is off unless the module-level `tracer` has an exporter, or a client is
+given its own Tracer.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+CORRELATION_HEADER = "X-Correlation-ID"
+PHASES = ("prepare", "dns", "connect", "tls", "send", "ttfb", "download")
+
+# Span of the HTTP call running in this thread/task, and the enclosing trace span
+_active_span: contextvars.ContextVar = contextvars.ContextVar("booker_active_span", default=None)
+_parent_span: contextvars.ContextVar = contextvars.ContextVar("booker_parent_span", default=None)
+
+
+def active_span() -> Optional["Span"]:
+    """Span of the HTTP call running in this thread/task, if it is traced."""
+    return _active_span.get()
+
+
+class Span:
+    """
+    One traced operation.
+
+    Attributes:
+        trace_id (str): 32 hex chars; shared by every span of one trace.
+        span_id (str): 16 hex chars.
+        parent_id (str | None): span_id of the enclosing span.
+        name (str): Operation name, e.g. "GET /booking/{id}" or a test node id.
+        start_ns / end_ns (int): Wall-clock start and end in nanoseconds.
+        attributes (dict): Span attributes (OTLP semantic names where they exist).
+        phases (dict): Seconds spent per phase (see PHASES).
+        error (str | None): Error description when the operation failed.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns",
+                 "attributes", "phases", "error", "_mark")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[dict] = None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.phases: Dict[str, float] = {}
+        self.error = None
+        # perf_counter at the end of the last measured phase
+        self._mark = time.perf_counter()
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def mark(self, phase: str):
+        """Attribute the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.add_phase(phase, now - self._mark)
+        self._mark = now
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(span: Span) -> dict:
+    """Encode a finished span as an OTLP/JSON span object."""
+    attributes = dict(span.attributes)
+    for phase, seconds in span.phases.items():
+        attributes[f"http.phase.{phase}_ms"] = round(seconds * 1000, 3)
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # 3 = SPAN_KIND_CLIENT for HTTP calls, 1 = SPAN_KIND_INTERNAL for traces
+        "kind": 3 if "http.request.method" in attributes else 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+        # 1 = STATUS_CODE_OK, 2 = STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+class OTLPJsonExporter:
+    """
+    Append finished spans to a file as OTLP/JSON ExportTraceServiceRequest lines.
+
+    Spans are buffered and written `batch_size` at a time with one O_APPEND write,
+    so pytest-xdist workers can share one file.
+    """
+
+    def __init__(self, path: str, service_name: str = "restful-booker-tests", batch_size: int = 256):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._spans or self._fd is None:
+            return
+        document = {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "api.tracing"},
+                "spans": [to_otlp(span) for span in self._spans],
+            }],
+        }]}
+        self._spans = []
+        os.write(self._fd, (json.dumps(document, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to an exporter.
+
+    Attributes:
+        exporter: Object with export(span) (e.g. OTLPJsonExporter); None disables tracing.
+        test_id (str | None): Node id of the running test; set by conftest.py and
+            recorded on every span.
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.test_id: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def _new_span(self, name: str, attributes: Optional[dict] = None) -> Span:
+        parent = _parent_span.get()
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                    parent.span_id if parent else None, attributes)
+        span.attributes["correlation_id"] = span.trace_id
+        if self.test_id:
+            span.attributes["test.nodeid"] = self.test_id
+        return span
+
+    def _finish(self, span: Span):
+        span.end_ns = time.time_ns()
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    @contextmanager
+    def trace(self, name: str, **attributes):
+        """
+        Group the calls made inside the block into one trace under a parent span.
+
+        Yields:
+            Span: The parent span; its trace_id is the correlation id of the block.
+        """
+        span = self._new_span(name, attributes)
+        token = _parent_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _parent_span.reset(token)
+            self._finish(span)
+
+    def correlation_id(self) -> Optional[str]:
+        """Correlation id of the enclosing trace() block, if any."""
+        parent = _parent_span.get()
+        return parent.trace_id if parent else None
+
+    def request(self, method: str, url: str, endpoint: str, send, headers: Optional[dict] = None):
+        """
+        Run `send(headers)` -- one HTTP call -- inside a client span.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Full request URL.
+            endpoint (str): Path used to name the span (numeric ids become {id}).
+            send (Callable): send(headers) performs the request with the given headers.
+            headers (dict | None): Caller's request headers; the correlation headers
+                are added to a copy.
+
+        Returns:
+            requests.Response: Whatever `send` returned.
+        """
+        path = endpoint.split("?", 1)[0]
+        name = f"{method} " + "/".join("{id}" if part.isdigit() else part for part in path.split("/"))
+        span = self._new_span(name, {"http.request.method": method, "url.full": url})
+        request_headers = dict(headers or {})
+        request_headers[CORRELATION_HEADER] = span.trace_id
+        request_headers["traceparent"] = span.traceparent
+        token = _active_span.set(span)
+        try:
+            resp = send(request_headers)
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        else:
+            span.attributes["http.response.status_code"] = resp.status_code
+            if resp.status_code >= 500:
+                span.error = f"HTTP {resp.status_code}"
+            return resp
+        finally:
+            _active_span.reset(token)
+            if "ttfb" in span.phases:
+                span.mark("download")
+            span.attributes["network.connection.reused"] = "connect" not in span.phases
+            self._finish(span)
+
+    def shutdown(self):
+        """Flush and close the exporter."""
+        exporter, self.exporter = self.exporter, None
+        if exporter is not None and hasattr(exporter, "close"):
+            exporter.close()
+
+
+# ---------------------------------------------------------------------------
+# Phase measurement in urllib3
+# ---------------------------------------------------------------------------
+
+class _TracedConnectionMixin:
+    def _new_conn(self):
+        span = _active_span.get()
+        if span is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            addresses = socket.getaddrinfo(dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            addresses = []
+        resolved = time.perf_counter()
+        span.add_phase("dns", resolved - start)
+        if addresses:
+            # Connect to the address just resolved instead of resolving again;
+            # fall back to urllib3's own resolution (all addresses) if it fails
+            self._dns_host = addresses[0][4][0]
+        try:
+            try:
+                sock = super()._new_conn()
+            except OSError:
+                if self._dns_host == dns_host:
+                    raise
+                self._dns_host = dns_host
+                sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        span.add_phase("connect", time.perf_counter() - resolved)
+        return sock
+
+    def connect(self):
+        span = _active_span.get()
+        if span is None or not isinstance(self, HTTPSConnection):
+            return super().connect()
+        before = sum(span.phases.get(p, 0.0) for p in ("dns", "connect"))
+        start = time.perf_counter()
+        super().connect()
+        socket_time = sum(span.phases.get(p, 0.0) for p in ("dns", "connect")) - before
+        span.add_phase("tls", max(0.0, time.perf_counter() - start - socket_time))
+
+    def request(self, *args, **kwargs):
+        span = _active_span.get()
+        if span is None:
+            return super().request(*args, **kwargs)
+        # Connection setup (if any) happens inside request(); its phases are already
+        # accounted for, so only the remainder counts as sending
+        before = sum(span.phases.get(p, 0.0) for p in ("dns", "connect", "tls"))
+        start = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            setup = sum(span.phases.get(p, 0.0) for p in ("dns", "connect", "tls")) - before
+            span.add_phase("send", max(0.0, time.perf_counter() - start - setup))
+
+    def getresponse(self, *args, **kwargs):
+        span = _active_span.get()
+        if span is None:
+            return super().getresponse(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            span.add_phase("ttfb", time.perf_counter() - start)
+            span._mark = time.perf_counter()
+
+
+class TracedHTTPConnection(_TracedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TracedHTTPSConnection(_TracedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TracedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracedHTTPSConnection
+
+
+# ---------------------------------------------------------------------------
+# Phase measurement in httpcore (HTTP/2 transport)
+# ---------------------------------------------------------------------------
+
+# httpcore trace step (event name minus the "connection."/"http2." prefix) -> phase
+_HTTPCORE_PHASES = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "send_connection_init": "send",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "ttfb",
+}
+
+
+def httpcore_trace(span: Optional[Span]):
+    """
+    httpcore "trace" request extension (for async clients) adding phase timings to `span`.
+
+    Returns None when `span` is None, so untraced requests pay nothing.
+    """
+    if span is None:
+        return None
+    started = {}
+
+    async def hook(event: str, info: dict):
+        name, _, state = event.rpartition(".")
+        phase = _HTTPCORE_PHASES.get(name.partition(".")[2])
+        if phase is None:
+            return
+        if state == "started":
+            started[name] = time.perf_counter()
+        elif name in started:
+            span.add_phase(phase, time.perf_counter() - started.pop(name))
+            if phase == "ttfb":
+                span._mark = time.perf_counter()
+
+    return hook
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report phase timings to the active span."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TracedHTTPConnectionPool,
+            "https": TracedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        span = _active_span.get()
+        if span is not None and "prepare" not in span.phases:
+            span.mark("prepare")
+        return super().send(request, *args, **kwargs)
+
+
+# Shared tracer; conftest.py gives it an exporter for --trace-file
+tracer = Tracer()
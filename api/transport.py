@@ -0,0 +1,297 @@
+"""
+Pluggable transports for BaseClient.
+
+BaseClient sends everything through a requests.Session, so the capture hooks,
+cassettes, cookies and requests.Response objects work the same whatever carries
+the bytes. The transport is the requests adapter mounted on that session:
+
+    http1   TracingHTTPAdapter (urllib3): HTTP/1.1, one connection per request
+            in flight, pooled and reused between requests.
+    http2   HTTP2Adapter (httpx + h2): HTTP/2, many requests multiplexed as
+            concurrent streams over a single connection per host, so parallel
+            callers share one TCP/TLS handshake.
+
+    api = BookingAPI(BASE_URL, transport="http2")
+    api = BookingAPI(BASE_URL, transport=HTTP2Adapter(h2c=True))   # or any adapter
+
+Over https:// HTTP/2 is negotiated through ALPN (falling back to HTTP/1.1 if the
+server does not offer it). Plain http:// has no negotiation: with `h2c=True`
+(BOOKER_H2C) HTTP/2 is spoken with prior knowledge -- the local stand-in in
+utils/local_booker.py accepts it -- otherwise such requests use HTTP/1.1.
+
+httpx and h2 are optional dependencies (pip install "httpx[http2]"), imported
+when an HTTP2Adapter is created.
+"""
+
+import threading
+from http.client import responses as REASONS
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from urllib3.util import Timeout
+from urllib3.util.retry import Retry
+
+from api import tracing
+from config import config
+
+TRANSPORTS = ("http1", "http2")
+
+
+class _RetryView:
+    """The parts of a urllib3 response that Retry.increment() and Retry.sleep() read."""
+
+    def __init__(self, status: int, headers):
+        self.status = status
+        self.headers = headers
+
+    def get_redirect_location(self):
+        # Redirects are left to requests, as with HTTPAdapter
+        return False
+
+
+class _LoopThread:
+    """An asyncio event loop running in a daemon thread; run() executes coroutines on it."""
+
+    def __init__(self, name: str):
+        import asyncio
+
+        self._asyncio = asyncio
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self, coro):
+        """Run `coro` on the loop and wait for its result in the calling thread."""
+        return self._asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class HTTP2Raw:
+    """
+    Stand-in for urllib3's HTTPResponse as Response.raw of an HTTP2Adapter response.
+
+    Provides what requests reads from raw: stream()/read() for streamed bodies,
+    close(), plus `retries` (the Retry history) and `http_version`.
+    """
+
+    def __init__(self, response, retries: Retry, loop: _LoopThread):
+        self._response = response
+        self._loop = loop
+        self._consumed = False
+        self.retries = retries
+        self.http_version = response.http_version
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def stream(self, chunk_size: int = 1024, decode_content: bool = True):
+        if self._consumed:
+            return
+        self._consumed = True
+        chunks = (self._response.aiter_bytes(chunk_size) if decode_content
+                  else self._response.aiter_raw(chunk_size))
+        while True:
+            try:
+                yield self._loop.run(chunks.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def read(self, amt: int = None, decode_content: bool = True, **kwargs) -> bytes:
+        """Read the rest of the body; requests itself streams through stream()."""
+        return b"".join(self.stream(decode_content=decode_content))
+
+    def close(self):
+        if not self._response.is_closed:
+            self._loop.run(self._response.aclose())
+
+    release_conn = close
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    requests transport adapter sending requests over HTTP/2 with httpx.
+
+    Connections and their h2 state live on one event loop thread owned by the
+    adapter (an httpx.AsyncClient); calling threads hand their requests to it and
+    wait for the response, so any number of threads multiplex streams over the
+    same connection. (httpx's threaded sync client can send stream ids out of
+    order under concurrency, which servers answer by closing the connection.)
+
+    Mirrors HTTPAdapter where BaseClient relies on it: timeouts may be a number or
+    a (connect, read) tuple, `max_retries` is a urllib3 Retry applied to connection
+    errors and retryable statuses (the last response is returned once retries run
+    out), and transport errors surface as requests exceptions. verify/cert/proxies
+    are fixed per adapter instead of per request.
+
+    Attributes:
+        client (httpx.AsyncClient): Client holding the multiplexed connections.
+        max_retries (Retry): Retry policy applied to every request.
+    """
+
+    def __init__(self, max_connections: int = None, max_retries=None, h2c: bool = None,
+                 verify=True):
+        """
+        Args:
+            max_connections (int): Connections kept per pool; with HTTP/2 one per host
+                is normally enough (default: config.HTTP_POOL_MAXSIZE).
+            max_retries (int | Retry): Retry policy (default: no retries).
+            h2c (bool): Speak HTTP/2 with prior knowledge, also over plain http://
+                (default: config.HTTP2_CLEARTEXT).
+            verify (bool | str): TLS certificate verification, as for requests.
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('HTTP2Adapter requires httpx with HTTP/2 support: '
+                              'pip install "httpx[http2]"') from None
+        super().__init__()
+        self._httpx = httpx
+        if max_retries is None:
+            max_retries = Retry(0, read=False)
+        elif not isinstance(max_retries, Retry):
+            max_retries = Retry.from_int(max_retries)
+        self.max_retries = max_retries
+        h2c = config.HTTP2_CLEARTEXT if h2c is None else h2c
+        maxsize = config.HTTP_POOL_MAXSIZE if max_connections is None else max_connections
+        self.client = httpx.AsyncClient(
+            http2=True,
+            # Without HTTP/1.1 to fall back to, httpx uses prior knowledge on http://
+            http1=not h2c,
+            verify=verify,
+            limits=httpx.Limits(max_connections=maxsize, max_keepalive_connections=maxsize),
+            # requests has already merged proxies and environment settings
+            trust_env=False,
+            follow_redirects=False,
+        )
+        self._loop = _LoopThread("http2-transport")
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, Timeout):
+            # Evaluated per attempt: a deadline-bound Timeout shrinks as time passes
+            return self._httpx.Timeout(timeout.read_timeout, connect=timeout.connect_timeout)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    async def _exchange(self, http_request, stream: bool):
+        """Send on the loop; unless streaming, read the whole body there as well."""
+        response = await self.client.send(http_request, stream=True)
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return response
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a PreparedRequest and return a requests.Response (see BaseAdapter.send)."""
+        httpx = self._httpx
+        span = tracing.active_span()
+        if span is not None and "prepare" not in span.phases:
+            span.mark("prepare")
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        extensions = {}
+        hook = tracing.httpcore_trace(span)
+        if hook is not None:
+            extensions["trace"] = hook
+        http_request = self.client.build_request(
+            request.method, request.url, headers=dict(request.headers), content=body,
+            extensions=extensions)
+        retries = self.max_retries
+        while True:
+            http_request.extensions["timeout"] = self._timeout(timeout).as_dict()
+            try:
+                http_response = self._loop.run(self._exchange(http_request, stream))
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                try:
+                    retries = retries.increment(request.method, request.url, error=NewConnectionError(None, str(e)))
+                except MaxRetryError:
+                    raise _requests_error(e, request) from e
+                retries.sleep()
+                continue
+            except httpx.TransportError as e:
+                raise _requests_error(e, request) from e
+            has_retry_after = "Retry-After" in http_response.headers
+            if not retries.is_retry(request.method, http_response.status_code, has_retry_after):
+                break
+            view = _RetryView(http_response.status_code, http_response.headers)
+            try:
+                retries = retries.increment(request.method, request.url, response=view)
+            except MaxRetryError:
+                if retries.raise_on_status:
+                    self._loop.run(http_response.aclose())
+                    raise requests.exceptions.RetryError(
+                        f"too many {http_response.status_code} responses", request=request)
+                break
+            self._loop.run(http_response.aclose())
+            retries.sleep(view)
+        return self.build_response(request, http_response, retries, stream)
+
+    def build_response(self, request, http_response, retries: Retry, stream: bool) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = http_response.status_code
+        resp.reason = http_response.reason_phrase or REASONS.get(http_response.status_code, "")
+        # items() joins repeated headers with commas, as urllib3 does. HTTP/2 sends
+        # names in lowercase; restore the usual spelling for captures and reports
+        resp.headers = CaseInsensitiveDict(
+            (_canonical(name), value) for name, value in http_response.headers.items())
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.raw = HTTP2Raw(http_response, retries, self._loop)
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        if not stream:
+            resp._content = http_response.content
+            resp._content_consumed = True
+        return resp
+
+    def close(self):
+        if self._loop.thread.is_alive():
+            self._loop.run(self.client.aclose())
+            self._loop.stop()
+
+
+def _canonical(name: str) -> str:
+    """content-type -> Content-Type."""
+    return "-".join(part.capitalize() for part in name.split("-"))
+
+
+def _requests_error(error, request) -> requests.RequestException:
+    """Map an httpx transport error onto the requests exception callers expect."""
+    import httpx
+
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(error, request=request)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(error, request=request)
+    return requests.exceptions.ConnectionError(error, request=request)
+
+
+def make_adapter(transport, pool_connections: int, pool_maxsize: int, pool_block: bool,
+                 max_retries: Retry) -> BaseAdapter:
+    """
+    Create the session adapter for `transport` ("http1" or "http2"); an adapter
+    instance is used as given.
+
+    Raises:
+        ValueError: For an unknown transport name.
+    """
+    if isinstance(transport, BaseAdapter):
+        return transport
+    if transport == "http1":
+        # Plain HTTPAdapter behaviour; its connections also time phases for active spans
+        return tracing.TracingHTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, max_retries=max_retries)
+    if transport == "http2":
+        return HTTP2Adapter(max_connections=pool_maxsize, max_retries=max_retries)
+    raise ValueError(f"unknown transport {transport!r}; expected one of {', '.join(TRANSPORTS)}")
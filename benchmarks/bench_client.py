@@ -0,0 +1,116 @@
+"""
+Microbenchmark: per-request overhead added by this project's client and capture stack.
+
+Requests go to an in-memory transport (CannedAdapter) instead of the network, so
+only client-side work is measured:
+
+    raw session          requests.Session.request on the canned transport
+    BaseClient           the same GET through BaseClient._request
+    BaseClient+capture   ...while utils.capture.recorder collects the call, for
+                         response bodies of 1 KiB, 64 KiB and 1 MiB
+    format_body          pretty-printing a captured JSON body (failure reports)
+
+    python -m benchmarks.bench_client [--number 300]
+"""
+
+import argparse
+import json
+import timeit
+from functools import partial
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from api.client import BaseClient
+from utils.capture import CallRecorder, format_body
+
+BASE_URL = "http://bench.invalid"
+BODY_SIZES = {"1KiB": 1024, "64KiB": 64 * 1024, "1MiB": 1024 * 1024}
+
+
+def json_body(size: int) -> bytes:
+    """A JSON document of about `size` bytes (a list of booking-like objects)."""
+    item = {"firstname": "Jim", "lastname": "Brown", "totalprice": 111, "depositpaid": True,
+            "bookingdates": {"checkin": "2018-01-01", "checkout": "2019-01-01"}}
+    one = len(json.dumps(item)) + 1
+    return json.dumps([item] * max(1, size // one)).encode("utf-8")
+
+
+class CannedAdapter(BaseAdapter):
+    """Transport adapter answering every request with the same 200 response."""
+
+    def __init__(self, body: bytes = b"{}"):
+        super().__init__()
+        self.body = body
+
+    def send(self, request, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json",
+                                            "Content-Length": str(len(self.body))})
+        resp._content = self.body
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def canned_client(body: bytes = b"{}") -> BaseClient:
+    client = BaseClient(BASE_URL, tracer=False)
+    client.session.mount("http://", CannedAdapter(body))
+    return client
+
+
+def cases() -> list:
+    """(name, zero-argument callable, capture on) for each case; one request per call."""
+    session = requests.Session()
+    session.mount("http://", CannedAdapter())
+    client = canned_client()
+    result = [
+        ("raw session", lambda: session.request("GET", f"{BASE_URL}/booking/1"), False),
+        ("BaseClient", lambda: client.get("/booking/1"), False),
+    ]
+    for label, size in BODY_SIZES.items():
+        result.append((f"BaseClient+capture {label}", canned_client(json_body(size)).get, True))
+    body = json_body(BODY_SIZES["64KiB"])
+    result.append(("format_body 64KiB", lambda: format_body(body), False))
+    return result
+
+
+def run(number: int = 300, repeat: int = 5) -> dict:
+    """Return the best per-call time in microseconds for each case."""
+    # A private recorder keeps the benchmark independent of a pytest session's one
+    recorder = CallRecorder(max_calls=200)
+    recorder.install()
+    results = {}
+    try:
+        for name, func, capture in cases():
+            if capture:
+                recorder.start()
+                func = partial(func, "/booking")
+            else:
+                recorder.stop()
+            results[name] = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+    finally:
+        recorder.stop()
+        recorder.uninstall()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=300)
+    args = parser.parse_args(argv)
+    results = run(args.number)
+    for name, usec in results.items():
+        print(f"{name:<28} {usec:10.2f} us/call")
+    print(f"BaseClient overhead: {results['BaseClient'] - results['raw session']:.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Microbenchmark: pydantic v1 booking models vs the fast-path records in api/models.py.
+
+Measures validating a decoded booking dict and serializing it back to JSON.
+
+    python -m benchmarks.bench_models [--number 20000]
+"""
+
+import argparse
+import timeit
+
+from api.models import Booking, BookingRecord
+
+SAMPLE = {
+    "firstname": "Jim",
+    "lastname": "Brown",
+    "totalprice": 111,
+    "depositpaid": True,
+    "bookingdates": {"checkin": "2018-01-01", "checkout": "2019-01-01"},
+    "additionalneeds": "Breakfast",
+}
+
+CASES = {
+    "pydantic validate": lambda: Booking.parse_obj(SAMPLE),
+    "record validate": lambda: BookingRecord.from_dict(SAMPLE),
+    "pydantic validate+json": lambda: Booking.parse_obj(SAMPLE).json().encode("utf-8"),
+    "record validate+json": lambda: BookingRecord.from_dict(SAMPLE).to_json_bytes(),
+}
+
+
+def run(number: int = 20000, repeat: int = 5) -> dict:
+    """Return the best per-call time in microseconds for each case."""
+    return {name: min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+            for name, func in CASES.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+    results = run(args.number)
+    for name, usec in results.items():
+        print(f"{name:<24} {usec:8.2f} us/call")
+    print(f"validate speedup:      {results['pydantic validate'] / results['record validate']:.1f}x")
+    print(f"validate+json speedup: {results['pydantic validate+json'] / results['record validate+json']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
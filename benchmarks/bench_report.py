@@ -0,0 +1,86 @@
+"""
+Microbenchmark: rendering captured API calls into reports.
+
+    calls text N       failure-report section (conftest._api_calls_text)
+    calls html N       pytest-html table (conftest._api_calls_html)
+    stream render N    paginated HTML from a JSON-lines report of N tests with
+                       5 calls each (utils.report_stream.render_html)
+
+    python -m benchmarks.bench_report [--number 20]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+import conftest
+from utils.capture import CallLog, CallRecorder
+from utils.report_stream import ReportWriter, render_html
+
+CALL_COUNTS = (10, 100, 1000)
+REPORT_TESTS = 1000
+BODY = b'{"firstname":"Jim","lastname":"Brown","totalprice":111,"depositpaid":true,' \
+       b'"bookingdates":{"checkin":"2018-01-01","checkout":"2019-01-01"}}'
+
+
+class _Request:
+    method = "POST"
+    url = "http://bench.invalid/booking"
+    body = BODY
+    headers = {"Content-Type": "application/json"}
+
+
+class _Response:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+    _content = BODY
+
+
+def call_log(n: int) -> CallLog:
+    """A CallLog holding `n` recorded calls with small JSON bodies."""
+    recorder = CallRecorder()
+    calls = CallLog()
+    for _ in range(n):
+        calls.append(recorder.make_record(_Request, _Response, 0.0123, None))
+    return calls
+
+
+def write_report(path: str, tests: int = REPORT_TESTS, calls_per_test: int = 5):
+    """Write a JSON-lines report of `tests` passed tests to `path`."""
+    writer = ReportWriter(path, truncate=True)
+    writer.write({"type": "session", "started": 0})
+    call = {"method": "GET", "url": "http://bench.invalid/booking/1", "status": 200, "duration": 0.01}
+    for i in range(tests):
+        writer.write({"type": "test", "nodeid": f"tests/test_bench.py::test_{i}", "outcome": "passed",
+                      "duration": 0.05, "calls": [call] * calls_per_test})
+    writer.write({"type": "summary", "exitstatus": 0, "duration": 1.0})
+    writer.close()
+
+
+def run(number: int = 20, repeat: int = 5) -> dict:
+    """Return the best per-call time in microseconds for each case."""
+    cases = {}
+    for n in CALL_COUNTS:
+        calls = call_log(n)
+        cases[f"calls text {n}"] = lambda calls=calls: conftest._api_calls_text(calls)
+        cases[f"calls html {n}"] = lambda calls=calls: conftest._api_calls_html(calls)
+    with tempfile.TemporaryDirectory(prefix="bench-report-") as tmp:
+        report = os.path.join(tmp, "report.jsonl")
+        write_report(report)
+        out_dir = os.path.join(tmp, "html")
+        cases[f"stream render {REPORT_TESTS}"] = lambda: render_html(report, out_dir)
+        return {name: min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+                for name, func in cases.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args(argv)
+    for name, usec in run(args.number).items():
+        print(f"{name:<24} {usec / 1000:10.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
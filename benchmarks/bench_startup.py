@@ -0,0 +1,88 @@
+"""
+Startup benchmark: what a small targeted pytest invocation imports, and how long it takes.
+
+Runs `pytest --collect-only` on one test module in a fresh interpreter under
+`python -X importtime` and reports the slowest imports. Third-party plugin
+autoloading is disabled so only this repo's plugin/fixture layer (conftest.py,
+api/, utils/, config/) is measured. tests/test_startup.py checks the result
+against HEAVY_MODULES; wall-clock time depends on the machine, so the time
+budget is only enforced on request (--check).
+
+    python -m benchmarks.bench_startup [tests/test_healthcheck.py] [--top 20] [--check]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGET = "tests/test_healthcheck.py"
+# Must not be imported just to collect a test that doesn't use them
+HEAVY_MODULES = ("faker", "pytest_html", "pydantic", "httpx", "filelock", "asyncio")
+# Packages of this repo; their import time includes what they pull in (e.g. requests)
+REPO_PACKAGES = ("api", "config", "utils", "tests")
+# Total import time allowed for the repo's modules while collecting one test module
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 400))
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+class ImportTime(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> Dict[str, ImportTime]:
+    """Parse `-X importtime` output into {module: ImportTime}."""
+    modules = {}
+    for match in _LINE.finditer(stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = ImportTime(int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def repo_import_ms(modules: Dict[str, ImportTime]) -> float:
+    """Cumulative milliseconds spent importing this repo's modules (top-level imports only)."""
+    return sum(t.cumulative_us for name, t in modules.items()
+               if t.depth == 0 and name.split(".")[0] in REPO_PACKAGES) / 1000
+
+
+def run(target: str = DEFAULT_TARGET) -> Dict[str, ImportTime]:
+    """Collect `target` in a fresh interpreter and return its import times."""
+    # -s: pytest would otherwise capture the importtime lines written while loading conftest.py
+    env = dict(os.environ, PYTEST_DISABLE_PLUGIN_AUTOLOAD="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytest", "-s", "--collect-only", "-q",
+         "-p", "no:cacheprovider", target],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"collecting {target} failed:\n{proc.stdout}")
+    return parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("target", nargs="?", default=DEFAULT_TARGET)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if over the budget or a heavy module is imported.")
+    args = parser.parse_args(argv)
+    modules = run(args.target)
+    print(f"{'module':<40} {'self ms':>8} {'cumul ms':>9}")
+    for name, t in sorted(modules.items(), key=lambda kv: -kv[1].cumulative_us)[:args.top]:
+        print(f"{'  ' * t.depth + name:<40} {t.self_us / 1000:8.1f} {t.cumulative_us / 1000:9.1f}")
+    print(f"repo modules: {repo_import_ms(modules):.1f} ms (budget {DEFAULT_BUDGET_MS:.0f} ms)")
+    heavy = [name for name in HEAVY_MODULES if name in modules]
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+    if args.check and (heavy or repo_import_ms(modules) >= DEFAULT_BUDGET_MS):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
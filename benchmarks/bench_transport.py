@@ -0,0 +1,133 @@
+"""
+Benchmark: the HTTP/1.1 session transport against the HTTP/2 transport under parallel load.
+
+Both transports run the same workload -- GET /booking/{id} issued by
+`concurrency` threads sharing one BookingAPI -- with a fresh client each, so
+connection setup is part of the measurement. By default the target is the local
+stand-in (utils/local_booker.py), which serves HTTP/1.1 and h2c on the same
+port and counts the connections it accepts. Pointing --base-url at an https://
+server also exercises TLS handshakes and ALPN; connection counts are then unknown.
+
+    python -m benchmarks.bench_transport [--requests 2000] [--concurrency 32]
+    python -m benchmarks.bench_transport --handshake-ms 60
+    python -m benchmarks.bench_transport --base-url https://booker.example.test
+
+Loopback handshakes cost next to nothing, so on the stand-in alone the numbers
+show per-request client overhead, where the pure-Python HTTP/2 stack (h2 framing
+plus a hand-off to the transport's event loop thread) is the more expensive one.
+--handshake-ms makes every new connection wait like a remote TCP+TLS setup
+would, which is the cost HTTP/2 saves by multiplexing over one connection.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from api.booking_api import BookingAPI
+from api.transport import HTTP2Adapter
+from utils.payloads import PayloadPool
+
+SEED_BOOKINGS = 50
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _seed(base_url: str, count: int = SEED_BOOKINGS) -> list:
+    """Create `count` bookings to read back; returns their ids."""
+    api = BookingAPI(base_url, tracer=False)
+    payloads = PayloadPool.generate(count, seed=1).sample(count)
+    ids = [r.response.json()["bookingid"] for r in api.create_bookings(payloads) if r.ok]
+    api.session.close()
+    return ids
+
+
+def measure(api: BookingAPI, ids: list, requests_total: int, concurrency: int) -> dict:
+    """Issue `requests_total` GETs from `concurrency` threads; returns timings."""
+    latencies = []
+    errors = 0
+
+    def one(i: int):
+        start = time.perf_counter()
+        resp = api.get_booking(ids[i % len(ids)])
+        return time.perf_counter() - start, resp.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, status in pool.map(one, range(requests_total)):
+            latencies.append(latency)
+            errors += status != 200
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 3),
+        "rps": round(requests_total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def run(requests_total: int = 2000, concurrency: int = 32, base_url: Optional[str] = None,
+        handshake_ms: float = 0.0) -> dict:
+    """
+    Run the workload over both transports.
+
+    Args:
+        requests_total (int): GET requests per transport.
+        concurrency (int): Threads issuing them (and connections allowed).
+        base_url (str | None): Remote target; None starts the local stand-in.
+        handshake_ms (float): Emulated setup time per new stand-in connection.
+
+    Returns:
+        dict: transport name -> measure() result plus "connections" (opened during
+        the run; None for a remote target).
+    """
+    server = None
+    if base_url is None:
+        from utils.local_booker import LocalBookerServer
+
+        server = LocalBookerServer(connect_delay=handshake_ms / 1000).start()
+        base_url = server.url
+    try:
+        ids = _seed(base_url)
+        results = {}
+        for name in ("http1", "http2"):
+            # Prior knowledge against the stand-in; ALPN negotiates it on https://
+            transport = HTTP2Adapter(max_connections=concurrency, h2c=server is not None) \
+                if name == "http2" else name
+            api = BookingAPI(base_url, transport=transport, pool_maxsize=concurrency, tracer=False)
+            before = server.connections if server is not None else None
+            results[name] = measure(api, ids, requests_total, concurrency)
+            if server is not None:
+                after = server.connections
+                results[name]["connections"] = sum(after.values()) - sum(before.values())
+            else:
+                results[name]["connections"] = None
+            api.session.close()
+        return results
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--base-url", default=None, help="Target instead of the local stand-in")
+    parser.add_argument("--handshake-ms", type=float, default=0.0,
+                        help="Emulated setup time per new connection to the stand-in")
+    args = parser.parse_args(argv)
+    results = run(args.requests, args.concurrency, args.base_url, args.handshake_ms)
+    print(f"{'transport':<10} {'seconds':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'conns':>6}")
+    for name, r in results.items():
+        conns = "-" if r["connections"] is None else r["connections"]
+        print(f"{name:<10} {r['seconds']:>8} {r['rps']:>9} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['errors']:>7} {conns:>6}")
+
+
+if __name__ == "__main__":
+    main()
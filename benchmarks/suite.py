@@ -0,0 +1,127 @@
+"""
+Run every microbenchmark and compare the results with stored baselines.
+
+Suites: models (payload validation, bench_models), client (per-request and
+capture overhead, bench_client) and report (report rendering, bench_report).
+Results are per-call microseconds. To make baselines portable across machines,
+each run also times a fixed pure-Python workload (calibrate()) and baselines are
+scaled by how much faster or slower this machine is than the one that stored them.
+A case fails when it is more than `threshold` times its scaled baseline.
+
+    python -m benchmarks.suite                     # compare with benchmarks/baselines.json
+    python -m benchmarks.suite --update-baseline   # store this machine's results
+    python -m benchmarks.suite --quick --threshold 1.5
+"""
+
+import argparse
+import json
+import os
+import timeit
+from typing import Dict, List
+
+from benchmarks import bench_client, bench_models, bench_report
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_THRESHOLD", 1.3))
+
+# suite -> (module, number of calls per repetition, number for --quick)
+SUITES = {
+    "models": (bench_models, 20000, 500),
+    "client": (bench_client, 300, 20),
+    "report": (bench_report, 20, 2),
+}
+
+
+def _workload():
+    data = {str(i): i for i in range(200)}
+    return sum(value for key, value in data.items() if key.endswith("7"))
+
+
+def calibrate(number: int = 2000, repeat: int = 5) -> float:
+    """Per-call microseconds of a fixed pure-Python workload on this machine."""
+    return min(timeit.repeat(_workload, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(suites=None, quick: bool = False, repeat: int = 5) -> dict:
+    """
+    Run the selected suites.
+
+    Returns:
+        dict: {"calibration_us": float, "results": {suite: {case: us_per_call}}}.
+    """
+    results = {}
+    for name in suites or SUITES:
+        module, number, quick_number = SUITES[name]
+        results[name] = module.run(quick_number if quick else number, repeat=1 if quick else repeat)
+    return {"calibration_us": calibrate(), "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    Compare a run with a baseline.
+
+    Returns:
+        list[dict]: One row per case present in both: suite, case, baseline_us
+        (scaled to this machine), current_us, ratio and regressed.
+    """
+    scale = current["calibration_us"] / baseline["calibration_us"]
+    rows = []
+    for suite, cases in current["results"].items():
+        stored: Dict[str, float] = baseline["results"].get(suite, {})
+        for case, usec in cases.items():
+            if case not in stored:
+                continue
+            expected = stored[case] * scale
+            ratio = usec / expected if expected else 1.0
+            rows.append({"suite": suite, "case": case, "baseline_us": expected, "current_us": usec,
+                         "ratio": ratio, "regressed": ratio > threshold})
+    return rows
+
+
+def load_baseline(path: str = BASELINE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(current: dict, path: str = BASELINE_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)} (default: all).")
+    parser.add_argument("--quick", action="store_true", help="Few iterations; for smoke runs only.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown factor over the baseline (default: 1.3).")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    current = run(args.suites, quick=args.quick)
+    if args.update_baseline:
+        save_baseline(current, args.baseline)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --update-baseline first")
+        return 2
+    rows = compare(current, baseline, args.threshold)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(f"{row['suite']:<7} {row['case']:<28} {row['baseline_us']:12.2f} {row['current_us']:12.2f} "
+              f"{row['ratio']:6.2f}x {flag}")
+    regressed = [row for row in rows if row["regressed"]]
+    print(f"{len(regressed)} of {len(rows)} cases slower than {args.threshold:.2f}x baseline")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,7 @@
 Module: configuration constants for tests and API clients.
 
 Keep secrets out of source control in real projects; this file is intended for example/demo usage.
+Every value can be overridden through the environment variable named next to it.
 
 Note about __init__.py:
     The package __init__.py is intentionally left empty so the config package is
@@ -9,6 +10,43 @@ Note about __init__.py:
     side-effects and keeps configuration loading explicit.
 """
 
-BASE_URL = "https://restful-booker.herokuapp.com"  # Base URL of the RESTful Booker API used in tests
-USERNAME = "admin"                                 # Default admin username used by tests/fixtures
-PASSWORD = "password123"                           # Default password used by tests/fixtures
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+BASE_URL = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")  # Base URL of the RESTful Booker API used in tests
+USERNAME = os.getenv("BOOKER_USER", "admin")                             # Default admin username used by tests/fixtures
+PASSWORD = os.getenv("BOOKER_PASS", "password123")                       # Default password used by tests/fixtures
+
+# HTTP transport settings used by api.client.BaseClient
+HTTP_POOL_CONNECTIONS = int(os.getenv("BOOKER_POOL_CONNECTIONS", "10"))   # Number of per-host connection pools to cache
+HTTP_POOL_MAXSIZE = int(os.getenv("BOOKER_POOL_MAXSIZE", "32"))           # Connections kept per host pool
+HTTP_POOL_BLOCK = _env_bool("BOOKER_POOL_BLOCK", False)                   # Wait for a free connection instead of opening extra ones
+HTTP_CONNECT_TIMEOUT = float(os.getenv("BOOKER_CONNECT_TIMEOUT", "5"))    # Seconds to establish a connection
+HTTP_READ_TIMEOUT = float(os.getenv("BOOKER_READ_TIMEOUT", "30"))         # Seconds to wait for response data
+HTTP_MAX_RETRIES = int(os.getenv("BOOKER_MAX_RETRIES", "3"))              # Retries for idempotent requests (0 disables)
+HTTP_BACKOFF_FACTOR = float(os.getenv("BOOKER_BACKOFF_FACTOR", "0.3"))    # Exponential backoff factor between retries
+HTTP_TRANSPORT = os.getenv("BOOKER_TRANSPORT", "http1")                   # "http1" (requests/urllib3) or "http2" (multiplexed, api/transport.py)
+HTTP2_CLEARTEXT = _env_bool("BOOKER_H2C", False)                          # HTTP/2 with prior knowledge on http:// URLs too
+
+# Authentication token caching used by api.auth.TokenManager
+TOKEN_TTL = float(os.getenv("BOOKER_TOKEN_TTL", "600"))                  # Seconds a cached token is reused
+TOKEN_CACHE_FILE = os.getenv("BOOKER_TOKEN_CACHE", "")                    # Cross-process token cache file ("" = in-process only)
+
+# Opt-in GET response cache used by api.cache.ResponseCache (BaseClient(cache=True))
+RESPONSE_CACHE_SIZE = int(os.getenv("BOOKER_CACHE_SIZE", "256"))         # Maximum cached responses per client
+RESPONSE_CACHE_TTL = float(os.getenv("BOOKER_CACHE_TTL", "5"))           # Seconds served without revalidation
+
+# Client-side throttling used by api.throttle.Throttle (BaseClient(throttle=...))
+THROTTLE_ENABLED = _env_bool("BOOKER_THROTTLE", False)                   # Share one Throttle per target across all clients
+RATE_LIMIT = float(os.getenv("BOOKER_RATE_LIMIT", "0"))                  # Requests per second (0 = unlimited)
+RATE_BURST = int(os.getenv("BOOKER_RATE_BURST", "10"))                   # Requests allowed in a burst above the rate
+CONCURRENCY_INITIAL = int(os.getenv("BOOKER_CONCURRENCY_INITIAL", "8"))  # Starting adaptive concurrency limit
+CONCURRENCY_MAX = int(os.getenv("BOOKER_CONCURRENCY_MAX", str(HTTP_POOL_MAXSIZE)))  # Upper bound of the adaptive limit
+CONCURRENCY_LATENCY_TOLERANCE = float(os.getenv("BOOKER_LATENCY_TOLERANCE", "4"))  # Latency x baseline counted as overload (0 = off)
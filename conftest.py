@@ -2,146 +2,572 @@
 Pytest test-support utilities.
 
 Provides:
-- an autouse fixture that wraps requests.Session.request to record API calls for each test,
-  storing the details on the pytest node for later consumption by reporting hooks.
-- a pytest_runtest_makereport hook that appends captured API-call HTML to pytest-html reports.
+- session-wide API call recording: utils.capture.recorder hooks requests.Session.send once
+  per session and collects each test's calls on the pytest node (`_api_calls`), exposed
+  to tests through the `record_api_calls` fixture.
+- a session-wide API latency summary (utils/latency.py) printed at the end of the run
+  and optionally written as JSON (--api-perf-json).
+- a per-run token cache file for pytest-xdist workers, so parallel workers share one
+  auth token (api/auth.py).
+- a seeded, pre-generated booking payload pool (`payload_pool`, `booking_payload` fixtures and
+  the `payload_cases(n)` marker for data-driven parametrization; utils/payloads.py).
+- automatic cleanup of bookings left behind by tests (utils/resources.py): creations and
+  deletions are tracked per worker/test from the recorded calls, and leftovers are deleted
+  in concurrent batches at session end (disable with --keep-test-data).
+- a terminal summary of the opt-in GET response cache's hit/miss counters (api/cache.py).
+- cassette record/replay of HTTP traffic (--cassette, --cassette-mode; utils/cassette.py).
+- request tracing (--trace-file; api/tracing.py): one trace per test, a span per API call
+  with DNS/connect/TLS/send/TTFB/download timings, exported as OTLP/JSON lines.
+- a streaming JSON-lines test report written as tests finish, with a paginated HTML view
+  rendered from it (--report-jsonl, --report-html-dir; utils/report_stream.py).
+- a persistent, indexed binary store of every captured API call, tagged with its test,
+  queryable after the run without loading it whole (--api-capture-file; utils/capture_store.py).
+- opt-in contract checks (--contract-check; utils/contract.py): successful responses are
+  validated against the api/models.py schema in background batches or at session end,
+  with schema drift reported per endpoint.
+- a pytest_runtest_makereport hook that lists captured API calls on failure and appends
+  them as HTML to pytest-html reports, formatting bodies only at that point.
+- a `booker_server` session fixture running the local Restful Booker stand-in
+  (utils/local_booker.py) on a random port, and a `--local-booker` option that points
+  the whole suite (BASE_URL) at that stand-in for offline runs.
 
 Note about __init__.py:
     The project package __init__.py files are intentionally empty; they exist solely
     to mark directories as importable packages and avoid executing package-level logic.
 """
 
-import time
-import json
+import os
+import tempfile
 import html as html_lib
-from typing import List, Dict, Any
+from contextlib import nullcontext
 import pytest
-import requests
 
-# try to import pytest_html extras; if not available, we'll skip attaching HTML
-try:
-    from pytest_html import extras
-except Exception:
-    extras = None
+from api import cache as response_cache
+from api import tracing
+from api.auth import token_manager
+from config import config as booker_config
+from utils.capture import recorder
+from utils.latency import LatencyPlugin
+from utils.resources import resource_tracker
 
-@pytest.fixture(autouse=True)
-def record_api_calls(request):
+# Everything else (the booking client, pydantic, httpx, pytest_html, the stand-in
+# server, the payload pool, cassettes) is imported where it is first needed, so
+# small targeted runs only pay for what they use; tests/test_startup.py guards this.
+
+
+def _html_extras():
+    """pytest_html.extras, or None when pytest-html is not installed."""
+    try:
+        from pytest_html import extras
+    except Exception:
+        return None
+    return extras
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local-booker",
+        action="store_true",
+        default=False,
+        help="Run against an in-process Restful Booker stand-in instead of BASE_URL.",
+    )
+    group = parser.getgroup("api-capture", "API call capture")
+    group.addoption(
+        "--api-capture-body-limit",
+        type=int,
+        default=int(os.getenv("API_CAPTURE_BODY_LIMIT", 64 * 1024)),
+        help="Bytes of each request/response body kept in memory (default: 65536).",
+    )
+    group.addoption(
+        "--api-capture-max-calls",
+        type=int,
+        default=int(os.getenv("API_CAPTURE_MAX_CALLS", 200)),
+        help="Most recent API calls kept per test; 0 keeps all (default: 200).",
+    )
+    group.addoption(
+        "--api-capture-spill-dir",
+        default=os.getenv("API_CAPTURE_SPILL_DIR", "auto"),
+        help="Directory for full copies of truncated bodies; 'auto' uses a temp dir "
+             "removed at the end of the session, 'none' disables spilling.",
+    )
+    group.addoption(
+        "--api-capture-file",
+        default=os.getenv("API_CAPTURE_FILE"),
+        help="Append every API call to this compact binary store (one file per xdist worker); "
+             "query it with `python -m utils.capture_store query`.",
+    )
+    group.addoption(
+        "--contract-check",
+        choices=("off", "background", "session"),
+        default=os.getenv("API_CONTRACT_CHECK", "off"),
+        help="Validate responses against the API models: while tests run (background) "
+             "or in batch at session end (session); default: off.",
+    )
+    group.addoption(
+        "--contract-workers",
+        type=int,
+        default=int(os.getenv("API_CONTRACT_WORKERS", 2)),
+        help="Threads (background) or processes (session) validating responses (default: 2).",
+    )
+    parser.addoption(
+        "--keep-test-data",
+        action="store_true",
+        default=False,
+        help="Don't delete bookings left behind by tests at the end of the session.",
+    )
+    payloads = parser.getgroup("payloads", "booking payload pool")
+    payloads.addoption(
+        "--payload-seed",
+        type=int,
+        default=int(os.getenv("BOOKER_PAYLOAD_SEED", 1234)),
+        help="Seed of the pre-generated booking payload pool (default: 1234).",
+    )
+    payloads.addoption(
+        "--payload-pool-size",
+        type=int,
+        default=int(os.getenv("BOOKER_PAYLOAD_POOL_SIZE", 5000)),
+        help="Number of payloads in the pool (default: 5000).",
+    )
+    payloads.addoption(
+        "--payload-pool",
+        default=os.getenv("BOOKER_PAYLOAD_POOL"),
+        help="Pool file to reuse across runs (default: inside .pytest_cache).",
+    )
+    parser.addoption(
+        "--trace-file",
+        default=os.getenv("BOOKER_TRACE_FILE"),
+        help="Export a tracing span per API call (OTLP/JSON lines) to this file.",
+    )
+    report = parser.getgroup("report-stream", "streaming test report")
+    report.addoption(
+        "--report-jsonl",
+        default=os.getenv("REPORT_JSONL"),
+        help="Append one JSON line per finished test (with its API calls) to this file.",
+    )
+    report.addoption(
+        "--report-html-dir",
+        default=os.getenv("REPORT_HTML_DIR"),
+        help="Render the --report-jsonl file to paginated HTML in this directory at session end.",
+    )
+    report.addoption(
+        "--report-bodies",
+        choices=("failed", "all", "none"),
+        default="failed",
+        help="Which tests get request/response bodies in the streaming report (default: failed).",
+    )
+    report.addoption(
+        "--report-page-size",
+        type=int,
+        default=500,
+        help="Tests per HTML report page (default: 500).",
+    )
+    cassette = parser.getgroup("cassette", "HTTP record/replay")
+    cassette.addoption(
+        "--cassette",
+        default=os.getenv("BOOKER_CASSETTE"),
+        help="Cassette file to record HTTP traffic to or replay it from.",
+    )
+    cassette.addoption(
+        "--cassette-mode",
+        choices=("record", "replay", "auto"),
+        default=os.getenv("BOOKER_CASSETTE_MODE", "auto"),
+        help="record, replay, or auto: replay if the cassette exists, else record (default).",
+    )
+    group.addoption(
+        "--api-perf-json",
+        default=os.getenv("API_PERF_JSON"),
+        help="Write the per-endpoint API latency summary to this JSON file.",
+    )
+
+
+def pytest_configure(config):
     """
-    Autouse fixture that wraps requests.Session.request and records each API call.
-    Stores the list on the test node as `_api_calls`.
+    Install the API call recorder once for the session, and start the stand-in
+    before collection so module-level BASE_URL lookups see it.
     """
-    calls: List[Dict[str, Any]] = []
-    original_request = requests.Session.request
+    spill_dir = config.getoption("--api-capture-spill-dir")
+    recorder.configure(
+        body_limit=config.getoption("--api-capture-body-limit"),
+        max_calls=config.getoption("--api-capture-max-calls"),
+        spill_dir=None if spill_dir.lower() == "none" else spill_dir,
+    )
+    recorder.install()
+    latency = LatencyPlugin(config.getoption("--api-perf-json"))
+    recorder.listeners.append(latency.on_call)
+    config.pluginmanager.register(latency, "api-latency")
+    recorder.listeners.append(resource_tracker.on_call)
+    config._cleanup_summary = None
+    config._token_cache_file = None
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and not token_manager.cache_file:
+        # pytest-xdist worker: share one token per run across all workers
+        token_manager.cache_file = _token_cache_path(workerinput["testrunuid"])
+    contract_mode = config.getoption("--contract-check")
+    if contract_mode != "off":
+        from utils.contract import ContractChecker
 
-    def _safe_text(obj):
-        try:
-            if obj is None:
-                return ""
-            if isinstance(obj, (dict, list)):
-                return json.dumps(obj, indent=2, ensure_ascii=False)
-            return str(obj)
-        except Exception:
-            return "<unserializable>"
-
-    def _wrap_request(self, method, url, *args, **kwargs):
-        start = time.time()
-        resp = None
-        exc = None
-        try:
-            resp = original_request(self, method, url, *args, **kwargs)
-            return resp
-        except Exception as e:
-            exc = e
-            raise
-        finally:
-            duration = time.time() - start
-            # gather request info
-            req_body = kwargs.get("json") if "json" in kwargs else kwargs.get("data", "")
-            req_headers = kwargs.get("headers", {}) or {}
-            # gather response info
-            if resp is not None:
-                try:
-                    resp_text = resp.text
-                except Exception:
-                    resp_text = "<non-text response>"
-                status = getattr(resp, "status_code", None)
-                resp_headers = dict(getattr(resp, "headers", {}) or {})
+        contract = ContractChecker(contract_mode, workers=config.getoption("--contract-workers"))
+        recorder.listeners.append(contract.on_call)
+        config.pluginmanager.register(contract, "api-contract")
+    config._capture_store = None
+    capture_path = config.getoption("--api-capture-file")
+    if capture_path:
+        from utils.capture_store import CaptureWriter, worker_path
+
+        if workerinput is None:
+            _remove_capture_files(capture_path)
+            config._capture_store = CaptureWriter(capture_path)
+        else:
+            config._capture_store = CaptureWriter(worker_path(capture_path, workerinput["workerid"]))
+        recorder.listeners.append(config._capture_store.on_call)
+    trace_path = config.getoption("--trace-file")
+    if trace_path:
+        if workerinput is None and os.path.exists(trace_path):
+            # xdist workers append to the file the controller started
+            os.remove(trace_path)
+        tracing.tracer.exporter = tracing.OTLPJsonExporter(trace_path)
+    report_path = config.getoption("--report-jsonl")
+    if report_path:
+        from utils.report_stream import StreamingReportPlugin
+
+        config.pluginmanager.register(StreamingReportPlugin(
+            report_path,
+            bodies=config.getoption("--report-bodies"),
+            controller=workerinput is None,
+            html_dir=config.getoption("--report-html-dir"),
+            page_size=config.getoption("--report-page-size"),
+        ), "report-stream")
+    config._cassette = None
+    cassette_path = config.getoption("--cassette")
+    if cassette_path:
+        mode = config.getoption("--cassette-mode")
+        if workerinput is not None:
+            # The controller has created the cassette by now: use the mode it resolved
+            mode = workerinput.get("cassette_mode", mode)
+        elif mode == "auto":
+            mode = "replay" if os.path.exists(cassette_path) else "record"
+        config._cassette_mode = mode
+        from utils.cassette import CassettePlayer, CassetteRecorder, shard_paths
+
+        if mode == "replay":
+            config._cassette = CassettePlayer(cassette_path)
+            recorder.interceptor = config._cassette
+        else:
+            if workerinput is None:
+                for shard in shard_paths(cassette_path):
+                    os.remove(shard)
+                config._cassette = CassetteRecorder(cassette_path)
             else:
-                resp_text = "<no response due to exception>" if exc else "<no response>"
-                status = None
-                resp_headers = {}
-            calls.append({
-                "method": method,
-                "url": url,
-                "status": status,
-                "duration": duration,
-                "request_body": _safe_text(req_body),
-                "request_headers": dict(req_headers),
-                "response_body": _safe_text(resp_text),
-                "response_headers": resp_headers,
-                "exception": str(exc) if exc else ""
-            })
-
-    # patch
-    requests.Session.request = _wrap_request
-
-    # Clarification: record_api_calls attaches its list to `request.node._api_calls` so
-    # pytest hooks can read it after the test run and include the info in reports.
-    # Attach to node BEFORE yielding so pytest_runtest_makereport can access it
-    try:
-        request.node._api_calls = calls
-    except Exception:
-        pass
+                # One shard per xdist worker; reading the cassette merges them
+                from utils.capture_store import worker_path
 
-    yield calls
+                config._cassette = CassetteRecorder(worker_path(cassette_path, workerinput["workerid"]))
+            recorder.raw_listeners.append(config._cassette)
+    config._local_booker = None
+    if config.getoption("--local-booker"):
+        from utils.local_booker import LocalBookerServer
 
-    # restore
-    requests.Session.request = original_request
+        server = LocalBookerServer().start()
+        config._local_booker = server
+        # Test modules read BASE_URL from the environment or config/config.py;
+        # both are restored in pytest_unconfigure
+        config._saved_base_url = (os.environ.get("BASE_URL"), booker_config.BASE_URL)
+        os.environ["BASE_URL"] = server.url
+        booker_config.BASE_URL = server.url
 
-    # clean up attribute (optional)
-    try:
-        del request.node._api_calls
-    except Exception:
-        pass
 
+def _remove_capture_files(path: str):
+    """Delete a previous run's capture store, including xdist worker shards."""
+    import glob
 
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
+    from utils.capture_store import index_path, worker_path
+
+    for data in [path] + glob.glob(worker_path(glob.escape(path), "gw*")):
+        for name in (data, index_path(data)):
+            if os.path.exists(name):
+                os.remove(name)
+
+
+def _token_cache_path(testrunuid: str) -> str:
+    """The token cache file shared by the pytest-xdist workers of one run."""
+    return os.path.join(tempfile.gettempdir(), f"restful-booker-tokens-{testrunuid}.json")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
     """
-    Hook to append API call details to the pytest-html report for the 'call' phase.
+    pytest-xdist controller: remember the workers' token cache file, to delete it
+    at the end, and hand the workers the cassette mode resolved here.
     """
-    outcome = yield
-    report = outcome.get_result()
+    if not token_manager.cache_file:
+        node.config._token_cache_file = _token_cache_path(node.workerinput["testrunuid"])
+    if getattr(node.config, "_cassette", None) is not None:
+        node.workerinput["cassette_mode"] = node.config._cassette_mode
 
-    if report.when != "call":
-        return
 
-    calls = getattr(item, "_api_calls", None)
-    if not calls:
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """pytest-xdist controller: count the interactions the workers recorded."""
+    cassette = getattr(node.config, "_cassette", None)
+    recorded = getattr(node, "workeroutput", {}).get("cassette_recorded")
+    if cassette is not None and recorded is not None:
+        cassette.count += recorded["count"]
+        cassette.skipped += recorded["skipped"]
+
+
+def pytest_unconfigure(config):
+    recorder.uninstall()
+    recorder.cleanup()
+    tracing.tracer.shutdown()
+    store = getattr(config, "_capture_store", None)
+    if store is not None:
+        recorder.listeners.remove(store.on_call)
+        store.close()
+    cassette = getattr(config, "_cassette", None)
+    if cassette is not None and recorder.interceptor is cassette:
+        recorder.interceptor = None
+    elif cassette is not None:
+        recorder.raw_listeners.remove(cassette)
+        cassette.close()
+    if resource_tracker.on_call in recorder.listeners:
+        recorder.listeners.remove(resource_tracker.on_call)
+    latency = config.pluginmanager.get_plugin("api-latency")
+    if latency is not None:
+        recorder.listeners.remove(latency.on_call)
+    contract = config.pluginmanager.get_plugin("api-contract")
+    if contract is not None:
+        recorder.listeners.remove(contract.on_call)
+    server = getattr(config, "_local_booker", None)
+    if server is not None:
+        server.stop()
+        env_url, config_url = config._saved_base_url
+        if env_url is None:
+            os.environ.pop("BASE_URL", None)
+        else:
+            os.environ["BASE_URL"] = env_url
+        booker_config.BASE_URL = config_url
+    token_file = getattr(config, "_token_cache_file", None)
+    if token_file is not None:
+        for path in (token_file, token_file + ".lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def pytest_sessionfinish(session):
+    """
+    Delete bookings that tests created and did not delete (see utils/resources.py);
+    pytest-xdist workers then report what they recorded to the cassette.
+    """
+    config = session.config
+    if not config.getoption("--keep-test-data") and resource_tracker.leftovers():
+        config._cleanup_summary = resource_tracker.cleanup()
+    cassette = getattr(config, "_cassette", None)
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None and cassette is not None and recorder.interceptor is not cassette:
+        workeroutput["cassette_recorded"] = {"count": cassette.count, "skipped": cassette.skipped}
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report leftover test data cleanup, cassette use, captured calls and response cache effectiveness."""
+    cleanup = getattr(config, "_cleanup_summary", None)
+    if cleanup:
+        terminalreporter.write_sep("=", "test data cleanup")
+        terminalreporter.write_line(
+            f"deleted {cleanup['deleted']} leftover bookings, {cleanup['failed']} failed")
+        for owner, count in sorted(cleanup["owners"].items(), key=lambda kv: -kv[1])[:10]:
+            terminalreporter.write_line(f"  {count:>5}  {owner}")
+
+    cassette = getattr(config, "_cassette", None)
+    if cassette is not None and recorder.interceptor is cassette:
+        terminalreporter.write_sep("=", "cassette")
+        terminalreporter.write_line(f"replayed {cassette.hits} requests, {cassette.misses} not recorded")
+    elif cassette is not None:
+        terminalreporter.write_sep("=", "cassette")
+        terminalreporter.write_line(f"recorded {cassette.count} interactions to {config.getoption('--cassette')}")
+        if cassette.skipped:
+            terminalreporter.write_line(f"skipped {cassette.skipped} streamed responses over the size limit")
+
+    store = getattr(config, "_capture_store", None)
+    if store is not None and store.count:
+        terminalreporter.write_sep("=", "API call store")
+        terminalreporter.write_line(f"captured {store.count} API calls to {store.path}")
+
+    stats = response_cache.totals
+    if stats.lookups:
+        terminalreporter.write_sep("=", "API response cache")
+        terminalreporter.write_line(
+            f"hits {stats.hits}, revalidated (304) {stats.revalidated}, misses {stats.misses}, "
+            f"invalidations {stats.invalidations}; "
+            f"{(stats.hits + stats.revalidated) / stats.lookups * 100:.1f}% served from cache")
+
+
+@pytest.fixture(scope="session")
+def booker_server(pytestconfig):
+    """
+    Local Restful Booker stand-in for the session (see utils/local_booker.py).
+
+    Reuses the server started by --local-booker when present, otherwise starts one
+    on a random local port. Use `booker_server.url` as the base URL.
+    """
+    server = pytestconfig._local_booker
+    if server is not None:
+        yield server
         return
+    from utils.local_booker import LocalBookerServer
 
-    if extras is None:
-        # pytest-html not installed, skip attaching HTML
+    with LocalBookerServer() as server:
+        yield server
+    # Its bookings are gone with it; nothing left for the session cleanup to delete
+    resource_tracker.forget(server.url)
+
+
+@pytest.fixture(scope="session")
+def payload_pool(pytestconfig):
+    """
+    Seeded pool of valid booking payloads (utils/payloads.py).
+
+    Generated once and saved to a file that later runs memory-map instead of
+    regenerating; see --payload-seed, --payload-pool-size and --payload-pool.
+    """
+    seed = pytestconfig.getoption("--payload-seed")
+    size = pytestconfig.getoption("--payload-pool-size")
+    path = pytestconfig.getoption("--payload-pool")
+    # No cache with -p no:cacheprovider: the pool is then generated in memory
+    cache = getattr(pytestconfig, "cache", None)
+    if not path and cache is not None:
+        path = str(cache.mkdir("payloads") / f"pool-{seed}-{size}.bin")
+    from utils.payloads import PayloadPool
+
+    pool = PayloadPool.open(path, size, seed)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def booking_payload(request, payload_pool):
+    """
+    One booking payload from the pool.
+
+    Tests marked `@pytest.mark.payload_cases(n)` are parametrized over the first n
+    pool entries (see pytest_generate_tests); otherwise the next pool entry is used.
+    """
+    index = getattr(request, "param", None)
+    return payload_pool.next() if index is None else payload_pool[index]
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize `booking_payload` by pool index for tests marked payload_cases(n)."""
+    marker = metafunc.definition.get_closest_marker("payload_cases")
+    if marker is None or "booking_payload" not in metafunc.fixturenames:
         return
+    count = marker.args[0] if marker.args else marker.kwargs.get("n", 1)
+    # Only indices are collected; payloads are decoded when each case runs
+    metafunc.parametrize("booking_payload", range(count), indirect=True, ids=lambda i: f"payload{i}")
+
+
+@pytest.fixture
+def booking_tracker():
+    """
+    The session's ResourceTracker (utils/resources.py).
+
+    Bookings created over HTTP are tracked automatically; use track()/untrack() for
+    anything created by other means.
+    """
+    return resource_tracker
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Collect the API calls made while `item` runs (setup, call and teardown).
+
+    The list is attached to the node as `_api_calls` so pytest_runtest_makereport can
+    read it, and dropped once the test's reports are done to release the references.
+    """
+    item._api_calls = recorder.start()
+    resource_tracker.owner = item.nodeid
+    tracing.tracer.test_id = item.nodeid
+    store = item.config._capture_store
+    if store is not None:
+        store.test_id = item.nodeid
+    contract = item.config.pluginmanager.get_plugin("api-contract")
+    if contract is not None:
+        contract.test_id = item.nodeid
+    # One trace (correlation id) for all calls of the test
+    trace = tracing.tracer.trace(item.nodeid) if tracing.tracer.enabled else nullcontext()
+    try:
+        with trace:
+            yield
+    finally:
+        recorder.stop()
+        resource_tracker.owner = None
+        tracing.tracer.test_id = None
+        if store is not None:
+            store.test_id = None
+        if contract is not None:
+            contract.test_id = None
+        try:
+            del item._api_calls
+        except AttributeError:
+            pass
 
+
+@pytest.fixture
+def record_api_calls(request):
+    """
+    The CallRecord list collected for the current test.
+
+    Recording itself is always on (see pytest_runtest_protocol); request this fixture
+    to assert on or inspect the calls a test made.
+    """
+    return request.node._api_calls
+
+
+def _api_calls_text(calls) -> str:
+    """One summary line per call, for failure reports."""
+    lines = []
+    if calls.dropped:
+        lines.append(f"... {calls.dropped} earlier calls not kept")
+    for c in calls:
+        line = f"{c.method} {c.url} -> {c.status} ({c.duration:.3f}s)"
+        if c.timed_out:
+            line += f" [timed out: {c.timed_out}]"
+        if c.exception:
+            line += f" [{c.exception}]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _api_calls_html(calls) -> str:
+    """Build the compact HTML table attached to pytest-html reports."""
     def esc(s):
         return html_lib.escape(str(s or ""))
 
-    # Build a compact HTML table
+    def body_cell(label, headers, content, text):
+        link = ""
+        if content.spill_path:
+            # Large bodies are referenced, not embedded
+            link = f"<br><a href='file://{esc(content.spill_path)}'>full body ({content.size} bytes)</a>"
+        return f"<td><details><summary>{label}</summary><pre>{esc(headers)}\n\n{esc(text)}</pre>{link}</details></td>"
+
     rows = []
+    if calls.dropped:
+        rows.append(f"<tr><td colspan='6'>... {calls.dropped} earlier calls not kept</td></tr>")
     for c in calls:
         rows.append(
             "<tr>"
-            f"<td style='white-space:nowrap'><strong>{esc(c['method'])}</strong></td>"
-            f"<td style='max-width:600px;word-break:break-all'>{esc(c['url'])}</td>"
-            f"<td>{esc(c['status'])}</td>"
-            f"<td>{esc(round(c['duration'], 3))}s</td>"
-            f"<td><details><summary>request</summary><pre>{esc(c['request_headers'])}\n\n{esc(c['request_body'])}</pre></details></td>"
-            f"<td><details><summary>response</summary><pre>{esc(c['response_headers'])}\n\n{esc(c['response_body'])}</pre></details></td>"
-            f"</tr>"
+            f"<td style='white-space:nowrap'><strong>{esc(c.method)}</strong></td>"
+            f"<td style='max-width:600px;word-break:break-all'>{esc(c.url)}</td>"
+            f"<td>{esc(c.status)}</td>"
+            f"<td>{esc(round(c.duration, 3))}s</td>"
+            + body_cell("request", c.request_headers, c.request_content, c.request_body)
+            + body_cell("response", c.response_headers, c.response_content, c.response_body)
+            + "</tr>"
         )
 
-    html = (
+    return (
         "<div><h3>API calls</h3>"
         "<table border='1' cellpadding='4' cellspacing='0' style='border-collapse:collapse'>"
         "<thead><tr><th>Method</th><th>URL</th><th>Status</th><th>Duration</th><th>Request</th><th>Response</th></tr></thead>"
@@ -150,6 +576,38 @@ def pytest_runtest_makereport(item, call):
         + "</tbody></table></div>"
     )
 
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attach the recorded API calls to the report of the 'call' phase.
+
+    Nothing is formatted unless something will show it: a text section is added
+    when the test failed, and the HTML table only when pytest-html writes a report.
+    """
+    outcome = yield
+    report = outcome.get_result()
+
+    if report.when != "call":
+        return
+
+    calls = getattr(item, "_api_calls", None)
+    if not calls:
+        return
+
+    if report.failed:
+        report.sections.append(("API calls", _api_calls_text(calls)))
+
+    if not item.config.getoption("htmlpath", None):
+        # No HTML report requested, skip attaching HTML
+        return
+    extras = _html_extras()
+    if extras is None:
+        # pytest-html not installed
+        return
+
+    html = _api_calls_html(calls)
+
     # Use the new 'extras' attribute when available; fall back to deprecated 'extra'
     current_extras = getattr(report, "extras", None)
     if current_extras is None:
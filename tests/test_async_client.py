@@ -0,0 +1,62 @@
+"""
+Tests for the asynchronous client (api/async_client.py, AsyncBookingAPI) against the local stand-in.
+"""
+
+import asyncio
+
+from api.booking_api import AsyncBookingAPI
+from config.config import PASSWORD, USERNAME
+
+
+def test_crud_flow(booker_server, payload_pool):
+    booking = payload_pool.next()
+
+    async def flow():
+        async with AsyncBookingAPI(booker_server.url) as api:
+            token = (await api.create_token(USERNAME, PASSWORD)).json()["token"]
+            api.set_token(token)
+            created = await api.create_booking(booking)
+            booking_id = created.json()["bookingid"]
+            read = await api.get_booking(booking_id)
+            updated = await api.update_booking(booking_id, dict(booking, firstname="Async"))
+            patched = await api.partial_update(booking_id, {"lastname": "Patched"})
+            deleted = await api.delete_booking(booking_id)
+            gone = await api.get_booking(booking_id)
+            return booking_id, created, read, updated, patched, deleted, gone
+
+    booking_id, created, read, updated, patched, deleted, gone = asyncio.run(flow())
+
+    assert created.status_code == 200
+    assert read.json()["firstname"] == booking["firstname"]
+    assert updated.json()["firstname"] == "Async"
+    assert patched.json()["lastname"] == "Patched"
+    assert deleted.status_code == 201
+    assert gone.status_code == 404
+    assert booking_id not in booker_server.store.bookings
+
+
+def test_max_concurrency_bounds_requests_in_flight(booker_server):
+    in_flight = peak = 0
+
+    async def main():
+        nonlocal in_flight, peak
+        async with AsyncBookingAPI(booker_server.url, max_concurrency=3) as api:
+            send = api.client.request
+
+            async def tracked(*args, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    await asyncio.sleep(0.02)
+                    return await send(*args, **kwargs)
+                finally:
+                    in_flight -= 1
+
+            api.client.request = tracked
+            return await asyncio.gather(*(api.health_check() for _ in range(12)))
+
+    responses = asyncio.run(main())
+
+    assert [r.status_code for r in responses] == [201] * 12
+    assert peak == 3
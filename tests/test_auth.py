@@ -0,0 +1,96 @@
+"""
+Tests for cached authentication tokens (api/auth.py) against the local stand-in.
+"""
+
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from api.auth import AuthenticationError, TokenManager
+from api.booking_api import BookingAPI
+from config.config import USERNAME, PASSWORD
+
+
+def _auth_calls(calls):
+    return [c for c in calls if c.url.endswith("/auth")]
+
+
+def test_token_is_cached_per_base_url_and_user(booker_server, record_api_calls):
+    manager = TokenManager()
+    first = BookingAPI(booker_server.url).authenticate(USERNAME, PASSWORD, manager)
+    second = BookingAPI(booker_server.url).authenticate(USERNAME, PASSWORD, manager)
+
+    assert first == second
+    assert len(_auth_calls(record_api_calls)) == 1
+
+
+def test_expired_token_is_renewed(booker_server, record_api_calls):
+    manager = TokenManager(ttl=0)
+    api = BookingAPI(booker_server.url)
+    api.authenticate(USERNAME, PASSWORD, manager)
+    api.authenticate(USERNAME, PASSWORD, manager)
+
+    assert len(_auth_calls(record_api_calls)) == 2
+
+
+def test_rejected_token_is_refreshed_on_403(booker_server):
+    api = BookingAPI(booker_server.url)
+    api.authenticate(USERNAME, PASSWORD, TokenManager())
+    booking_id = api.create_booking({
+        "firstname": "Auth", "lastname": "Retry", "totalprice": 1, "depositpaid": True,
+        "bookingdates": {"checkin": "2025-01-01", "checkout": "2025-01-02"},
+    }).json()["bookingid"]
+    # Simulate the service forgetting the token (restart, expiry)
+    booker_server.store.tokens.clear()
+
+    assert api.delete_booking(booking_id).status_code == 201
+
+
+def test_file_cache_is_shared_between_managers(booker_server, tmp_path, record_api_calls):
+    cache_file = str(tmp_path / "tokens.json")
+    first = TokenManager(cache_file=cache_file).get_token(BookingAPI(booker_server.url), USERNAME, PASSWORD)
+    # A second manager stands in for another worker process
+    second = TokenManager(cache_file=cache_file).get_token(BookingAPI(booker_server.url), USERNAME, PASSWORD)
+
+    assert first == second
+    assert len(_auth_calls(record_api_calls)) == 1
+
+
+def test_bad_credentials_raise(booker_server):
+    with pytest.raises(AuthenticationError):
+        TokenManager().get_token(BookingAPI(booker_server.url), USERNAME, "wrong")
+
+
+def test_auth_runs_outside_the_lock_once_per_key():
+    release = threading.Event()
+    calls = Counter()
+
+    class SlowAPI:
+        def __init__(self, base_url):
+            self.base_url = base_url
+
+        def create_token(self, username, password):
+            calls[self.base_url] += 1
+            if self.base_url == "http://slow":
+                release.wait(5)
+            return SimpleNamespace(status_code=200, json=lambda: {"token": f"token-{self.base_url}"})
+
+    manager = TokenManager(cache_file="")
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_token(SlowAPI("http://slow"), "u", "p")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    while not calls["http://slow"]:
+        time.sleep(0.001)
+
+    # Another key is served while the first /auth call is still in flight
+    assert manager.get_token(SlowAPI("http://fast"), "u", "p") == "token-http://fast"
+    release.set()
+    for t in threads:
+        t.join()
+    assert tokens == ["token-http://slow"] * 4
+    assert calls == Counter({"http://slow": 1, "http://fast": 1})
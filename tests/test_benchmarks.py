@@ -0,0 +1,36 @@
+"""
+Smoke test for the benchmark suite (benchmarks/suite.py): every suite runs and
+produces timings, and the baseline comparison flags regressions.
+"""
+
+from benchmarks.suite import SUITES, compare, load_baseline, run
+
+
+def test_every_suite_runs():
+    current = run(quick=True)
+
+    assert set(current["results"]) == set(SUITES)
+    assert all(usec > 0 for cases in current["results"].values() for usec in cases.values())
+    assert current["calibration_us"] > 0
+
+
+def test_stored_baseline_covers_every_case():
+    baseline = load_baseline()
+    current = run(["models"], quick=True)
+
+    assert baseline is not None
+    assert set(baseline["results"]) == set(SUITES)
+    assert set(current["results"]["models"]) == set(baseline["results"]["models"])
+
+
+def test_compare_scales_by_calibration_and_flags_regressions():
+    baseline = {"calibration_us": 10.0, "results": {"client": {"fast": 100.0, "slow": 100.0}}}
+    # This machine is twice as slow as the one that stored the baseline
+    current = {"calibration_us": 20.0, "results": {"client": {"fast": 210.0, "slow": 300.0, "new": 1.0}}}
+
+    rows = {row["case"]: row for row in compare(current, baseline, threshold=1.3)}
+
+    assert set(rows) == {"fast", "slow"}
+    assert rows["fast"]["baseline_us"] == 200.0
+    assert not rows["fast"]["regressed"]
+    assert rows["slow"]["regressed"]
@@ -0,0 +1,95 @@
+"""
+Tests for the bounded-concurrency bulk helpers (api/bulk.py) and BookingAPI's bulk methods.
+"""
+
+import asyncio
+import threading
+import time
+
+from api.booking_api import BookingAPI
+from api.bulk import BulkResult, run_bulk, run_bulk_async
+
+
+class _Status:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def _tracker():
+    """A func for run_bulk recording the peak number of concurrent calls."""
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def call(item):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        # Later items finish first, so completion order differs from input order
+        time.sleep(0.02 * (1 - item / 20))
+        with lock:
+            state["in_flight"] -= 1
+        return _Status(200)
+
+    return call, state
+
+
+def test_results_keep_input_order_and_concurrency_is_bounded():
+    call, state = _tracker()
+
+    results = run_bulk(call, range(20), max_in_flight=4)
+
+    assert [r.item for r in results] == list(range(20))
+    assert all(r.ok for r in results)
+    assert state["peak"] == 4
+
+
+def test_failures_are_reported_per_item():
+    def call(item):
+        if item == 1:
+            raise ValueError("boom")
+        return _Status(404 if item == 2 else 201)
+
+    results = run_bulk(call, [0, 1, 2])
+
+    assert [r.ok for r in results] == [True, False, False]
+    assert isinstance(results[1].error, ValueError) and results[1].response is None
+    assert results[2].error is None and results[2].response.status_code == 404
+    assert not BulkResult("x").ok
+    assert run_bulk(call, []) == []
+
+
+def test_run_bulk_async_bounds_pending_calls_and_keeps_order():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def call(item):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01 * (10 - item))
+        state["in_flight"] -= 1
+        if item == 3:
+            raise RuntimeError("async boom")
+        return _Status(200)
+
+    results = asyncio.run(run_bulk_async(call, range(10), max_in_flight=3))
+
+    assert [r.item for r in results] == list(range(10))
+    assert [r.ok for r in results] == [i != 3 for i in range(10)]
+    assert isinstance(results[3].error, RuntimeError)
+    assert state["peak"] == 3
+
+
+def test_booking_api_bulk_methods(booker_server, payload_pool):
+    api = BookingAPI(booker_server.url)
+    api.authenticate()
+    payloads = [payload_pool.next() for _ in range(8)]
+
+    created = api.create_bookings(payloads, max_in_flight=4)
+    ids = [r.response.json()["bookingid"] for r in created]
+    fetched = api.get_bookings(ids + [999999], max_in_flight=4)
+    deleted = api.delete_bookings(ids, max_in_flight=4)
+
+    assert [r.item for r in created] == payloads
+    assert [r.response.json()["firstname"] for r in fetched[:-1]] == [p["firstname"] for p in payloads]
+    assert not fetched[-1].ok and fetched[-1].response.status_code == 404
+    assert all(r.ok for r in deleted)
+    assert not set(ids) & set(booker_server.store.bookings)
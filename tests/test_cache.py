@@ -0,0 +1,81 @@
+"""
+Tests for the opt-in GET response cache (api/cache.py) against the local stand-in.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from api.booking_api import BookingAPI
+from api.cache import ResponseCache
+from config.config import USERNAME, PASSWORD
+
+BOOKING = {
+    "firstname": "Cache",
+    "lastname": "Me",
+    "totalprice": 10,
+    "depositpaid": False,
+    "bookingdates": {"checkin": "2025-01-01", "checkout": "2025-01-02"},
+}
+
+
+def _gets(calls):
+    return [c.status for c in calls if c.method == "GET"]
+
+
+def test_fresh_entries_skip_the_network(booker_server, record_api_calls):
+    api = BookingAPI(booker_server.url, cache=ResponseCache(ttl=60))
+    booking_id = api.create_booking(BOOKING).json()["bookingid"]
+
+    first = api.get_booking(booking_id)
+    second = api.get_booking(booking_id)
+
+    assert second is first
+    assert _gets(record_api_calls) == [200]
+    assert (api.cache.stats.misses, api.cache.stats.hits) == (1, 1)
+
+
+def test_stale_entries_are_revalidated_with_etag(booker_server, record_api_calls):
+    api = BookingAPI(booker_server.url, cache=ResponseCache(ttl=0))
+    booking_id = api.create_booking(BOOKING).json()["bookingid"]
+
+    api.get_booking(booking_id)
+    assert api.get_booking(booking_id).json()["firstname"] == "Cache"
+
+    assert _gets(record_api_calls) == [200, 304]
+    assert api.cache.stats.revalidated == 1
+
+
+def test_writes_invalidate_the_resource(booker_server):
+    api = BookingAPI(booker_server.url, cache=ResponseCache(ttl=60))
+    api.authenticate(USERNAME, PASSWORD)
+    booking_id = api.create_booking(BOOKING).json()["bookingid"]
+    api.get_booking(booking_id)
+
+    api.partial_update(booking_id, {"firstname": "Changed"})
+    assert api.get_booking(booking_id).json()["firstname"] == "Changed"
+
+    api.delete_booking(booking_id)
+    assert api.get_booking(booking_id).status_code == 404
+    assert len(api.cache) == 0
+
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    response = type("R", (), {"headers": {}})()
+    for url in ("a", "b", "a", "c"):
+        cache.store(url, response)
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_stats_count_every_hit_across_threads():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    response = type("R", (), {"headers": {}})()
+    cache.store("a", response)
+
+    def hits(_):
+        for _ in range(2000):
+            cache.fetch("a", send=None)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(hits, range(8)))
+
+    assert cache.stats.hits == 16000
@@ -0,0 +1,69 @@
+"""
+Tests for the session-wide API call recorder (utils/capture.py).
+"""
+
+import os
+
+from api.booking_api import BookingAPI
+from utils.capture import CallRecorder, format_body
+
+
+def test_calls_are_recorded_per_test(booker_server, record_api_calls):
+    api = BookingAPI(booker_server.url)
+    api.health_check()
+    api.create_booking({"firstname": "Rec"})
+
+    assert [(c.method, c.status) for c in record_api_calls] == [("GET", 201), ("POST", 500)]
+    assert record_api_calls[0].url == f"{booker_server.url}/ping"
+    assert record_api_calls[0]["status"] == 201
+
+
+def test_bodies_are_formatted_on_access(booker_server, record_api_calls):
+    BookingAPI(booker_server.url).create_token("admin", "nope")
+
+    call = record_api_calls[0]
+    assert '"username": "admin"' in call.request_body
+    assert '"reason": "Bad credentials"' in call.response_body
+    assert call.response_headers["Content-Type"].startswith("application/json")
+
+
+def test_format_body():
+    assert format_body(None) == ""
+    assert format_body(b'{"a": 1}') == '{\n  "a": 1\n}'
+    assert format_body(b"Created") == "Created"
+    assert format_body(b"\xff") == "�"
+
+
+def test_large_bodies_are_truncated_and_spilled(tmp_path):
+    recorder = CallRecorder(body_limit=8, spill_dir=str(tmp_path))
+
+    content = recorder.capture_body(b'{"firstname": "Truncated"}', "response")
+
+    assert content.data == b'{"firstn'
+    assert content.truncated and content.size == 26
+    assert "[truncated, 26 bytes total]" in content.text()
+    with open(content.spill_path, "rb") as f:
+        assert f.read() == b'{"firstname": "Truncated"}'
+
+
+def test_auto_spill_dir_is_created_lazily_and_cleaned_up():
+    recorder = CallRecorder(body_limit=8)
+    recorder.configure(spill_dir="auto")
+
+    recorder.capture_body(b"short", "response")
+    assert recorder.spill_dir == "auto"
+    content = recorder.capture_body(b"a body longer than eight bytes", "response")
+    directory = os.path.dirname(content.spill_path)
+    assert os.path.isdir(directory)
+
+    recorder.cleanup()
+    assert not os.path.exists(directory)
+    assert recorder.spill_dir == "auto"
+
+
+def test_call_log_is_a_ring_buffer():
+    log = CallRecorder(max_calls=2).start()
+    for i in range(5):
+        log.append(i)
+    assert list(log) == [3, 4]
+    assert (log.total, log.dropped) == (5, 3)
@@ -0,0 +1,97 @@
+"""
+Tests for the binary capture store and its query CLI (utils/capture_store.py).
+"""
+
+import io
+import json
+import os
+
+from api.booking_api import BookingAPI
+from utils.capture import CallRecord, CapturedBody, recorder
+from utils.capture_store import CaptureReader, CaptureWriter, index_path, main, reindex
+
+
+def _record(method, url, status, duration, body=b'{"ok": true}'):
+    return CallRecord(method, url, status, duration, None, CapturedBody(b"", 0),
+                      CapturedBody(body, len(body)), {"Accept": "*/*"}, {"Content-Type": "application/json"})
+
+
+def _write(path, records):
+    writer = CaptureWriter(path)
+    for test_id, record in records:
+        writer.write(record, test_id)
+    writer.close()
+    return writer
+
+
+def test_records_live_calls_tagged_with_the_test(tmp_path, booker_server, payload_pool):
+    path = str(tmp_path / "calls.rbc")
+    writer = CaptureWriter(path)
+    writer.test_id = "tests/x.py::test_flow"
+    recorder.listeners.append(writer.on_call)
+    try:
+        api = BookingAPI(booker_server.url)
+        booking_id = api.create_booking(payload_pool.next()).json()["bookingid"]
+        api.get_booking(booking_id)
+    finally:
+        recorder.listeners.remove(writer.on_call)
+        writer.close()
+
+    reader = CaptureReader(path)
+    [entry] = reader.query(method="get", endpoint="/booking/{id}")
+    call = reader.load(entry)
+    assert call.test == "tests/x.py::test_flow"
+    assert call.url == f"{booker_server.url}/booking/{booking_id}"
+    assert call.status == 200
+    assert json.loads(call.response_body)["firstname"]
+    assert [e.method for e in reader.entries()] == ["POST", "GET"]
+
+
+def test_query_filters_by_method_endpoint_status_and_duration(tmp_path):
+    path = str(tmp_path / "calls.rbc")
+    _write(path, [
+        ("t::a", _record("PUT", "http://h/booking/1", 200, 0.7)),
+        ("t::a", _record("PUT", "http://h/booking/2", 200, 0.1)),
+        ("t::b", _record("PUT", "http://h/booking/3", 503, 0.9)),
+        ("t::b", _record("GET", "http://h/booking/3", 200, 0.8)),
+    ])
+    reader = CaptureReader(path)
+
+    slow_puts = list(reader.query(method="PUT", endpoint="/booking/{id}", min_ms=500))
+    assert [e.status for e in slow_puts] == [200, 503]
+    assert [e.test for e in reader.query(status="5xx")] == ["t::b"]
+    assert len(list(reader.query(endpoint="/booking*", test="t::b"))) == 2
+    assert list(reader.query(method="DELETE")) == []
+
+
+def test_appending_reuses_strings_and_reindex_tolerates_a_truncated_tail(tmp_path):
+    path = str(tmp_path / "calls.rbc")
+    _write(path, [("t::a", _record("GET", "http://h/booking/1", 200, 0.1))])
+    _write(path, [("t::a", _record("GET", "http://h/booking/2", 404, 0.2))])
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00R\x78")  # a crash mid-record
+
+    os.remove(index_path(path))
+    assert reindex(path) == 2
+    entries = list(CaptureReader(path).entries())
+    assert [(e.method, e.endpoint, e.status) for e in entries] == [
+        ("GET", "/booking/{id}", 200), ("GET", "/booking/{id}", 404)]
+
+
+def test_cli_lists_matches_across_files(tmp_path):
+    first, second = str(tmp_path / "calls.gw0.rbc"), str(tmp_path / "calls.gw1.rbc")
+    _write(first, [("t::a", _record("PUT", "http://h/booking/1", 200, 0.6))])
+    _write(second, [("t::b", _record("PUT", "http://h/booking/2", 200, 0.7)),
+                    ("t::b", _record("PUT", "http://h/booking/3", 200, 0.2))])
+
+    out = io.StringIO()
+    assert main(["query", first, second, "--method", "PUT", "--min-ms", "500", "--json"], out) == 0
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r["test"], r["url"]) for r in rows] == [("t::a", "http://h/booking/1"),
+                                                    ("t::b", "http://h/booking/2")]
+
+    out = io.StringIO()
+    main(["query", second, "--bodies", "--limit", "1"], out)
+    text = out.getvalue()
+    assert "PUT     http://h/booking/2  [t::b]" in text
+    assert '"ok": true' in text
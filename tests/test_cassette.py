@@ -0,0 +1,136 @@
+"""
+Tests for cassette record/replay (utils/cassette.py) against the local stand-in.
+"""
+
+import pytest
+
+from api.auth import TokenManager
+from api.booking_api import BookingAPI
+from config.config import USERNAME, PASSWORD
+from utils.capture import recorder
+from utils.capture_store import worker_path
+from utils.cassette import CassetteMiss, CassettePlayer, CassetteRecorder, diff, read_cassette
+
+BOOKING = {
+    "firstname": "Tape",
+    "lastname": "Deck",
+    "totalprice": 42,
+    "depositpaid": True,
+    "bookingdates": {"checkin": "2025-03-01", "checkout": "2025-03-04"},
+}
+# Nothing listens here; replayed requests must never reach the network
+UNREACHABLE = "http://127.0.0.1:9"
+
+
+def _flow(base_url):
+    api = BookingAPI(base_url)
+    # Fresh manager: the POST /auth must be recorded even if another test cached a token
+    api.authenticate(USERNAME, PASSWORD, manager=TokenManager())
+    booking_id = api.create_booking(BOOKING).json()["bookingid"]
+    before = api.get_booking(booking_id).json()
+    api.partial_update(booking_id, {"firstname": "Rewound"})
+    after = api.get_booking(booking_id).json()
+    deleted = api.delete_booking(booking_id).status_code
+    return booking_id, before["firstname"], after["firstname"], deleted
+
+
+def _record(path, base_url, flow=_flow, **kwargs):
+    cassette = CassetteRecorder(path, **kwargs)
+    recorder.raw_listeners.append(cassette)
+    try:
+        return flow(base_url)
+    finally:
+        recorder.raw_listeners.remove(cassette)
+        cassette.close()
+
+
+def _replay(path, flow=_flow):
+    player = CassettePlayer(path)
+    recorder.interceptor = player
+    try:
+        return flow(UNREACHABLE), player
+    finally:
+        recorder.interceptor = None
+
+
+def test_replay_answers_without_the_network(booker_server, tmp_path):
+    path = str(tmp_path / "flow.cassette")
+    recorded = _record(path, booker_server.url)
+
+    replayed, player = _replay(path)
+
+    assert replayed == recorded
+    assert recorded[1:] == ("Tape", "Rewound", 201)
+    assert player.misses == 0
+
+
+def test_unrecorded_request_raises_cassette_miss(booker_server, tmp_path):
+    path = str(tmp_path / "flow.cassette")
+    _record(path, booker_server.url)
+
+    recorder.interceptor = CassettePlayer(path)
+    try:
+        with pytest.raises(CassetteMiss):
+            BookingAPI(UNREACHABLE).health_check()
+    finally:
+        recorder.interceptor = None
+
+
+def test_diff_reports_changed_interactions(booker_server, tmp_path):
+    old, new = str(tmp_path / "old.cassette"), str(tmp_path / "new.cassette")
+    _record(old, booker_server.url)
+    _record(new, booker_server.url)
+
+    # Same flow, but the second run created a booking with a different id
+    changes = diff(old, new)
+    assert changes
+    assert diff(old, old) == []
+
+
+def test_worker_shards_are_merged_on_replay(booker_server, tmp_path):
+    path = str(tmp_path / "flow.cassette")
+    CassetteRecorder(path).close()
+    recorded = _record(worker_path(path, "gw1"), booker_server.url)
+
+    replayed, player = _replay(path)
+
+    assert replayed == recorded
+    assert player.misses == 0
+
+
+def _listing(base_url):
+    return list(BookingAPI(base_url).iter_bookings(chunk_size=64))
+
+
+@pytest.fixture
+def listed_bookings(booker_server):
+    """Three bookings so the listing is not empty; deleted afterwards."""
+    api = BookingAPI(booker_server.url)
+    api.authenticate(USERNAME, PASSWORD)
+    ids = [api.create_booking(BOOKING).json()["bookingid"] for _ in range(3)]
+    yield ids
+    api.delete_bookings(ids)
+
+
+def test_streamed_bodies_are_recorded_as_they_are_read(booker_server, listed_bookings, tmp_path):
+    path = str(tmp_path / "stream.cassette")
+    seen = []
+    # Runs after the cassette: the body must still be unread when it is handed on
+    recorder.raw_listeners.append(lambda request, response: seen.append(response._content))
+    try:
+        recorded = _record(path, booker_server.url, _listing)
+    finally:
+        recorder.raw_listeners.pop()
+
+    replayed, _ = _replay(path, _listing)
+
+    assert seen == [False]
+    assert set(listed_bookings) <= set(recorded)
+    assert replayed == recorded
+
+
+def test_oversized_streamed_bodies_are_skipped(booker_server, listed_bookings, tmp_path):
+    path = str(tmp_path / "stream.cassette")
+    _record(path, booker_server.url, _listing, max_stream_body=16)
+
+    assert read_cassette(path) == []
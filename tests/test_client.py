@@ -0,0 +1,102 @@
+"""
+Tests for BaseClient's retry and timeout policy (api/client.py).
+"""
+
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.client import BaseClient
+from config import config
+
+
+@pytest.fixture
+def flaky_server():
+    """Answers 503 to the first `failures` requests of each method, then 200; counts requests."""
+    hits = Counter()
+    state = {"failures": 2}
+
+    class Handler(BaseHTTPRequestHandler):
+        def _answer(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            hits[self.command] += 1
+            status = 503 if hits[self.command] <= state["failures"] else 200
+            body = f'{{"attempt": {hits[self.command]}}}'.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_PUT = do_DELETE = do_POST = _answer
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits, state
+    server.shutdown()
+    server.server_close()
+
+
+def _client(url, **kwargs):
+    return BaseClient(url, backoff_factor=0, transport="http1", throttle=False, **kwargs)
+
+
+def test_idempotent_methods_retry_on_503(flaky_server):
+    url, hits, _ = flaky_server
+    client = _client(url, max_retries=3)
+
+    responses = [client.get("/booking/1"), client.put("/booking/1", {}), client.delete("/booking/1")]
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert hits == Counter({"GET": 3, "PUT": 3, "DELETE": 3})
+
+
+def test_post_is_not_retried(flaky_server):
+    url, hits, _ = flaky_server
+
+    response = _client(url, max_retries=3).post("/booking", {})
+
+    assert response.status_code == 503
+    assert hits["POST"] == 1
+
+
+def test_exhausted_retries_return_the_last_response(flaky_server):
+    url, hits, state = flaky_server
+    state["failures"] = 10
+
+    response = _client(url, max_retries=2).get("/booking/1")
+
+    assert response.status_code == 503
+    assert response.json() == {"attempt": 3}
+    assert hits["GET"] == 3
+
+
+def test_configured_timeouts_reach_session_request(monkeypatch):
+    monkeypatch.setattr(config, "HTTP_CONNECT_TIMEOUT", 1.5)
+    monkeypatch.setattr(config, "HTTP_READ_TIMEOUT", 7.0)
+    client = _client("http://booker.invalid")
+    seen = {}
+
+    def request(method, url, **kwargs):
+        seen.update(kwargs)
+        return None
+
+    monkeypatch.setattr(client.session, "request", request)
+    client.get("/ping")
+
+    assert seen["timeout"] == (1.5, 7.0)
+    assert _client("http://booker.invalid", connect_timeout=2, read_timeout=3).timeout == (2, 3)
+
+
+def test_pool_settings_reach_the_adapter():
+    client = _client("http://booker.invalid", pool_connections=3, pool_maxsize=17, pool_block=True)
+
+    adapter = client.session.get_adapter("http://booker.invalid")
+    assert (adapter._pool_connections, adapter._pool_maxsize, adapter._pool_block) == (3, 17, True)
+    assert adapter.max_retries.allowed_methods == {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
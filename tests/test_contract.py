@@ -0,0 +1,133 @@
+"""
+Tests for the background contract checks of recorded responses (utils/contract.py).
+"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from api.booking_api import BookingAPI
+from utils.capture import CallRecord, CapturedBody, recorder
+from utils.contract import ContractChecker
+
+BOOKING = {
+    "firstname": "Jim",
+    "lastname": "Brown",
+    "totalprice": 111,
+    "depositpaid": True,
+    "bookingdates": {"checkin": "2018-01-01", "checkout": "2019-01-01"},
+    "additionalneeds": "Breakfast",
+}
+
+
+def _response(method, url, data, status=200):
+    body = json.dumps(data).encode()
+    return CallRecord(method, url, status, 0.01, None, CapturedBody(b"", 0), CapturedBody(body, len(body)))
+
+
+def test_reports_drift_per_endpoint(booker_server, payload_pool):
+    checker = ContractChecker("background", batch_size=2)
+    checker.test_id = "tests/x.py::test_live"
+    recorder.listeners.append(checker.on_call)
+    try:
+        api = BookingAPI(booker_server.url)
+        booking_id = api.create_booking(payload_pool.next()).json()["bookingid"]
+        api.get_booking(booking_id)
+        api.health_check()
+    finally:
+        recorder.listeners.remove(checker.on_call)
+    drifted = dict(BOOKING, totalprice="111", rating=5)
+    del drifted["lastname"]
+    checker.on_call(_response("GET", "http://h/booking/7", drifted))
+    checker.finish()
+    checker.close()
+
+    rows = {(r["method"], r["endpoint"]): r for r in checker.summary()}
+    assert set(rows) == {("POST", "/booking"), ("GET", "/booking/{id}")}
+    assert rows["POST", "/booking"]["drifted"] == 0
+    get = rows["GET", "/booking/{id}"]
+    assert (get["checked"], get["drifted"]) == (2, 1)
+    assert [issue["problem"] for issue in get["issues"]] == [
+        "booking.lastname: field required",
+        "booking.totalprice: expected int, got str",
+        "booking.rating: unexpected field",
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_session_mode_validates_in_batches_at_the_end(workers):
+    checker = ContractChecker("session", workers=workers, batch_size=2)
+    for i in range(5):
+        checker.on_call(_response("PUT", f"http://h/booking/{i}", BOOKING))
+    checker.on_call(_response("POST", "http://h/booking", {"bookingid": "1", "booking": BOOKING}))
+    checker.on_call(_response("GET", "http://h/booking/1", {"reason": "gone"}, status=404))
+    assert checker.summary() == []
+
+    checker.finish()
+
+    rows = {(r["method"], r["endpoint"]): r for r in checker.summary()}
+    assert rows["PUT", "/booking/{id}"]["checked"] == 5
+    assert rows["PUT", "/booking/{id}"]["drifted"] == 0
+    assert rows["POST", "/booking"]["issues"][0]["problem"] == "response.bookingid: expected int, got str"
+    assert ("GET", "/booking/{id}") not in rows
+
+
+def test_truncated_bodies_are_unchecked():
+    checker = ContractChecker("session")
+    body = json.dumps(BOOKING).encode()
+    checker.on_call(CallRecord("GET", "http://h/booking/1", 200, 0.01, None, CapturedBody(b""),
+                               CapturedBody(body[:10], len(body))))
+    checker.finish()
+
+    [row] = checker.summary()
+    assert (row["checked"], row["unchecked"]) == (0, 1)
+
+
+def test_missing_spill_file_is_unchecked(tmp_path):
+    checker = ContractChecker("session")
+    body = json.dumps(BOOKING).encode()
+    checker.on_call(CallRecord("GET", "http://h/booking/1", 200, 0.01, None, CapturedBody(b""),
+                               CapturedBody(body[:10], len(body), str(tmp_path / "gone.bin"))))
+    checker.finish()
+
+    [row] = checker.summary()
+    assert (row["checked"], row["unchecked"]) == (0, 1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_session_mode_spills_batches_over_the_memory_cap(workers):
+    checker = ContractChecker("session", workers=workers, batch_size=2, max_queued_bytes=800)
+    for i in range(8):
+        checker.on_call(_response("PUT", f"http://h/booking/{i}", BOOKING))
+    spill_dir = checker._spill_dir
+
+    assert checker._queued_bytes <= 800
+    assert sorted(os.listdir(spill_dir)) == ["batch-2.pickle", "batch-3.pickle"]
+    checker.finish()
+    checker.close()
+
+    [row] = checker.summary()
+    assert (row["checked"], row["drifted"]) == (8, 0)
+    assert not os.path.exists(spill_dir)
+
+
+def test_worker_results_are_merged_by_the_controller():
+    workers = [ContractChecker("session"), ContractChecker("session")]
+    workers[0].test_id = "tests/a.py::test_a"
+    workers[0].on_call(_response("GET", "http://h/booking/1", dict(BOOKING, rating=5)))
+    workers[1].test_id = "tests/b.py::test_b"
+    workers[1].on_call(_response("GET", "http://h/booking/2", dict(BOOKING, rating=4)))
+    workers[1].on_call(_response("GET", "http://h/booking/3", BOOKING))
+    controller = ContractChecker("session")
+
+    for worker in workers:
+        session = SimpleNamespace(config=SimpleNamespace(workeroutput={}))
+        worker.pytest_sessionfinish(session)
+        controller.pytest_testnodedown(SimpleNamespace(workeroutput=session.config.workeroutput), None)
+
+    [row] = controller.summary()
+    assert (row["checked"], row["drifted"]) == (3, 2)
+    assert row["issues"] == [{"problem": "booking.rating: unexpected field", "count": 2,
+                              "example": "tests/a.py::test_a"}]
@@ -0,0 +1,170 @@
+"""
+Tests for deadlines and per-call timeouts (api/deadline.py, api/client.py).
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from api.async_client import AsyncBaseClient
+from api.client import BaseClient
+from api.deadline import DeadlineExceeded, current, deadline
+from api.throttle import Throttle
+from utils.capture import recorder
+
+
+@pytest.fixture
+def hung_server():
+    """Accepts connections and never answers; yields (url, accepted connection count)."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    accepted = []
+    stop = threading.Event()
+
+    def serve():
+        listener.settimeout(0.05)
+        while not stop.is_set():
+            try:
+                accepted.append(listener.accept()[0])
+            except OSError:
+                continue
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}", accepted
+    stop.set()
+    thread.join()
+    for conn in accepted:
+        conn.close()
+    listener.close()
+
+
+@pytest.fixture
+def overloaded_server():
+    """Answers every request with 503 and Retry-After: 5."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(503)
+            self.send_header("Retry-After", "5")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline_caps_a_hung_call_and_is_recorded(hung_server, record_api_calls):
+    url, _ = hung_server
+    client = BaseClient(url, read_timeout=30, max_retries=0, transport="http1")
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded), deadline(0.4):
+        client.get("/booking/1")
+
+    assert time.perf_counter() - started < 1.5
+    [call] = record_api_calls
+    assert call.timed_out == "deadline"
+    assert call.timeout[1] <= 0.4
+
+
+def test_per_call_timeout_overrides_the_client_default(hung_server, record_api_calls):
+    url, _ = hung_server
+    client = BaseClient(url, read_timeout=30, max_retries=0, transport="http1")
+
+    with pytest.raises(requests.exceptions.ReadTimeout) as excinfo:
+        client.get("/booking/1", timeout=(1, 0.2))
+
+    assert not isinstance(excinfo.value, DeadlineExceeded)
+    assert record_api_calls[-1].timed_out == "read"
+    assert record_api_calls[-1].timeout == (1, 0.2)
+
+
+def test_retries_only_get_the_remaining_time(hung_server):
+    url, accepted = hung_server
+    client = BaseClient(url, read_timeout=0.3, max_retries=10, backoff_factor=0, transport="http1")
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded), deadline(0.8):
+        client.get("/booking/1")
+
+    assert time.perf_counter() - started < 1.3
+    # Retried while time was left, and gave up when it ran out
+    assert 2 <= len(accepted) <= 4
+
+
+def test_retry_after_longer_than_the_budget_returns_the_response(overloaded_server):
+    client = BaseClient(overloaded_server, max_retries=3, transport="http1")
+
+    started = time.perf_counter()
+    with deadline(1.0):
+        response = client.get("/booking/1")
+
+    assert response.status_code == 503
+    assert time.perf_counter() - started < 1.0
+
+
+def test_throttle_waits_count_against_the_deadline(hung_server):
+    url, accepted = hung_server
+    throttle = Throttle(rate=0, initial_concurrency=1, max_concurrency=1)
+    client = BaseClient(url, throttle=throttle, transport="http1")
+    # The only concurrency slot is held by another call
+    throttle.limiter.acquire()
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded, match="concurrency slot"), deadline(0.2):
+        client.get("/ping")
+    assert 0.15 < time.perf_counter() - started < 1.0
+    throttle.limiter.release(0.01)
+
+    throttle = Throttle(rate=1, burst=1)
+    client = BaseClient(url, throttle=throttle, transport="http1")
+    # The next token is a second away: more than the budget, so no point waiting
+    throttle.bucket.reserve()
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded, match="rate limit"), deadline(0.2):
+        client.get("/ping")
+    assert time.perf_counter() - started < 0.15
+    assert accepted == []
+
+
+def test_nested_deadlines_only_shorten_and_expiry_stops_new_calls(hung_server):
+    url, accepted = hung_server
+    client = BaseClient(url, transport="http1")
+    calls = []
+    recorder.listeners.append(calls.append)
+    try:
+        with deadline(0.05) as outer:
+            with deadline(60) as inner:
+                assert inner is outer is current()
+            time.sleep(0.06)
+            with pytest.raises(DeadlineExceeded):
+                client.get("/booking/1")
+    finally:
+        recorder.listeners.remove(calls.append)
+    assert current() is None
+    assert calls == [] and accepted == []
+
+
+def test_async_calls_are_cancelled_at_the_deadline(hung_server):
+    url, _ = hung_server
+
+    async def flow():
+        async with AsyncBaseClient(url) as client:
+            with deadline(0.3):
+                await asyncio.gather(client.get("/booking/1"), client.get("/booking/2"))
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(flow())
+    assert time.perf_counter() - started < 1.5
@@ -1,10 +1,10 @@
 """
 End-to-end booking flow test helpers and an example CRUD test.
 
-This module defines pytest fixtures used to build and authorize API requests,
-a request helper that records request/response details for debugging, and an
-example test that performs a full create/read/update/delete flow against
-the RESTful Booker API.
+This module defines pytest fixtures for the base URL, an auth token and a booking
+payload, and a test that drives the shared create/read/update/delete flow
+(api/scenarios.py::crud_flow) against the RESTful Booker API; its calls are
+recorded by the shared capture store.
 
 Note about __init__.py:
     The tests package's __init__.py is typically empty to ensure pytest discovers
@@ -15,20 +15,13 @@ Note about __init__.py:
 # python
 # File: `conftest.py`
 import os
-import json
-import requests
 import pytest
-from faker import Faker
 
-# optional import for pytest-html extras
-try:
-    from pytest_html import extras as html_extras
-except Exception:
-    html_extras = None
+from api.booking_api import BookingAPI
+from api.scenarios import crud_flow
+from utils.resources import unique_name
 
 BASE_URL = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
-fake = Faker()
-_token = None
 
 @pytest.fixture(scope="session")
 def base_url():
@@ -37,114 +30,23 @@ def base_url():
 
 @pytest.fixture(scope="session")
 def token():
-    """Authenticates the user and retrieves the token for subsequent requests."""
-    global _token
-    if _token:
-        return _token
-    resp = requests.post(f"{BASE_URL}/auth", json={"username": os.getenv("BOOKER_USER", "admin"),
-                                                   "password": os.getenv("BOOKER_PASS", "password123")})
-    resp.raise_for_status()
-    _token = resp.json().get("token")
-    return _token
+    """Returns an auth token, cached and shared by api.auth.token_manager."""
+    return BookingAPI(BASE_URL).authenticate(os.getenv("BOOKER_USER", "admin"),
+                                             os.getenv("BOOKER_PASS", "password123"))
 
 @pytest.fixture
-def auth_headers(token):
-    """Returns the authorization headers for API requests."""
-    return {"Content-Type": "application/json", "Cookie": f"token={token}"}
+def random_booking(payload_pool):
+    """Returns the next payload from the seeded pool; the lastname is unique per worker."""
+    booking = payload_pool.next()
+    booking["lastname"] = unique_name(booking["lastname"])
+    return booking
 
-@pytest.fixture
-def random_booking():
-    """Generates a random booking payload for testing."""
-    return {
-        "firstname": fake.first_name(),
-        "lastname": fake.last_name(),
-        "totalprice": fake.random_int(50, 500),
-        "depositpaid": False,
-        "bookingdates": {"checkin": "2025-01-01", "checkout": "2025-01-05"},
-        "additionalneeds": "Breakfast"
-    }
-
-@pytest.fixture
-def api_request(request):
-    """
-    Returns a function to perform HTTP requests and record detailed
-    request/response text into `request.node.crud_logs` for the current test.
-
-    The `api_request` fixture records human-readable request/response text on the
-    current pytest node (request.node.crud_logs) so reporting hooks can include it.
-    """
-    def _api_request(method, url, **kwargs):
-        method_u = method.upper()
-        req_headers = kwargs.get("headers", {})
-        req_body = kwargs.get("json", kwargs.get("data", None))
-        try:
-            req_body_text = json.dumps(req_body, indent=2, default=str) if isinstance(req_body, (dict, list)) else str(req_body)
-        except Exception:
-            req_body_text = str(req_body)
-
-        parts = []
-        parts.append(f"Request: {method_u} {url}")
-        parts.append("Request headers:\n" + (json.dumps(req_headers, indent=2) if req_headers else "<empty>"))
-        parts.append("Request body:\n" + (req_body_text or "<empty>"))
-
-        resp = requests.request(method_u, url, **kwargs)
-
-        try:
-            resp_json = resp.json()
-            resp_body_text = json.dumps(resp_json, indent=2)
-        except Exception:
-            resp_body_text = resp.text
-
-        parts.append(f"Response status: {resp.status_code}")
-        parts.append("Response headers:\n" + json.dumps(dict(resp.headers), indent=2))
-        parts.append("Response body:\n" + (resp_body_text or "<empty>"))
+def test_full_crud_flow(base_url, token, random_booking, record_api_calls):
+    """Tests the full create/read/update/delete flow for a booking (api/scenarios.py::crud_flow)."""
+    api = BookingAPI(base_url)
+    api.set_token(token)
 
-        text = "\n\n".join(parts)
+    bookingid = crud_flow(api, random_booking)
 
-        if not hasattr(request.node, "crud_logs"):
-            request.node.crud_logs = []
-        request.node.crud_logs.append(text)
-
-        return resp
-
-    return _api_request
-
-# attach recorded logs to pytest-html report (if pytest-html is installed)
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    outcome = yield
-    report = outcome.get_result()
-    if report.when == "call" and hasattr(item, "crud_logs") and html_extras is not None:
-        extras = getattr(report, "extra", [])
-        for i, txt in enumerate(item.crud_logs):
-            extras.append(html_extras.text(txt, name=f"API Call {i+1}"))
-        report.extra = extras
-
-# --------------------------------------------------------------------
-# Example of using `api_request` in a test (update your existing test to use this)
-# File: `tests/test_e2e_booking_flow.py` (snippet)
-def test_full_crud_flow(base_url, auth_headers, random_booking, api_request):
-    """Tests the full create/read/update/delete flow for a booking."""
-    # CREATE
-    r = api_request("post", f"{base_url}/booking", json=random_booking, headers={"Content-Type": "application/json"})
-    assert r.status_code == 200
-    bookingid = r.json().get("bookingid")
     assert bookingid is not None
-
-    # READ
-    r = api_request("get", f"{base_url}/booking/{bookingid}")
-    assert r.status_code == 200
-
-    # UPDATE
-    updated = dict(random_booking, firstname="UpdatedName")
-    r = api_request("put", f"{base_url}/booking/{bookingid}", json=updated, headers=auth_headers)
-    assert r.status_code in (200, 201)
-
-    # VERIFY
-    r = api_request("get", f"{base_url}/booking/{bookingid}")
-    assert r.status_code == 200
-    assert r.json().get("firstname") == "UpdatedName"
-
-    # DELETE
-    r = api_request("delete", f"{base_url}/booking/{bookingid}", headers=auth_headers)
-    assert r.status_code in (200, 201, 204)
+    assert [call.method for call in record_api_calls][-5:] == ["POST", "GET", "PUT", "GET", "DELETE"]
@@ -0,0 +1,58 @@
+"""
+Tests for streaming the booking listing (api/streaming.py, BookingAPI.iter_bookings).
+"""
+
+import json
+
+import pytest
+
+from api.booking_api import BookingAPI
+from api.streaming import iter_json_array
+
+
+def _booking(lastname):
+    return {
+        "firstname": "Stream",
+        "lastname": lastname,
+        "totalprice": 5,
+        "depositpaid": True,
+        "bookingdates": {"checkin": "2025-03-01", "checkout": "2025-03-02"},
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_json_array_across_chunk_boundaries(chunk_size):
+    doc = json.dumps([{"bookingid": 1}, 12.5, "é", None, [1, 2]]).encode("utf-8")
+    chunks = [doc[i:i + chunk_size] for i in range(0, len(doc), chunk_size)]
+    assert list(iter_json_array(chunks)) == json.loads(doc)
+
+
+def test_iter_json_array_reads_to_the_end_of_the_stream():
+    chunks = iter([b"[1, 2]", b" \n", b"\n"])
+    assert list(iter_json_array(chunks)) == [1, 2]
+    assert next(chunks, None) is None
+
+
+@pytest.mark.parametrize("doc", [b"{}", b"[1,]", b"[1 2]", b"[1", b"[1] 2"])
+def test_iter_json_array_rejects_malformed_input(doc):
+    with pytest.raises(ValueError):
+        list(iter_json_array([doc]))
+
+
+def test_iter_bookings_streams_filtered_ids(booker_server):
+    api = BookingAPI(booker_server.url)
+    ids = [r.response.json()["bookingid"]
+           for r in api.create_bookings([_booking("Listing") for _ in range(30)])]
+    api.create_booking(_booking("Other"))
+
+    assert list(api.iter_bookings(lastname="Listing", chunk_size=7)) == sorted(ids)
+
+
+def test_iter_bookings_hydrates_in_order(booker_server):
+    api = BookingAPI(booker_server.url)
+    ids = [api.create_booking(_booking("Hydrate")).json()["bookingid"] for _ in range(5)]
+
+    results = list(api.iter_bookings(hydrate=True, prefetch=2, lastname="Hydrate"))
+
+    assert [r.item for r in results] == ids
+    assert all(r.ok and r.response.json()["lastname"] == "Hydrate" for r in results)
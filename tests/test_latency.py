@@ -0,0 +1,67 @@
+"""
+Tests for the API latency aggregation (utils/latency.py).
+"""
+
+from types import SimpleNamespace
+
+from utils import latency
+from utils.latency import EndpointStats, LatencyPlugin, endpoint_key, percentile
+
+
+def _call(method, url, status, duration):
+    return SimpleNamespace(method=method, url=url, status=status, duration=duration)
+
+
+def test_endpoint_key_folds_ids():
+    assert endpoint_key("get", "http://h/booking/42?x=1") == ("GET", "/booking/{id}")
+    assert endpoint_key("POST", "http://h/booking") == ("POST", "/booking")
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 90) == 3.0
+
+
+def test_summary_per_endpoint():
+    plugin = LatencyPlugin()
+    plugin.on_call(_call("GET", "http://h/booking/1", 200, 0.002))
+    plugin.on_call(_call("GET", "http://h/booking/2", 404, 0.004))
+    plugin.on_call(_call("GET", "http://h/booking/3", None, 20.0))
+
+    (row,) = plugin.summary()
+    assert (row["method"], row["endpoint"], row["count"], row["errors"]) == ("GET", "/booking/{id}", 3, 2)
+    assert row["p50"] == 0.004 and row["max"] == 20.0
+    assert [b["count"] for b in row["histogram"]][0] == 2
+    assert row["histogram"][-1] == {"le": "+Inf", "count": 1}
+
+
+def test_reservoir_is_bounded_and_exact_fields_stay_exact(monkeypatch):
+    monkeypatch.setattr(latency, "RESERVOIR_SIZE", 100)
+    stats = EndpointStats()
+    for i in range(1, 1001):
+        stats.add(i / 1000, error=i % 10 == 0)
+
+    summary = stats.summary()
+    assert len(stats.durations) == 100
+    assert (summary["count"], summary["errors"], summary["max"]) == (1000, 100, 1.0)
+    assert 0.35 < summary["p50"] < 0.65
+
+
+def test_worker_stats_are_merged_by_the_controller():
+    workers = [LatencyPlugin(), LatencyPlugin()]
+    workers[0].on_call(_call("GET", "http://h/booking/1", 200, 0.002))
+    workers[1].on_call(_call("GET", "http://h/booking/2", 500, 0.008))
+    workers[1].on_call(_call("POST", "http://h/booking", 200, 0.004))
+    controller = LatencyPlugin()
+
+    for worker in workers:
+        session = SimpleNamespace(config=SimpleNamespace(workeroutput={}))
+        worker.pytest_sessionfinish(session)
+        controller.pytest_testnodedown(SimpleNamespace(workeroutput=session.config.workeroutput), None)
+
+    rows = {(r["method"], r["endpoint"]): r for r in controller.summary()}
+    get = rows["GET", "/booking/{id}"]
+    assert (get["count"], get["errors"], get["max"]) == (2, 1, 0.008)
+    assert rows["POST", "/booking"]["count"] == 1
@@ -0,0 +1,38 @@
+"""
+Tests for the load runner (utils/load_runner.py) against the local stand-in.
+"""
+
+import pytest
+
+from api.scenarios import ScenarioError
+from utils.load_runner import LoadRunner, parse_duration
+
+
+@pytest.mark.parametrize("text, seconds", [("90", 90.0), ("90s", 90.0), ("1.5m", 90.0), ("250ms", 0.25)])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+def test_crud_flow_under_load(booker_server):
+    # The stand-in is shared by the session, so only bookings added by this run count
+    before = set(booker_server.store.bookings)
+    result = LoadRunner(booker_server.url, users=3, duration=0.5, ramp_up=0.1).run()
+
+    summary = result.summary()
+    assert summary["iterations"] > 0 and summary["failures"] == 0
+    assert [s["step"] for s in summary["steps"]] == ["create", "read", "update", "verify", "delete"]
+    assert all(s["count"] == summary["iterations"] and s["errors"] == 0 for s in summary["steps"])
+    # Every booking created by the run was deleted again
+    assert not set(booker_server.store.bookings) - before
+
+
+def test_step_errors_are_attributed(booker_server):
+    def broken_flow(api, booking, step):
+        with step("create"):
+            api.create_booking({"firstname": "Invalid"})
+        raise ScenarioError("create", "status 500")
+
+    result = LoadRunner(booker_server.url, users=1, duration=0.2, scenario=broken_flow).run()
+
+    (create,) = result.summary()["steps"]
+    assert create["errors"] == create["count"] == result.failures
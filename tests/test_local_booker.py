@@ -0,0 +1,109 @@
+"""
+Tests for the local Restful Booker stand-in (utils/local_booker.py).
+
+These run entirely offline against the `booker_server` fixture and check that the
+stand-in answers with the same status codes and bodies as the real service, using
+the project's own BookingAPI client.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from api.booking_api import BookingAPI
+from config.config import USERNAME, PASSWORD
+from utils.local_booker import H2_PREFACE, _is_h2
+
+
+def _booking(firstname="Jim", lastname="Brown", checkin="2025-01-01", checkout="2025-01-05"):
+    return {
+        "firstname": firstname,
+        "lastname": lastname,
+        "totalprice": 111,
+        "depositpaid": True,
+        "bookingdates": {"checkin": checkin, "checkout": checkout},
+        "additionalneeds": "Breakfast",
+    }
+
+
+@pytest.fixture
+def api(booker_server):
+    """BookingAPI authenticated against the stand-in."""
+    client = BookingAPI(booker_server.url)
+    client.set_token(client.create_token(USERNAME, PASSWORD).json()["token"])
+    return client
+
+
+def test_ping_returns_created(booker_server):
+    assert BookingAPI(booker_server.url).health_check().status_code == 201
+
+
+def test_auth_rejects_bad_credentials(booker_server):
+    resp = BookingAPI(booker_server.url).create_token(USERNAME, "wrong")
+    assert resp.status_code == 200
+    assert resp.json() == {"reason": "Bad credentials"}
+
+
+def test_crud_status_codes(api):
+    created = api.create_booking(_booking())
+    assert created.status_code == 200
+    booking_id = created.json()["bookingid"]
+
+    assert api.get_booking(booking_id).json()["firstname"] == "Jim"
+    assert api.update_booking(booking_id, _booking(firstname="Updated")).json()["firstname"] == "Updated"
+    patched = api.partial_update(booking_id, {"bookingdates": {"checkout": "2025-02-01"}})
+    assert patched.json()["bookingdates"] == {"checkin": "2025-01-01", "checkout": "2025-02-01"}
+
+    assert api.delete_booking(booking_id).status_code == 201
+    assert api.get_booking(booking_id).status_code == 404
+    assert api.delete_booking(booking_id).status_code == 405
+
+
+def test_writes_require_auth(api, booker_server):
+    booking_id = api.create_booking(_booking()).json()["bookingid"]
+    anonymous = BookingAPI(booker_server.url)
+    assert anonymous.update_booking(booking_id, _booking()).status_code == 403
+    assert anonymous.delete_booking(booking_id).status_code == 403
+
+
+def test_invalid_payload_is_rejected(api):
+    assert api.create_booking({"firstname": "Only"}).status_code == 500
+
+
+def test_listing_filters(api):
+    first = api.create_booking(_booking(firstname="Filter", checkin="2030-01-01")).json()["bookingid"]
+    api.create_booking(_booking(firstname="Filter", checkin="2020-01-01"))
+
+    ids = [b["bookingid"] for b in api.get("/booking?firstname=Filter&checkin=2029-12-31").json()]
+    assert ids == [first]
+
+
+def test_bulk_create_and_delete(api):
+    results = api.create_bookings([_booking(lastname=f"Bulk{i}") for i in range(20)], max_in_flight=5)
+    assert all(r.ok for r in results)
+    assert [r.item["lastname"] for r in results] == [f"Bulk{i}" for i in range(20)]
+
+    ids = [r.response.json()["bookingid"] for r in results]
+    deleted = api.delete_bookings(ids + [ids[0]], max_in_flight=5)
+    assert [r.ok for r in deleted] == [True] * 20 + [False]
+
+
+def test_h2_preface_detection_waits_without_spinning():
+    client, server = socket.socketpair()
+    try:
+        # A stalled client: part of the preface, then nothing
+        client.sendall(H2_PREFACE[:5])
+        cpu, started = time.process_time(), time.perf_counter()
+        assert not _is_h2(server, timeout=0.3)
+        assert 0.25 < time.perf_counter() - started < 1.0
+        assert time.process_time() - cpu < 0.15
+
+        # The rest arrives in time; nothing has been consumed
+        threading.Timer(0.05, client.sendall, (H2_PREFACE[5:],)).start()
+        assert _is_h2(server, timeout=2)
+        assert server.recv(len(H2_PREFACE)) == H2_PREFACE
+    finally:
+        client.close()
+        server.close()
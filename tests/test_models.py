@@ -0,0 +1,54 @@
+"""
+Tests for the fast-path booking records in api/models.py.
+"""
+
+import json
+
+import pytest
+
+from api.booking_api import BookingAPI
+from api.models import Booking, BookingRecord, BookingValidationError
+from config.config import USERNAME, PASSWORD
+
+SAMPLE = {
+    "firstname": "Jim",
+    "lastname": "Brown é",
+    "totalprice": 111,
+    "depositpaid": True,
+    "bookingdates": {"checkin": "2018-01-01", "checkout": "2019-01-01"},
+    "additionalneeds": "Breakfast",
+}
+
+
+def test_record_round_trip_matches_pydantic():
+    record = BookingRecord.from_dict(SAMPLE)
+
+    assert json.loads(record.to_json_bytes()) == SAMPLE
+    assert record.to_dict() == Booking.parse_obj(SAMPLE).dict()
+    assert BookingRecord.from_json(record.to_json_bytes()) == record
+
+
+def test_additionalneeds_is_optional():
+    data = {k: v for k, v in SAMPLE.items() if k != "additionalneeds"}
+    assert json.loads(BookingRecord.from_dict(data).to_json_bytes()) == data
+
+
+@pytest.mark.parametrize("patch, message", [
+    ({"firstname": None}, "booking.firstname: expected str"),
+    ({"totalprice": True}, "booking.totalprice: expected int"),
+    ({"depositpaid": "yes"}, "booking.depositpaid: expected bool"),
+    ({"bookingdates": {"checkin": "2018-01-01"}}, "booking.bookingdates.checkout: field required"),
+])
+def test_invalid_payloads_name_the_field(patch, message):
+    with pytest.raises(BookingValidationError, match=message):
+        BookingRecord.from_dict(dict(SAMPLE, **patch))
+
+
+def test_typed_api_methods(booker_server):
+    api = BookingAPI(booker_server.url)
+    api.authenticate(USERNAME, PASSWORD)
+
+    booking_id, created = api.create_booking_model(BookingRecord.from_dict(SAMPLE))
+
+    assert created.to_dict() == SAMPLE
+    assert api.get_booking_model(booking_id) == created
@@ -0,0 +1,47 @@
+"""
+Tests for the seeded booking payload pool (utils/payloads.py).
+"""
+
+import pytest
+
+from api.booking_api import BookingAPI
+from api.models import Booking, BookingRecord
+from utils.payloads import PayloadPool
+
+
+def test_generation_is_deterministic():
+    assert PayloadPool.generate(50, seed=7).sample(50) == PayloadPool.generate(50, seed=7).sample(50)
+    assert PayloadPool.generate(50, seed=7).sample(50) != PayloadPool.generate(50, seed=8).sample(50)
+
+
+def test_saved_pool_is_reloaded_with_mmap(tmp_path):
+    path = str(tmp_path / "pool.bin")
+    generated = PayloadPool.open(path, 200, seed=3)
+    loaded = PayloadPool.open(path, 200, seed=3)
+    try:
+        assert loaded._source is not None
+        assert len(loaded) == 200 and loaded.seed == 3
+        assert loaded.sample(200) == generated.sample(200)
+        assert loaded[201] == loaded[1]
+    finally:
+        loaded.close()
+
+
+def test_payloads_are_independent_copies():
+    pool = PayloadPool.generate(3)
+    pool[0]["firstname"] = "Changed"
+    assert pool[0]["firstname"] != "Changed"
+
+
+def test_every_payload_is_valid():
+    for payload in PayloadPool.generate(2000, seed=11).sample(2000):
+        BookingRecord.from_dict(payload)
+        Booking.parse_obj(payload)
+        assert payload["bookingdates"]["checkin"] < payload["bookingdates"]["checkout"]
+
+
+@pytest.mark.payload_cases(5)
+def test_stand_in_accepts_pool_payloads(booker_server, booking_payload):
+    resp = BookingAPI(booker_server.url).create_booking(booking_payload)
+    assert resp.status_code == 200
+    assert resp.json()["booking"] == booking_payload
@@ -0,0 +1,62 @@
+"""
+Tests for the streaming JSON-lines report and its paginated HTML view
+(utils/report_stream.py).
+"""
+
+from types import SimpleNamespace
+
+from utils.capture import CallLog, CallRecord, CapturedBody
+from utils.report_stream import ReportWriter, StreamingReportPlugin, iter_report, render_html
+
+
+def _test_line(i, outcome="passed"):
+    return {"type": "test", "nodeid": f"tests/test_x.py::test_{i}", "outcome": outcome,
+            "duration": 0.01, "calls": []}
+
+
+def test_render_paginates_and_flags_crashed_runs(tmp_path):
+    path = str(tmp_path / "report.jsonl")
+    writer = ReportWriter(path, truncate=True)
+    writer.write({"type": "session", "started": 0})
+    for i in range(25):
+        writer.write(_test_line(i, "failed" if i == 21 else "passed"))
+    writer.close()
+    # A crash mid-write leaves a torn last line and no summary
+    with open(path, "a") as f:
+        f.write('{"type": "test", "nodeid": "tor')
+
+    result = render_html(path, str(tmp_path / "html"), page_size=10)
+
+    assert result == {"tests": 25, "pages": 3, "outcomes": {"passed": 24, "failed": 1}, "complete": False}
+    index = (tmp_path / "html" / "index.html").read_text()
+    assert "incomplete" in index
+    assert "<a href='page-0003.html'>tests/test_x.py::test_21</a>" in index
+    assert "test_24" in (tmp_path / "html" / "page-0003.html").read_text()
+
+
+def _phase(when, outcome="passed", text=""):
+    return SimpleNamespace(when=when, duration=0.5, failed=outcome == "failed",
+                           skipped=outcome == "skipped", longreprtext=text)
+
+
+def test_failed_entries_carry_api_call_bodies(tmp_path):
+    plugin = StreamingReportPlugin(str(tmp_path / "report.jsonl"))
+    calls = CallLog()
+    calls.append(CallRecord("GET", "http://booker/booking/1", 404, 0.002, None,
+                            CapturedBody(b""), CapturedBody(b"Not Found", 9)))
+    item = SimpleNamespace(nodeid="tests/test_x.py::test_get", _api_calls=calls)
+
+    entry = plugin.entry(item, {"setup": _phase("setup"),
+                                "call": _phase("call", "failed", "assert 404 == 200"),
+                                "teardown": _phase("teardown")})
+    passed = plugin.entry(item, {"call": _phase("call")})
+    plugin.pytest_sessionfinish(None, 1)
+    plugin.pytest_unconfigure(None)
+
+    assert entry["outcome"] == "failed"
+    assert entry["duration"] == 1.5
+    assert "assert 404 == 200" in entry["longrepr"]
+    assert entry["calls"][0]["response_body"] == "Not Found"
+    assert "response_body" not in passed["calls"][0]
+    lines = list(iter_report(plugin.path))
+    assert [line["type"] for line in lines] == ["session", "summary"]
@@ -0,0 +1,50 @@
+"""
+Tests for test-data tracking and cleanup (utils/resources.py).
+"""
+
+from api.booking_api import BookingAPI
+from utils.resources import ResourceTracker, unique_name, worker_id
+
+BOOKING = {
+    "firstname": "Tracked",
+    "lastname": "Booking",
+    "totalprice": 1,
+    "depositpaid": True,
+    "bookingdates": {"checkin": "2025-01-01", "checkout": "2025-01-02"},
+}
+
+
+def _tracked(tracker, base_url):
+    return {i.booking_id: i for i in tracker.leftovers() if i.base_url == base_url}
+
+
+def test_unique_names_carry_worker_and_counter():
+    first, second = unique_name("Smith"), unique_name("Smith")
+    assert first != second
+    assert first.startswith("Smith-") and f"-{worker_id()}-" in first
+
+
+def test_bookings_are_tracked_until_deleted(booker_server, booking_tracker, request):
+    api = BookingAPI(booker_server.url)
+    api.authenticate()
+    booking_id = api.create_booking(BOOKING).json()["bookingid"]
+
+    tracked = _tracked(booking_tracker, booker_server.url)
+    assert tracked[booking_id].owner == request.node.nodeid
+
+    api.delete_booking(booking_id)
+    assert booking_id not in _tracked(booking_tracker, booker_server.url)
+
+
+def test_cleanup_deletes_leftovers(booker_server):
+    api = BookingAPI(booker_server.url)
+    ids = [api.create_booking(BOOKING).json()["bookingid"] for _ in range(5)]
+    tracker = ResourceTracker()
+    for booking_id in ids:
+        tracker.track(booker_server.url, booking_id, owner="leaky-test")
+
+    summary = tracker.cleanup(batch_size=2)
+
+    assert summary == {"deleted": 5, "failed": 0, "owners": {"leaky-test": 5}}
+    assert not tracker.leftovers()
+    assert all(api.get_booking(i).status_code == 404 for i in ids)
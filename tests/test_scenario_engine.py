@@ -0,0 +1,104 @@
+"""
+Tests for the dependency-graph scenario engine (api/scenario_engine.py).
+"""
+
+import time
+
+import pytest
+
+from api.booking_api import BookingAPI
+from api.scenario_engine import Ref, Scenario, Step, crud_steps
+from api.scenarios import ScenarioError
+
+
+@pytest.fixture
+def api(booker_server):
+    api = BookingAPI(booker_server.url)
+    api.authenticate()
+    return api
+
+
+def test_parallel_crud_flows_keep_per_booking_order(api, booker_server, payload_pool):
+    scenario = Scenario()
+    for i in range(6):
+        scenario.extend(crud_steps(payload_pool.next(), prefix=f"b{i}:"))
+
+    run = scenario.run(api, max_in_flight=8)
+
+    assert run.ok, run.failures
+    for i in range(6):
+        steps = [run[f"b{i}:{name}"] for name in ("create", "read", "update", "verify", "delete")]
+        for before, after in zip(steps, steps[1:]):
+            assert before.started + before.duration <= after.started
+        assert steps[0].response.json()["bookingid"] not in booker_server.store.bookings
+
+
+def test_independent_steps_overlap(api):
+    def slow(api, seconds):
+        time.sleep(seconds)
+        return api.health_check()
+
+    scenario = Scenario()
+    scenario.add("a", slow, 0.3, expect=(201,))
+    scenario.add("b", slow, 0.3, expect=(201,))
+    scenario.add("c", slow, 0.3, expect=(201,), after=("a",))
+
+    run = scenario.run(api)
+
+    assert run.ok
+    assert run.elapsed < 0.85
+    assert run["c"].started >= run["a"].started + run["a"].duration
+
+
+def test_failed_step_skips_only_its_dependents(api, payload_pool):
+    scenario = Scenario([
+        Step("missing", "get_booking", (999999,)),
+        Step("uses_missing", "get_booking", (Ref("missing", "bookingid"),)),
+        Step("unrelated", "create_booking", (payload_pool.next(),)),
+    ])
+
+    run = scenario.run(api)
+
+    assert [r.name for r in run.failures] == ["missing"]
+    assert [r.name for r in run.skipped] == ["uses_missing"]
+    assert run["unrelated"].ok
+    with pytest.raises(ScenarioError) as excinfo:
+        run.raise_for_failures()
+    assert excinfo.value.step == "missing"
+
+
+def test_raising_check_fails_only_its_flow(api, payload_pool):
+    def not_json(api):
+        return api.health_check()  # 201 with a plain-text body
+
+    def read_json(response):
+        return "unexpected" if response.json() else None
+
+    scenario = Scenario(crud_steps(payload_pool.next(), prefix="ok:"))
+    scenario.add("broken", not_json, expect=(201,), check=read_json)
+
+    run = scenario.run(api)
+
+    assert [r.name for r in run.failures] == ["broken"]
+    assert str(run["broken"].error).startswith("broken: check failed:")
+    assert all(run[f"ok:{name}"].ok for name in ("create", "read", "update", "verify", "delete"))
+
+
+def test_references_must_point_to_earlier_steps():
+    scenario = Scenario()
+    with pytest.raises(ValueError):
+        scenario.add("read", "get_booking", Ref("create", "bookingid"))
+    scenario.add("create", "create_booking", {})
+    with pytest.raises(ValueError):
+        scenario.add("create", "create_booking", {})
+
+
+def test_dependencies_combine_references_and_resource_order(payload_pool):
+    scenario = Scenario(crud_steps(payload_pool.next()))
+
+    graph = scenario.dependencies()
+
+    assert graph["create"] == []
+    assert graph["read"] == ["create"]
+    assert graph["update"] == ["create", "read"]
+    assert graph["delete"] == ["create", "verify"]
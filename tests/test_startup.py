@@ -0,0 +1,24 @@
+"""
+Startup cost guard: collecting a small test module must not import heavy modules
+(see benchmarks/bench_startup.py; its --check also enforces a time budget).
+"""
+
+from benchmarks.bench_startup import HEAVY_MODULES, parse_importtime, run
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    modules = parse_importtime(stderr)
+    assert modules["json"].cumulative_us == 420
+    assert modules["json.decoder"].depth == 1
+
+
+def test_collecting_healthcheck_stays_lightweight():
+    modules = run("tests/test_healthcheck.py")
+
+    assert "utils.capture" in modules
+    assert [name for name in HEAVY_MODULES if name in modules] == []
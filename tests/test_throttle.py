@@ -0,0 +1,133 @@
+"""
+Tests for the client-side rate limiter and adaptive concurrency limit (api/throttle.py).
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import requests
+
+from api.booking_api import AsyncBookingAPI, BookingAPI
+from api.deadline import DeadlineExceeded, deadline
+from api.throttle import AdaptiveLimiter, Slot, Throttle, TokenBucket, endpoint_key
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert 0.05 < delays[2] <= 0.1
+    assert 0.15 < delays[3] <= 0.2
+
+
+def test_limit_grows_additively_and_is_cut_once_per_window():
+    limiter = AdaptiveLimiter(initial=4, max_limit=100, latency_tolerance=0)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(0.01)
+    # About +1 per window of successful calls while the limit is in use
+    assert 4.4 < limiter.limit < 5
+
+    grown = limiter.limit
+    for _ in range(int(grown)):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    # Every call of the window reports overload; only the first cuts the limit
+    for _ in range(int(grown)):
+        limiter.release(0.01, overloaded=True)
+    assert limiter.decreases == 1
+    assert limiter.limit == grown * 0.5
+
+
+def test_latency_spike_counts_as_overload():
+    limiter = AdaptiveLimiter(initial=2, latency_tolerance=3)
+    limiter.acquire()
+    limiter.release(0.010)
+    limiter.acquire()
+    limiter.release(0.100)
+
+    assert limiter.decreases == 1
+
+
+def test_latency_baseline_is_kept_per_endpoint():
+    limiter = AdaptiveLimiter(initial=2, latency_tolerance=3)
+    fast, slow = endpoint_key("GET", "http://h/booking/1"), endpoint_key("GET", "http://h/booking")
+    for endpoint, latency in [(fast, 0.001), (slow, 0.100), (slow, 0.120), (fast, 0.002)]:
+        limiter.acquire()
+        limiter.release(latency, endpoint=endpoint)
+
+    assert fast == ("GET", "/booking/{id}")
+    assert limiter.decreases == 0
+
+
+def test_only_connection_errors_and_timeouts_count_as_overload():
+    def overloaded(error):
+        slot = Slot()
+        slot.observe(error=error)
+        return slot.overloaded
+
+    assert overloaded(requests.exceptions.ConnectionError("refused"))
+    assert overloaded(requests.exceptions.ReadTimeout("slow"))
+    assert not overloaded(requests.exceptions.InvalidURL("http://"))
+    assert not overloaded(ValueError("bad payload"))
+    assert not overloaded(DeadlineExceeded("budget spent"))
+    with deadline(0):
+        # A timeout shortened to fit an expired deadline is not the target's fault
+        assert not overloaded(requests.exceptions.ReadTimeout("cut short"))
+
+
+def test_overload_status_and_retry_after():
+    slot = Slot()
+    slot.observe(SimpleNamespace(status_code=503, headers={"Retry-After": "2"}, raw=None))
+    assert (slot.overloaded, slot.retry_after) == (True, 2.0)
+
+    # urllib3 retried a 429 before the final 200
+    retried = SimpleNamespace(history=(SimpleNamespace(status=429),))
+    slot = Slot()
+    slot.observe(SimpleNamespace(status_code=200, headers={}, raw=SimpleNamespace(retries=retried)))
+    assert slot.overloaded
+
+
+def _track_peak(limiter):
+    peak = [0]
+    lock = threading.Lock()
+    release = limiter.release
+
+    def tracked_release(*args, **kwargs):
+        with lock:
+            peak[0] = max(peak[0], limiter.in_flight)
+        release(*args, **kwargs)
+
+    limiter.release = tracked_release
+    return peak
+
+
+def test_threads_share_the_concurrency_limit(booker_server):
+    throttle = Throttle(initial_concurrency=2, max_concurrency=2)
+    peak = _track_peak(throttle.limiter)
+    api = BookingAPI(booker_server.url, throttle=throttle)
+
+    results = api.get_bookings(range(1, 21), max_in_flight=8)
+
+    assert len(results) == 20
+    assert peak[0] <= 2
+    assert throttle.stats()["in_flight"] == 0
+
+
+def test_async_tasks_share_the_throttle(booker_server):
+    throttle = Throttle(initial_concurrency=3, max_concurrency=3)
+    peak = _track_peak(throttle.limiter)
+
+    async def main():
+        async with AsyncBookingAPI(booker_server.url, throttle=throttle) as api:
+            return await asyncio.gather(*(api.health_check() for _ in range(20)))
+
+    responses = asyncio.run(main())
+
+    assert [r.status_code for r in responses] == [201] * 20
+    assert peak[0] <= 3
+    assert throttle.stats()["in_flight"] == 0
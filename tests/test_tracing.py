@@ -0,0 +1,73 @@
+"""
+Tests for request tracing spans (api/tracing.py) against the local stand-in.
+"""
+
+import json
+
+from api.booking_api import BookingAPI
+from api.tracing import CORRELATION_HEADER, OTLPJsonExporter, Tracer
+
+
+class ListExporter(list):
+    def export(self, span):
+        self.append(span)
+
+
+def test_calls_in_a_trace_share_a_correlation_id(booker_server, record_api_calls):
+    spans = ListExporter()
+    tracer = Tracer(spans)
+    api = BookingAPI(booker_server.url, tracer=tracer)
+
+    with tracer.trace("flow") as flow:
+        api.health_check()
+        api.get_bookings([1])
+
+    calls = [span for span in spans if span.name != "flow"]
+    assert [span.name for span in calls] == ["GET /ping", "GET /booking/{id}"]
+    assert {span.trace_id for span in spans} == {flow.trace_id}
+    assert all(span.parent_id == flow.span_id for span in calls)
+    assert [c.request_headers[CORRELATION_HEADER] for c in record_api_calls] == [flow.trace_id] * 2
+
+    ping = calls[0]
+    assert ping.attributes["http.response.status_code"] == 201
+    assert {"prepare", "send", "ttfb", "download"} <= set(ping.phases)
+    assert sum(ping.phases.values()) <= ping.duration
+
+
+def test_new_connection_reports_dns_and_connect(booker_server):
+    spans = ListExporter()
+    # Separate dns timing comes from the urllib3 connections of the HTTP/1.1 transport
+    api = BookingAPI(booker_server.url, tracer=Tracer(spans), transport="http1")
+
+    api.health_check()
+    api.health_check()
+
+    first, second = spans
+    assert {"dns", "connect"} <= set(first.phases)
+    assert first.attributes["network.connection.reused"] is False
+    assert "connect" not in second.phases
+    assert second.attributes["network.connection.reused"] is True
+
+
+def test_disabled_tracer_sends_no_headers(booker_server, record_api_calls):
+    BookingAPI(booker_server.url, tracer=Tracer()).health_check()
+
+    assert CORRELATION_HEADER not in record_api_calls[0].request_headers
+
+
+def test_otlp_json_export(tmp_path, booker_server):
+    path = str(tmp_path / "spans.jsonl")
+    tracer = Tracer(OTLPJsonExporter(path, batch_size=1))
+    tracer.test_id = "tests/test_tracing.py::test_otlp_json_export"
+    BookingAPI(booker_server.url, tracer=tracer).health_check()
+    tracer.shutdown()
+
+    with open(path) as f:
+        documents = [json.loads(line) for line in f]
+    span = documents[0]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    attributes = {a["key"]: a["value"] for a in span["attributes"]}
+    assert span["kind"] == 3
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert attributes["http.response.status_code"] == {"intValue": "201"}
+    assert attributes["test.nodeid"] == {"stringValue": tracer.test_id}
+    assert "doubleValue" in attributes["http.phase.ttfb_ms"]
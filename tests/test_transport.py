@@ -0,0 +1,87 @@
+"""
+Tests for the pluggable BaseClient transports (api/transport.py), using the local
+stand-in's h2c support.
+"""
+
+import pytest
+import requests
+
+from api.booking_api import BookingAPI
+from api.client import BaseClient
+from api.tracing import Tracer
+from api.transport import HTTP2Adapter
+
+pytest.importorskip("h2")
+
+
+class ListExporter(list):
+    def export(self, span):
+        self.append(span)
+
+
+@pytest.fixture
+def h2_api(booker_server):
+    api = BookingAPI(booker_server.url, transport=HTTP2Adapter(h2c=True), tracer=False)
+    yield api
+    api.session.close()
+
+
+def test_crud_over_http2_returns_requests_responses(h2_api, payload_pool, record_api_calls):
+    h2_api.authenticate()
+    payload = payload_pool.next()
+
+    created = h2_api.create_booking(payload)
+    booking_id = created.json()["bookingid"]
+    fetched = h2_api.get_booking(booking_id)
+    deleted = h2_api.delete_booking(booking_id)
+
+    assert isinstance(fetched, requests.Response)
+    assert fetched.raw.http_version == "HTTP/2"
+    assert fetched.json() == payload
+    assert fetched.headers["content-type"].startswith("application/json")
+    assert deleted.status_code == 201
+    # The capture hooks see HTTP/2 calls like any other
+    assert [c.status for c in record_api_calls][-3:] == [200, 200, 201]
+
+
+def test_parallel_calls_share_one_connection(booker_server, h2_api):
+    before = booker_server.connections["h2"]
+
+    results = h2_api.get_bookings(range(1, 65), max_in_flight=32)
+
+    assert len(results) == 64
+    assert all(r.error is None for r in results)
+    assert booker_server.connections["h2"] - before == 1
+
+
+def test_streamed_listing_over_http2(h2_api, payload_pool):
+    ids = [h2_api.create_booking(payload_pool.next()).json()["bookingid"] for _ in range(3)]
+
+    listed = list(h2_api.iter_bookings())
+
+    assert set(ids) <= set(listed)
+
+
+def test_http2_spans_report_phases(booker_server):
+    spans = ListExporter()
+    api = BookingAPI(booker_server.url, transport=HTTP2Adapter(h2c=True), tracer=Tracer(spans))
+
+    api.health_check()
+    api.health_check()
+
+    first, second = spans
+    assert {"prepare", "connect", "send", "ttfb", "download"} <= set(first.phases)
+    assert "connect" not in second.phases
+    api.session.close()
+
+
+def test_connection_errors_surface_as_requests_exceptions():
+    client = BaseClient("http://127.0.0.1:9", transport=HTTP2Adapter(h2c=True), tracer=False)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get("/ping")
+
+
+def test_unknown_transport_is_rejected():
+    with pytest.raises(ValueError):
+        BaseClient("http://127.0.0.1", transport="spdy")
@@ -0,0 +1,382 @@
+"""
+Session-wide recording of HTTP calls made through requests.
+
+A single CallRecorder patches requests.Session.send once per pytest session
+(see conftest.py). Every call made while a test runs is appended to that test's
+CallLog as a CallRecord. Records keep the raw body bytes and header references
+only; decoding and pretty-printing happen lazily, when a report actually reads
+the request_body / response_body / *_headers attributes.
+
+Memory is bounded regardless of how many calls a test makes:
+- bodies larger than `body_limit` bytes are truncated in memory, and the full
+  body is spilled to a file under `spill_dir` (when set) referenced by the record;
+- each test's CallLog is a ring buffer keeping only the last `max_calls` records.
+
+Hooking Session.send (rather than Session.request) means the recorder sees the
+final PreparedRequest for every client built on requests -- BaseClient,
+plain requests.get/post, redirects -- whichever adapter the session mounts.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+import requests
+
+
+def format_body(body) -> str:
+    """
+    Render a raw request/response body for display.
+
+    JSON bodies are pretty-printed; other bytes are decoded as UTF-8 (with
+    replacement); None becomes an empty string.
+    """
+    try:
+        if body is None:
+            return ""
+        if isinstance(body, (bytes, bytearray)):
+            body = bytes(body).decode("utf-8", errors="replace")
+        if isinstance(body, str):
+            stripped = body.lstrip()
+            if stripped[:1] in ("{", "["):
+                try:
+                    return json.dumps(json.loads(body), indent=2, ensure_ascii=False)
+                except ValueError:
+                    pass
+            return body
+        if isinstance(body, (dict, list)):
+            return json.dumps(body, indent=2, ensure_ascii=False)
+        return str(body)
+    except Exception:
+        return "<unserializable>"
+
+
+class CapturedBody:
+    """
+    A request or response body as kept by the recorder.
+
+    Attributes:
+        data (bytes | None): Body bytes, at most the recorder's body limit.
+        size (int): Size of the complete body in bytes.
+        spill_path (str | None): File holding the complete body when it was truncated
+            and spilling is enabled.
+        placeholder (str): Text shown instead of the body when it wasn't available
+            (e.g. a streamed response that was never read).
+    """
+
+    __slots__ = ("data", "size", "spill_path", "placeholder")
+
+    def __init__(self, data: Optional[bytes], size: int = 0, spill_path: Optional[str] = None,
+                 placeholder: str = ""):
+        self.data = data
+        self.size = size
+        self.spill_path = spill_path
+        self.placeholder = placeholder
+
+    @property
+    def truncated(self) -> bool:
+        return self.data is not None and self.size > len(self.data)
+
+    def text(self) -> str:
+        if self.data is None:
+            return self.placeholder
+        if self.truncated:
+            # A cut JSON document won't parse; show the raw prefix instead
+            text = self.data.decode("utf-8", errors="replace")
+            return f"{text}\n... [truncated, {self.size} bytes total]"
+        return format_body(self.data)
+
+
+def _timeout_pair(timeout) -> Optional[tuple]:
+    """(connect, read) seconds of a requests `timeout` argument (number, tuple or urllib3 Timeout)."""
+    if timeout is None:
+        return None
+    if isinstance(timeout, tuple):
+        return timeout
+    if isinstance(timeout, (int, float)):
+        return (timeout, timeout)
+    return (timeout.connect_timeout, timeout.read_timeout)
+
+
+def _timed_out(exc: Optional[BaseException]) -> str:
+    if not isinstance(exc, requests.exceptions.Timeout):
+        return ""
+    from api import deadline
+
+    limit = deadline.current()
+    if isinstance(exc, deadline.DeadlineExceeded) or (limit is not None and limit.expired):
+        return "deadline"
+    return "connect" if isinstance(exc, requests.exceptions.ConnectTimeout) else "read"
+
+
+class CallRecord:
+    """
+    One recorded HTTP call.
+
+    Attributes:
+        method (str): HTTP method.
+        url (str): Full request URL.
+        status (int | None): Response status, or None if the call raised.
+        duration (float): Seconds spent in Session.send (monotonic perf_counter clock).
+        exception (str): Text of the exception raised by the call, if any.
+        request_content (CapturedBody): Bounded request body.
+        response_content (CapturedBody): Bounded response body.
+        timeout (tuple | None): (connect, read) seconds the call was allowed, after
+            any deadline cap (api/deadline.py); None when it had no timeout.
+        timed_out (str): "connect" or "read" if the call timed out, "deadline" if it
+            failed because the active deadline ran out; "" otherwise.
+
+    The request_body, request_headers, response_body and response_headers
+    properties are rendered on access. Item access (record["status"]) is
+    supported for older dict-based consumers.
+    """
+
+    __slots__ = ("method", "url", "status", "duration", "exception", "request_content",
+                 "response_content", "_request_headers", "_response_headers", "timeout", "timed_out")
+
+    def __init__(self, method: str, url: str, status: Optional[int], duration: float,
+                 exc: Optional[BaseException], request_content: CapturedBody,
+                 response_content: CapturedBody, request_headers=None, response_headers=None,
+                 timeout: Optional[tuple] = None, timed_out: str = ""):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.duration = duration
+        self.exception = str(exc) if exc else ""
+        self.request_content = request_content
+        self.response_content = response_content
+        self._request_headers = request_headers
+        self._response_headers = response_headers
+        self.timeout = timeout
+        self.timed_out = timed_out
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    @property
+    def request_headers(self) -> dict:
+        return dict(self._request_headers or {})
+
+    @property
+    def request_body(self) -> str:
+        return self.request_content.text()
+
+    @property
+    def response_headers(self) -> dict:
+        return dict(self._response_headers or {})
+
+    @property
+    def response_body(self) -> str:
+        return self.response_content.text()
+
+
+class CallLog(deque):
+    """
+    Per-test ring buffer of CallRecords.
+
+    Attributes:
+        total (int): Number of calls recorded, including ones evicted by the limit.
+    """
+
+    def __init__(self, maxlen: Optional[int] = None):
+        super().__init__(maxlen=maxlen)
+        self.total = 0
+
+    @property
+    def dropped(self) -> int:
+        """Number of older records evicted to respect the limit."""
+        return self.total - len(self)
+
+    def append(self, record):
+        self.total += 1
+        super().append(record)
+
+
+class CallRecorder:
+    """
+    Installs a single requests.Session.send hook and routes calls to the active sink.
+
+    Attributes:
+        calls (CallLog | None): Sink for the currently running test, or None when
+            no test is running (calls are then not stored).
+        listeners (list[Callable]): Called with every CallRecord, whether or not a
+            sink is active; used by session-wide consumers.
+        raw_listeners (list[Callable]): Called as listener(request, response) with the
+            unbounded PreparedRequest/Response of every completed call (e.g. to record
+            a cassette); keep them cheap.
+        interceptor (Callable | None): interceptor(request) may return a Response to
+            use instead of sending the request (e.g. cassette replay), or None.
+        body_limit (int): Bytes of each body kept in memory.
+        max_calls (int | None): Records kept per test (None keeps all).
+        spill_dir (str | None): Directory receiving full copies of truncated bodies;
+            "auto" creates a temporary one on the first spill (removed by cleanup());
+            None disables spilling.
+    """
+
+    def __init__(self, body_limit: int = 64 * 1024, max_calls: Optional[int] = 200,
+                 spill_dir: Optional[str] = None):
+        self.calls: Optional[CallLog] = None
+        self.listeners: List[Callable[[CallRecord], None]] = []
+        self.raw_listeners: List[Callable] = []
+        self.interceptor: Optional[Callable] = None
+        self.body_limit = body_limit
+        self.max_calls = max_calls
+        self.spill_dir = spill_dir
+        self._original_send = None
+        self._spill_ids = itertools.count(1)
+        self._spill_lock = threading.Lock()
+        self._created_spill_dir: Optional[str] = None
+
+    def configure(self, body_limit: int = None, max_calls: Optional[int] = None,
+                  spill_dir: Optional[str] = None):
+        """
+        Adjust the limits. A max_calls of 0 keeps every record; spill_dir "auto"
+        uses a temporary directory, created only once a body is spilled.
+        """
+        if body_limit is not None:
+            self.body_limit = body_limit
+        if max_calls is not None:
+            self.max_calls = max_calls or None
+        if spill_dir is not None and spill_dir != "auto":
+            os.makedirs(spill_dir, exist_ok=True)
+        if spill_dir is not None:
+            self.spill_dir = spill_dir
+
+    def _spill_directory(self) -> str:
+        if self.spill_dir == "auto":
+            with self._spill_lock:
+                if self.spill_dir == "auto":
+                    self._created_spill_dir = tempfile.mkdtemp(prefix="api-capture-")
+                    self.spill_dir = self._created_spill_dir
+        return self.spill_dir
+
+    def cleanup(self):
+        """Delete the temporary spill directory created for spill_dir "auto", if any."""
+        with self._spill_lock:
+            created, self._created_spill_dir = self._created_spill_dir, None
+            if created is not None:
+                shutil.rmtree(created, ignore_errors=True)
+                self.spill_dir = "auto"
+
+    @property
+    def installed(self) -> bool:
+        return self._original_send is not None
+
+    def install(self):
+        """Patch requests.Session.send; calling it again is a no-op."""
+        if self.installed:
+            return
+        original_send = requests.Session.send
+        recorder = self
+
+        def _send(session, request, **kwargs):
+            # Fast path: nobody is listening, don't pay for timing or records
+            if (recorder.calls is None and not recorder.listeners
+                    and not recorder.raw_listeners and recorder.interceptor is None):
+                return original_send(session, request, **kwargs)
+            # Resolved up front: a deadline-bound timeout shrinks while the call runs
+            timeout = _timeout_pair(kwargs.get("timeout"))
+            start = time.perf_counter()
+            resp = None
+            exc = None
+            try:
+                if recorder.interceptor is not None:
+                    resp = recorder.interceptor(request)
+                if resp is None:
+                    resp = original_send(session, request, **kwargs)
+                    for listener in recorder.raw_listeners:
+                        listener(request, resp)
+                return resp
+            except Exception as e:
+                exc = e
+                raise
+            finally:
+                recorder.record(recorder.make_record(request, resp, time.perf_counter() - start, exc, timeout))
+
+        self._original_send = original_send
+        requests.Session.send = _send
+
+    def uninstall(self):
+        """Restore the original requests.Session.send."""
+        if self.installed:
+            requests.Session.send = self._original_send
+            self._original_send = None
+
+    def capture_body(self, body, kind: str) -> CapturedBody:
+        """
+        Bound a raw body to body_limit bytes, spilling the full body if enabled.
+
+        Args:
+            body: bytes, str or None (anything else, e.g. a file, is not captured).
+            kind (str): "request" or "response"; used in the spill file name.
+        """
+        if body is None:
+            return CapturedBody(b"")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if not isinstance(body, (bytes, bytearray)):
+            return CapturedBody(None, placeholder="<streamed body not captured>")
+        size = len(body)
+        if size <= self.body_limit:
+            return CapturedBody(bytes(body), size)
+        spill_path = None
+        if self.spill_dir is not None:
+            spill_path = os.path.join(self._spill_directory(), f"{next(self._spill_ids):06d}-{kind}.body")
+            try:
+                with open(spill_path, "wb") as f:
+                    f.write(body)
+            except OSError:
+                spill_path = None
+        return CapturedBody(bytes(body[:self.body_limit]), size, spill_path)
+
+    def make_record(self, request, response, duration: float, exc: Optional[BaseException],
+                    timeout: Optional[tuple] = None) -> CallRecord:
+        """Build a bounded CallRecord from a PreparedRequest and its Response."""
+        if response is None:
+            response_content = CapturedBody(
+                None, placeholder="<no response due to exception>" if exc else "<no response>")
+            response_headers = None
+        else:
+            # Only use content that was already read; never consume a streamed body here
+            content = getattr(response, "_content", False)
+            if content is False:
+                response_content = CapturedBody(None, placeholder="<streamed response not read>")
+            else:
+                response_content = self.capture_body(content, "response")
+            response_headers = response.headers
+        return CallRecord(
+            request.method, request.url, getattr(response, "status_code", None), duration, exc,
+            self.capture_body(request.body, "request"), response_content,
+            request.headers, response_headers, timeout, _timed_out(exc),
+        )
+
+    def start(self) -> CallLog:
+        """Begin collecting into a fresh sink and return it."""
+        self.calls = CallLog(self.max_calls)
+        return self.calls
+
+    def stop(self) -> Optional[CallLog]:
+        """Stop collecting and return the sink that was active."""
+        calls, self.calls = self.calls, None
+        return calls
+
+    def record(self, record: CallRecord):
+        sink = self.calls
+        if sink is not None:
+            sink.append(record)
+        for listener in self.listeners:
+            try:
+                listener(record)
+            except Exception:
+                # A broken consumer must never fail the API call being recorded
+                pass
+
+
+# Shared recorder used by the pytest hooks in conftest.py
+recorder = CallRecorder()
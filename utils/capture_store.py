@@ -0,0 +1,436 @@
+"""
+Compact, append-only binary store for captured API calls, with an index and a query CLI.
+
+A CaptureWriter listens to the shared call recorder (utils/capture.py) and appends
+every call -- method, URL, status, duration, headers and the (bounded) bodies --
+to a data file, tagged with the running test's node id:
+
+    pytest --api-capture-file=calls.rbc
+    python -m utils.capture_store query calls.rbc --method PUT --endpoint "/booking/{id}" --min-ms 500
+
+Data file (calls.rbc): an 8-byte magic, then frames of
+    <u32 payload length> <u8 type> <payload>
+where type "S" defines an interned string (<u32 id> + UTF-8) -- methods, endpoint
+templates and test node ids are stored once -- and type "R" is one call, zlib
+compressed. Frames are only ever appended; a reader stops at a truncated tail,
+so a crashed run keeps every complete call.
+
+Index file (calls.rbc.idx): the same string definitions plus one fixed-size
+entry per call -- data offset, start time, test, endpoint, method, status and
+duration. Queries scan the index (about 40 bytes per call) and decompress only
+the matching records, so memory use does not grow with the file. The index can
+always be rebuilt from the data file (`reindex`).
+
+Under pytest-xdist every worker writes its own pair of files (calls.gw0.rbc, ...);
+pass them all to `query`.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, NamedTuple, Optional
+
+from utils.latency import endpoint_key
+
+MAGIC = b"RBCAP01\n"
+INDEX_MAGIC = b"RBCIDX1\n"
+
+_FRAME = struct.Struct("<IB")
+_STRING_ID = struct.Struct("<I")
+# started, duration, status, method, endpoint, test, request size, response size
+_RECORD = struct.Struct("<dfHIIIII")
+_SECTION = struct.Struct("<I")
+# offset, started, test, endpoint, method, status, duration
+_ENTRY = struct.Struct("<QdIIIHf")
+_INDEX_STRING = struct.Struct("<II")
+
+STRING, RECORD = ord("S"), ord("R")
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def worker_path(path: str, worker: str) -> str:
+    """Data file of an xdist worker: calls.rbc -> calls.gw0.rbc."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{worker}{ext}"
+
+
+def _headers_bytes(headers) -> bytes:
+    if not headers:
+        return b""
+    return "".join(f"{name}: {value}\n" for name, value in headers.items()).encode("utf-8", "replace")
+
+
+def _parse_headers(data: bytes) -> Dict[str, str]:
+    headers = {}
+    for line in data.decode("utf-8", "replace").splitlines():
+        name, _, value = line.partition(": ")
+        headers[name] = value
+    return headers
+
+
+class CaptureWriter:
+    """
+    Append CallRecords to a capture file and its index.
+
+    Use on_call as a recorder listener; set `test_id` to the running test's node id.
+    Thread-safe: calls made from worker threads (bulk operations) are serialized.
+
+    Attributes:
+        path (str): Data file path.
+        test_id (str | None): Node id stored with the calls recorded from now on.
+        count (int): Calls written by this writer.
+    """
+
+    def __init__(self, path: str, level: int = 6):
+        """
+        Args:
+            path (str): Data file; created, or appended to when it exists.
+            level (int): zlib compression level of the call records.
+        """
+        self.path = path
+        self.level = level
+        self.test_id: Optional[str] = None
+        self.count = 0
+        self._strings: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not fresh:
+            # Continue the existing string table instead of redefining ids
+            if not os.path.exists(index_path(path)):
+                reindex(path)
+            for string_id, value in _read_index_strings(index_path(path)):
+                self._strings[value] = string_id
+        self._data = open(path, "ab")
+        self._index = open(index_path(path), "ab")
+        if fresh:
+            self._data.write(MAGIC)
+            self._index.truncate(0)
+            self._index.write(INDEX_MAGIC)
+
+    def _intern(self, value: str) -> int:
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._strings[value] = len(self._strings)
+            encoded = value.encode("utf-8", "replace")
+            self._data.write(_FRAME.pack(_STRING_ID.size + len(encoded), STRING))
+            self._data.write(_STRING_ID.pack(string_id) + encoded)
+            self._index.write(bytes([STRING]) + _INDEX_STRING.pack(string_id, len(encoded)) + encoded)
+        return string_id
+
+    def on_call(self, record):
+        """Recorder listener: store `record` under the current test_id."""
+        self.write(record, self.test_id)
+
+    def write(self, record, test_id: Optional[str] = None, started: Optional[float] = None):
+        """
+        Append one CallRecord.
+
+        Args:
+            record (CallRecord): The call.
+            test_id (str | None): Node id of the test that made it.
+            started (float | None): Wall-clock start; default: now minus its duration.
+        """
+        method, endpoint = endpoint_key(record.method, record.url)
+        started = time.time() - record.duration if started is None else started
+        request, response = record.request_content, record.response_content
+        sections = (
+            record.url.encode("utf-8", "replace"),
+            record.exception.encode("utf-8", "replace"),
+            _headers_bytes(record.request_headers),
+            _headers_bytes(record.response_headers),
+            request.data or b"",
+            response.data or b"",
+        )
+        with self._lock:
+            ids = (self._intern(method), self._intern(endpoint), self._intern(test_id or ""))
+            head = _RECORD.pack(started, record.duration, record.status or 0, *ids,
+                                request.size, response.size)
+            payload = zlib.compress(
+                head + b"".join(_SECTION.pack(len(s)) + s for s in sections), self.level)
+            offset = self._data.tell()
+            self._data.write(_FRAME.pack(len(payload), RECORD))
+            self._data.write(payload)
+            self._index.write(bytes([RECORD]) + _ENTRY.pack(
+                offset, started, ids[2], ids[1], ids[0], record.status or 0, record.duration))
+            self.count += 1
+
+    def flush(self):
+        with self._lock:
+            self._data.flush()
+            self._index.flush()
+
+    def close(self):
+        with self._lock:
+            self._data.close()
+            self._index.close()
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class IndexEntry(NamedTuple):
+    """One call as described by the index (no headers or bodies)."""
+    offset: int
+    started: float
+    test: str
+    endpoint: str
+    method: str
+    status: Optional[int]
+    duration: float
+
+
+@dataclass
+class CapturedCall:
+    """One call read back from a capture file."""
+    method: str
+    endpoint: str
+    url: str
+    status: Optional[int]
+    duration: float
+    started: float
+    test: str
+    exception: str
+    request_headers: Dict[str, str]
+    response_headers: Dict[str, str]
+    request_body: bytes
+    response_body: bytes
+    request_size: int
+    response_size: int
+
+    def to_json(self, bodies: bool = False) -> dict:
+        data = {"test": self.test, "method": self.method, "endpoint": self.endpoint, "url": self.url,
+                "status": self.status, "duration_ms": round(self.duration * 1000, 3),
+                "started": self.started, "exception": self.exception}
+        if bodies:
+            data.update(request_headers=self.request_headers, response_headers=self.response_headers,
+                        request_body=self.request_body.decode("utf-8", "replace"),
+                        response_body=self.response_body.decode("utf-8", "replace"),
+                        request_size=self.request_size, response_size=self.response_size)
+        return data
+
+
+def _read_index_strings(path: str) -> Iterator[tuple]:
+    for kind, value in _scan_index(path):
+        if kind == STRING:
+            yield value
+
+
+def _scan_index(path: str) -> Iterator[tuple]:
+    """Yield (STRING, (id, text)) and (RECORD, entry tuple) items; stops at a truncated tail."""
+    with open(path, "rb") as f:
+        if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a capture index")
+        while True:
+            kind = f.read(1)
+            if not kind:
+                return
+            if kind[0] == STRING:
+                head = f.read(_INDEX_STRING.size)
+                if len(head) < _INDEX_STRING.size:
+                    return
+                string_id, length = _INDEX_STRING.unpack(head)
+                text = f.read(length)
+                if len(text) < length:
+                    return
+                yield STRING, (string_id, text.decode("utf-8"))
+            elif kind[0] == RECORD:
+                data = f.read(_ENTRY.size)
+                if len(data) < _ENTRY.size:
+                    return
+                yield RECORD, _ENTRY.unpack(data)
+            else:
+                raise ValueError(f"{path}: corrupt index entry at byte {f.tell() - 1}")
+
+
+def _scan_frames(path: str) -> Iterator[tuple]:
+    """Yield (offset, type, payload) for every complete frame of a data file."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+        while True:
+            offset = f.tell()
+            head = f.read(_FRAME.size)
+            if len(head) < _FRAME.size:
+                return
+            length, kind = _FRAME.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield offset, kind, payload
+
+
+def reindex(path: str) -> int:
+    """Rebuild the index of `path` from the data file; returns the number of calls."""
+    count = 0
+    with open(index_path(path), "wb") as index:
+        index.write(INDEX_MAGIC)
+        for offset, kind, payload in _scan_frames(path):
+            if kind == STRING:
+                (string_id,) = _STRING_ID.unpack_from(payload)
+                text = payload[_STRING_ID.size:]
+                index.write(bytes([STRING]) + _INDEX_STRING.pack(string_id, len(text)) + text)
+            elif kind == RECORD:
+                started, duration, status, method, endpoint, test, _, _ = _RECORD.unpack_from(
+                    zlib.decompress(payload))
+                index.write(bytes([RECORD]) + _ENTRY.pack(offset, started, test, endpoint, method,
+                                                          status, duration))
+                count += 1
+    return count
+
+
+def _status_matches(status: int, wanted: str) -> bool:
+    wanted = wanted.lower()
+    if wanted == "error":
+        return status == 0 or status >= 400
+    if len(wanted) == 3 and wanted.endswith("xx"):
+        return str(status).startswith(wanted[0])
+    return status == int(wanted)
+
+
+class CaptureReader:
+    """
+    Query a capture file through its index.
+
+    Attributes:
+        path (str): Data file path.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if not os.path.exists(index_path(path)):
+            reindex(path)
+
+    def entries(self) -> Iterator[IndexEntry]:
+        """Stream every indexed call, in recording order."""
+        strings: Dict[int, str] = {}
+        for kind, value in _scan_index(index_path(self.path)):
+            if kind == STRING:
+                strings[value[0]] = value[1]
+                continue
+            offset, started, test, endpoint, method, status, duration = value
+            yield IndexEntry(offset, started, strings.get(test, ""), strings.get(endpoint, ""),
+                             strings.get(method, ""), status or None, duration)
+
+    def query(self, method: str = None, endpoint: str = None, status: str = None, test: str = None,
+              min_ms: float = None, max_ms: float = None) -> Iterator[IndexEntry]:
+        """
+        Stream the indexed calls matching every given filter.
+
+        Args:
+            method (str): HTTP method, e.g. "PUT".
+            endpoint (str): Endpoint template or glob, e.g. "/booking/{id}" or "/booking*".
+            status (str): Status code, class ("5xx") or "error" (>= 400 or no response).
+            test (str): Substring of the test node id.
+            min_ms / max_ms (float): Duration bounds in milliseconds.
+        """
+        method = method.upper() if method else None
+        for entry in self.entries():
+            if method and entry.method != method:
+                continue
+            if endpoint and entry.endpoint != endpoint and not fnmatch.fnmatchcase(entry.endpoint, endpoint):
+                continue
+            if status and not _status_matches(entry.status or 0, status):
+                continue
+            if test and test not in entry.test:
+                continue
+            if min_ms is not None and entry.duration * 1000 < min_ms:
+                continue
+            if max_ms is not None and entry.duration * 1000 > max_ms:
+                continue
+            yield entry
+
+    def load(self, entry: IndexEntry) -> CapturedCall:
+        """Read and decompress the full record of an index entry."""
+        with open(self.path, "rb") as f:
+            f.seek(entry.offset)
+            length, kind = _FRAME.unpack(f.read(_FRAME.size))
+            payload = zlib.decompress(f.read(length))
+        if kind != RECORD:
+            raise ValueError(f"{self.path}: no call record at byte {entry.offset}")
+        started, duration, status, _, _, _, request_size, response_size = _RECORD.unpack_from(payload)
+        pos = _RECORD.size
+        sections = []
+        for _ in range(6):
+            (length,) = _SECTION.unpack_from(payload, pos)
+            pos += _SECTION.size
+            sections.append(payload[pos:pos + length])
+            pos += length
+        url, exception, request_headers, response_headers, request_body, response_body = sections
+        return CapturedCall(
+            entry.method, entry.endpoint, url.decode("utf-8"), status or None, duration, started,
+            entry.test, exception.decode("utf-8"), _parse_headers(request_headers),
+            _parse_headers(response_headers), request_body, response_body, request_size, response_size)
+
+
+def _print_call(call: CapturedCall, bodies: bool, out):
+    from utils.capture import format_body
+
+    status = call.status if call.status is not None else "ERR"
+    out.write(f"{call.duration * 1000:9.1f} ms  {status:<4} {call.method:<7} {call.url}  [{call.test}]\n")
+    if call.exception:
+        out.write(f"    exception: {call.exception}\n")
+    if bodies:
+        for label, headers, body, size in (
+                ("request", call.request_headers, call.request_body, call.request_size),
+                ("response", call.response_headers, call.response_body, call.response_size)):
+            out.write(f"    {label} headers: {json.dumps(headers)}\n")
+            if body:
+                suffix = f" (first {len(body)} of {size} bytes)" if size > len(body) else ""
+                text = format_body(body) if size <= len(body) else body.decode("utf-8", "replace")
+                out.write(f"    {label} body{suffix}:\n")
+                for line in text.splitlines():
+                    out.write(f"      {line}\n")
+
+
+def main(argv=None, out=None):
+    out = out or sys.stdout
+    parser = argparse.ArgumentParser(description="Query captured API calls (pytest --api-capture-file).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    query_cmd = sub.add_parser("query", help="List calls matching the filters, in recording order.")
+    query_cmd.add_argument("paths", nargs="+", help="Capture files (one per xdist worker).")
+    query_cmd.add_argument("--method")
+    query_cmd.add_argument("--endpoint", help='Endpoint template or glob, e.g. "/booking/{id}".')
+    query_cmd.add_argument("--status", help='Status, class ("5xx") or "error".')
+    query_cmd.add_argument("--test", help="Substring of the test node id.")
+    query_cmd.add_argument("--min-ms", type=float)
+    query_cmd.add_argument("--max-ms", type=float)
+    query_cmd.add_argument("--limit", type=int, default=0, help="Stop after this many calls (0 = all).")
+    query_cmd.add_argument("--bodies", action="store_true", help="Also print headers and bodies.")
+    query_cmd.add_argument("--json", action="store_true", help="One JSON object per line.")
+    reindex_cmd = sub.add_parser("reindex", help="Rebuild the index files from the data files.")
+    reindex_cmd.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "reindex":
+        for path in args.paths:
+            out.write(f"{path}: {reindex(path)} calls\n")
+        return 0
+    shown = 0
+    for path in args.paths:
+        reader = CaptureReader(path)
+        for entry in reader.query(args.method, args.endpoint, args.status, args.test,
+                                  args.min_ms, args.max_ms):
+            call = reader.load(entry)
+            if args.json:
+                out.write(json.dumps(call.to_json(args.bodies)) + "\n")
+            else:
+                _print_call(call, args.bodies, out)
+            shown += 1
+            if args.limit and shown >= args.limit:
+                return 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,289 @@
+"""
+Record/replay ("cassette") mode for HTTP traffic made through requests.
+
+Record: every completed call seen by the shared recorder (utils/capture.py) is
+appended to a gzip-compressed, line-delimited cassette file -- one compact JSON
+interaction per line, with the full request/response bodies.
+
+Replay: the cassette is loaded into an in-memory index and installed as the
+recorder's interceptor, so requests are answered from memory without touching
+the network. Interactions are keyed by method, path+query and a SHA-1 of the
+request body; when no recorded body matches (e.g. names made unique per run) the
+lookup falls back to method + path+query. Repeated identical requests are
+answered in recorded order (GET before and after an update differ), the last
+answer repeating once the sequence is used up. Host and port are not part of the
+key, so a cassette recorded against one server replays for any BASE_URL.
+
+Under pytest-xdist each worker records to its own shard next to the cassette
+(booking.gw0.cassette, see utils/capture_store.py::worker_path); reading a
+cassette merges the shards. Streamed responses (stream=True) are not read by the
+recorder: their body is collected as the caller reads it and the interaction is
+written once the stream is used up, unless it exceeds `max_stream_body`.
+
+    pytest --cassette=booking.cassette --cassette-mode=record
+    pytest --cassette=booking.cassette --cassette-mode=replay
+    python -m utils.cassette diff v1.cassette v2.cassette
+"""
+
+import argparse
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.capture_store import worker_path
+
+FORMAT = "restful-booker-cassette/1"
+# Streamed bodies larger than this (bytes) are not recorded
+MAX_STREAM_BODY = 8 * 1024 * 1024
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A request in replay mode has no recorded interaction."""
+
+
+def _body_bytes(body) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    return repr(body).encode("utf-8")
+
+
+def _target(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def request_key(method: str, url: str, body) -> Tuple[str, str, str]:
+    """(METHOD, path+query, sha1 of the body) used to index interactions."""
+    return method.upper(), _target(url), hashlib.sha1(_body_bytes(body)).hexdigest()
+
+
+def _encode_body(data: bytes) -> dict:
+    try:
+        return {"body": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(data).decode("ascii")}
+
+
+def _decode_body(entry: dict) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class CassetteRecorder:
+    """
+    Append interactions to a cassette file; use as a recorder raw listener.
+
+    Attributes:
+        count (int): Interactions written.
+        skipped (int): Streamed responses left out (larger than max_stream_body).
+    """
+
+    def __init__(self, path: str, max_stream_body: int = MAX_STREAM_BODY):
+        self.path = path
+        self.max_stream_body = max_stream_body
+        self.count = 0
+        self.skipped = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"format": FORMAT}) + "\n")
+        self._lock = threading.Lock()
+
+    def __call__(self, request, response):
+        method, target, body_hash = request_key(request.method, request.url, request.body)
+        entry = {
+            "method": method,
+            "target": target,
+            "body_hash": body_hash,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+        }
+        if getattr(response, "_content", False) is False:
+            # Streamed and not read yet: reading it here would pull it into memory
+            response.iter_content = self._tee(response, entry)
+            return
+        self._write(entry, response.content)
+
+    def _tee(self, response, entry):
+        """Wrap response.iter_content to record the body as the caller reads it."""
+        iter_content = response.iter_content
+
+        def tee(*args, **kwargs):
+            chunks = []
+            size = 0
+            for chunk in iter_content(*args, **kwargs):
+                if chunks is not None:
+                    data = chunk.encode(response.encoding or "utf-8") if isinstance(chunk, str) else chunk
+                    size += len(data)
+                    if size > self.max_stream_body:
+                        chunks = None
+                        with self._lock:
+                            self.skipped += 1
+                    else:
+                        chunks.append(data)
+                yield chunk
+            if chunks is not None:
+                self._write(entry, b"".join(chunks))
+
+        return tee
+
+    def _write(self, entry: dict, body: bytes):
+        line = json.dumps({**entry, **_encode_body(body)}, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def shard_paths(path: str) -> List[str]:
+    """Existing pytest-xdist worker shards of a cassette (booking.gw0.cassette, ...)."""
+    return sorted(glob.glob(worker_path(glob.escape(path), "gw*")))
+
+
+def _read_file(path: str) -> List[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a cassette file")
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_cassette(path: str) -> List[dict]:
+    """Load every interaction of a cassette and its worker shards, in recorded order per file."""
+    entries = _read_file(path)
+    for shard in shard_paths(path):
+        entries.extend(_read_file(shard))
+    return entries
+
+
+class CassettePlayer:
+    """
+    In-memory index of a cassette; use as the recorder's interceptor.
+
+    Attributes:
+        hits (int): Requests answered from the cassette.
+        misses (int): Requests with no recorded interaction.
+    """
+
+    def __init__(self, path: str):
+        self.hits = 0
+        self.misses = 0
+        self._exact: Dict[tuple, List[dict]] = defaultdict(list)
+        self._loose: Dict[tuple, List[dict]] = defaultdict(list)
+        for entry in read_cassette(path):
+            self._exact[(entry["method"], entry["target"], entry["body_hash"])].append(entry)
+            self._loose[(entry["method"], entry["target"])].append(entry)
+        self._positions: Dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _next(self, index: dict, key: tuple) -> Optional[dict]:
+        entries = index.get(key)
+        if not entries:
+            return None
+        position = self._positions[key]
+        self._positions[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    def lookup(self, method: str, url: str, body) -> Optional[dict]:
+        method, target, body_hash = request_key(method, url, body)
+        with self._lock:
+            entry = self._next(self._exact, (method, target, body_hash))
+            if entry is None:
+                entry = self._next(self._loose, (method, target))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def __call__(self, request) -> requests.Response:
+        entry = self.lookup(request.method, request.url, request.body)
+        if entry is None:
+            raise CassetteMiss(f"no recorded interaction for {request.method} {request.url}",
+                               request=request)
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.reason = entry.get("reason")
+        resp.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = _decode_body(entry)
+        # There is no raw stream: iter_content (stream=True callers) serves _content
+        resp._content_consumed = True
+        resp.url = request.url
+        resp.request = request
+        resp.elapsed = timedelta(0)
+        return resp
+
+
+def diff(old_path: str, new_path: str) -> List[str]:
+    """
+    Compare two cassettes interaction by interaction (matched by method and path).
+
+    Returns:
+        list[str]: One line per interaction whose status or body differs, or that
+        exists in only one cassette.
+    """
+    def grouped(path):
+        groups = defaultdict(list)
+        for entry in read_cassette(path):
+            groups[(entry["method"], entry["target"])].append(entry)
+        return groups
+
+    old, new = grouped(old_path), grouped(new_path)
+    lines = []
+    for key in sorted(set(old) | set(new)):
+        a, b = old.get(key, []), new.get(key, [])
+        label = f"{key[0]} {key[1]}"
+        if len(a) != len(b):
+            lines.append(f"{label}: {len(a)} call(s) vs {len(b)}")
+        for i, (x, y) in enumerate(zip(a, b)):
+            if x["status"] != y["status"]:
+                lines.append(f"{label} #{i + 1}: status {x['status']} -> {y['status']}")
+            elif _decode_body(x) != _decode_body(y):
+                lines.append(f"{label} #{i + 1}: body differs")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect recorded cassettes.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff_cmd = sub.add_parser("diff", help="Show interactions that differ between two cassettes.")
+    diff_cmd.add_argument("old")
+    diff_cmd.add_argument("new")
+    show_cmd = sub.add_parser("show", help="List the interactions of a cassette.")
+    show_cmd.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        for entry in read_cassette(args.path):
+            print(f"{entry['method']:<7} {entry['target']:<40} {entry['status']}")
+        return 0
+    lines = diff(args.old, args.new)
+    for line in lines:
+        print(line)
+    return 1 if lines else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,380 @@
+"""
+Contract (schema) checks of recorded API responses, off the tests' critical path.
+
+Tests spot-check a few fields; ContractChecker validates every successful
+response of a known endpoint against the booking schema of api/models.py and
+reports drift per endpoint -- missing fields, wrong types and fields the models
+don't know. It listens to the shared call recorder (utils/capture.py), so the
+test only pays for queueing a reference to the already captured body:
+
+- "background" mode batches responses and validates each batch on a small
+  thread pool while the tests keep running;
+- "session" mode only queues them, then validates all batches at session end
+  across worker processes (true parallelism, no contention with the tests).
+  Queued bodies are held in memory up to `max_queued_bytes`; further batches
+  are pickled to a temporary directory until then.
+
+    pytest --contract-check=background
+    pytest --contract-check=session --contract-workers=4
+
+Bodies longer than the capture body limit are read from their spill file
+(--api-capture-spill-dir); without one they are counted as unchecked. Under
+pytest-xdist each worker checks its own responses and sends the results to the
+controller (workeroutput), which merges them and reports once.
+"""
+
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from json import loads as _json_loads
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pytest
+
+from utils.latency import endpoint_key
+
+MODES = ("off", "background", "session")
+DEFAULT_BATCH_SIZE = 64
+# Response bytes "session" mode keeps in memory before spilling batches to disk
+DEFAULT_MAX_QUEUED_BYTES = 32 * 1024 * 1024
+# xdist workeroutput key carrying a worker's results to the controller
+WORKER_OUTPUT_KEY = "api_contract"
+
+
+def _booking(data) -> List[str]:
+    from api.models import BookingRecord
+
+    return BookingRecord.problems(data)
+
+
+def _created(data) -> List[str]:
+    from api.models import BookingRecord
+
+    if type(data) is not dict:
+        return [f"response: expected an object, got {type(data).__name__}"]
+    problems = []
+    if type(data.get("bookingid")) is not int:
+        problems.append("response.bookingid: expected int, got "
+                        + ("nothing" if "bookingid" not in data else type(data["bookingid"]).__name__))
+    if "booking" not in data:
+        problems.append("response.booking: field required")
+    else:
+        problems.extend(BookingRecord.problems(data["booking"], "response.booking"))
+    problems.extend(f"response.{name}: unexpected field" for name in data if name not in ("bookingid", "booking"))
+    return problems
+
+
+def _booking_ids(data) -> List[str]:
+    if type(data) is not list:
+        return [f"response: expected a list, got {type(data).__name__}"]
+    for i, item in enumerate(data):
+        if type(item) is not dict or type(item.get("bookingid")) is not int:
+            # One entry is enough to show the drift; the list can be long
+            return [f"response[{i}]: expected {{\"bookingid\": int}}"]
+    return []
+
+
+def _auth(data) -> List[str]:
+    # Bad credentials are answered with 200 and {"reason": ...}
+    if type(data) is dict and (type(data.get("token")) is str or type(data.get("reason")) is str):
+        return []
+    return ['response: expected {"token": str} or {"reason": str}']
+
+
+# (METHOD, endpoint template) -> check(decoded JSON) returning the problems found.
+# Only 200 responses are checked; extend the table for new endpoints.
+CONTRACTS: Dict[Tuple[str, str], Callable[[object], List[str]]] = {
+    ("GET", "/booking/{id}"): _booking,
+    ("PUT", "/booking/{id}"): _booking,
+    ("PATCH", "/booking/{id}"): _booking,
+    ("POST", "/booking"): _created,
+    ("GET", "/booking"): _booking_ids,
+    ("POST", "/auth"): _auth,
+}
+
+
+def check_batch(batch: List[tuple]) -> List[tuple]:
+    """
+    Validate queued responses.
+
+    Args:
+        batch (list): (key, test_id, body bytes or None, spill path or None) items.
+
+    Returns:
+        list: (key, test_id, problems) per item; problems is None when the body
+        was not available (truncated without a spill file, never read, or its
+        spill file could not be read).
+    """
+    results = []
+    for key, test_id, body, spill_path in batch:
+        if spill_path:
+            try:
+                with open(spill_path, "rb") as f:
+                    body = f.read()
+            except OSError:
+                body = None
+        if body is None:
+            results.append((key, test_id, None))
+            continue
+        try:
+            data = _json_loads(body)
+        except ValueError as e:
+            results.append((key, test_id, [f"response: not JSON ({e.msg})"]))
+            continue
+        results.append((key, test_id, CONTRACTS[key](data)))
+    return results
+
+
+def _check_queued(batch: Union[List[tuple], str]) -> List[tuple]:
+    """check_batch() for a queued batch, or for one pickled to the file `batch`."""
+    if isinstance(batch, str):
+        with open(batch, "rb") as f:
+            batch = pickle.load(f)
+    return check_batch(batch)
+
+
+class EndpointContract:
+    """
+    Contract check results for one (method, endpoint) pair.
+
+    Attributes:
+        checked (int): Responses validated.
+        drifted (int): Validated responses with at least one problem.
+        unchecked (int): Responses whose body was not available.
+        issues (Counter): Problem text -> occurrences.
+        examples (dict[str, str]): Problem text -> first test it was seen in.
+    """
+
+    __slots__ = ("checked", "drifted", "unchecked", "issues", "examples")
+
+    def __init__(self):
+        self.checked = 0
+        self.drifted = 0
+        self.unchecked = 0
+        self.issues: Counter = Counter()
+        self.examples: Dict[str, str] = {}
+
+    def add(self, test_id: str, problems: Optional[List[str]]):
+        if problems is None:
+            self.unchecked += 1
+            return
+        self.checked += 1
+        if problems:
+            self.drifted += 1
+        for problem in problems:
+            self.issues[problem] += 1
+            self.examples.setdefault(problem, test_id)
+
+    def merge(self, other: "EndpointContract"):
+        """Fold `other` (e.g. another xdist worker's results) into these results."""
+        self.checked += other.checked
+        self.drifted += other.drifted
+        self.unchecked += other.unchecked
+        self.issues.update(other.issues)
+        for problem, test_id in other.examples.items():
+            self.examples.setdefault(problem, test_id)
+
+    def to_dict(self) -> dict:
+        """Plain-data form, e.g. to send through xdist's workeroutput."""
+        return {"checked": self.checked, "drifted": self.drifted, "unchecked": self.unchecked,
+                "issues": dict(self.issues), "examples": dict(self.examples)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EndpointContract":
+        contract = cls()
+        contract.checked = data["checked"]
+        contract.drifted = data["drifted"]
+        contract.unchecked = data["unchecked"]
+        contract.issues = Counter(data["issues"])
+        contract.examples = dict(data["examples"])
+        return contract
+
+
+class ContractChecker:
+    """
+    Pytest plugin validating recorded responses against the API models.
+
+    Registered from conftest.py; subscribe `on_call` to a CallRecorder and set
+    `test_id` to the running test's node id.
+
+    Attributes:
+        mode (str): "background" or "session".
+        test_id (str | None): Node id the queued responses are attributed to.
+        stats (dict[tuple, EndpointContract]): Results per (method, endpoint).
+    """
+
+    def __init__(self, mode: str = "background", workers: int = 2, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_queued_bytes: int = DEFAULT_MAX_QUEUED_BYTES):
+        """
+        Args:
+            mode (str): "background" validates while tests run, "session" at session end.
+            workers (int): Threads (background) or processes (session) validating batches.
+            batch_size (int): Responses per batch.
+            max_queued_bytes (int): Response bytes "session" mode holds in memory;
+                later batches are spilled to a temporary directory.
+
+        Raises:
+            ValueError: For an unknown mode.
+        """
+        if mode not in ("background", "session"):
+            raise ValueError(f"unknown contract check mode {mode!r}")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_queued_bytes = max_queued_bytes
+        self.test_id: Optional[str] = None
+        self.stats: Dict[Tuple[str, str], EndpointContract] = {}
+        self._pending: List[tuple] = []
+        # Queued batches ("session" mode): lists, or paths of spilled batches
+        self._batches: List[Union[List[tuple], str]] = []
+        self._queued_bytes = 0
+        self._spill_dir: Optional[str] = None
+        self._futures = []
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="contract") \
+            if mode == "background" else None
+
+    def on_call(self, record):
+        """CallRecorder listener: queue a successful response of a known endpoint."""
+        if record.status != 200:
+            return
+        key = endpoint_key(record.method, record.url)
+        if key not in CONTRACTS:
+            return
+        content = record.response_content
+        body = content.data
+        if body is not None and content.size > len(body) and not content.spill_path:
+            body = None  # truncated; validating a prefix would report bogus drift
+        item = (key, self.test_id or "", body, content.spill_path if body is not None else None)
+        with self._lock:
+            self._pending.append(item)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[tuple]):
+        # Called with the lock held
+        if self._pool is not None:
+            self._futures.append(self._pool.submit(self._check, batch))
+            return
+        size = sum(len(body) for _, _, body, _ in batch if body is not None)
+        if self._queued_bytes + size <= self.max_queued_bytes:
+            self._queued_bytes += size
+            self._batches.append(batch)
+            return
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="api-contract-")
+        path = os.path.join(self._spill_dir, f"batch-{len(self._batches)}.pickle")
+        with open(path, "wb") as f:
+            pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+        self._batches.append(path)
+
+    def _check(self, batch: List[tuple]):
+        self._merge(check_batch(batch))
+
+    def _merge(self, results: List[tuple]):
+        with self._stats_lock:
+            for key, test_id, problems in results:
+                stats = self.stats.get(key)
+                if stats is None:
+                    stats = self.stats[key] = EndpointContract()
+                stats.add(test_id, problems)
+
+    def finish(self):
+        """Validate everything still queued and wait for the results."""
+        with self._lock:
+            if self._pending:
+                batch, self._pending = self._pending, []
+                self._dispatch(batch)
+            batches, self._batches = self._batches, []
+            self._queued_bytes = 0
+            futures, self._futures = self._futures, []
+        if self._pool is not None:
+            for future in wait(futures).done:
+                future.result()
+        elif len(batches) > 1 and self.workers > 1:
+            # Not fork: threads of this process (HTTP/2 loop, local stand-in,
+            # background pools) may hold locks a forked child would inherit
+            with ProcessPoolExecutor(min(self.workers, len(batches)),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                for results in pool.map(_check_queued, batches):
+                    self._merge(results)
+        else:
+            for batch in batches:
+                self._merge(_check_queued(batch))
+
+    def close(self):
+        """
+        Stop the background threads and remove spilled batches (queued batches are
+        dropped; call finish() first).
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def export(self) -> List[list]:
+        """[[method, endpoint, results dict], ...] for the controller to merge()."""
+        with self._stats_lock:
+            return [[method, endpoint, s.to_dict()] for (method, endpoint), s in self.stats.items()]
+
+    def merge(self, exported: List[list]):
+        """Fold results exported by another process into this checker's."""
+        with self._stats_lock:
+            for method, endpoint, data in exported:
+                incoming = EndpointContract.from_dict(data)
+                stats = self.stats.get((method, endpoint))
+                if stats is None:
+                    self.stats[(method, endpoint)] = incoming
+                else:
+                    stats.merge(incoming)
+
+    def summary(self) -> List[dict]:
+        """Per-endpoint results, sorted by method and endpoint; issues most frequent first."""
+        with self._stats_lock:
+            items = sorted(self.stats.items())
+        return [
+            {"method": method, "endpoint": endpoint, "checked": s.checked, "drifted": s.drifted,
+             "unchecked": s.unchecked,
+             "issues": [{"problem": problem, "count": count, "example": s.examples[problem]}
+                        for problem, count in s.issues.most_common()]}
+            for (method, endpoint), s in items
+        ]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: a worker finished and sent its results
+        exported = getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY)
+        if exported:
+            self.merge(exported)
+
+    def pytest_sessionfinish(self, session):
+        self.finish()
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            # xdist worker: the controller prints the summary
+            workeroutput[WORKER_OUTPUT_KEY] = self.export()
+
+    def pytest_unconfigure(self, config):
+        self.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rows = self.summary()
+        if not rows:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "API contract")
+        tr.write_line(f"{'method':<7} {'endpoint':<32} {'checked':>8} {'drifted':>8} {'unchecked':>10}")
+        for r in rows:
+            tr.write_line(f"{r['method']:<7} {r['endpoint']:<32} {r['checked']:>8} "
+                          f"{r['drifted']:>8} {r['unchecked']:>10}")
+            for issue in r["issues"][:5]:
+                tr.write_line(f"    {issue['count']:>5}x  {issue['problem']}  ({issue['example']})")
@@ -0,0 +1,224 @@
+"""
+Session-wide API latency summary.
+
+LatencyPlugin listens to the shared call recorder (utils/capture.py) and
+aggregates every recorded call into per-endpoint statistics: count, error rate,
+p50/p90/p99/max and a fixed-bucket latency histogram. Numeric path segments are
+folded into "{id}" so /booking/1 and /booking/2 aggregate as GET /booking/{id}.
+
+At the end of the session the plugin prints a terminal summary and, when a path
+is configured (--api-perf-json), writes the same data as JSON so response times
+can be compared across releases. Under pytest-xdist each worker sends its stats
+to the controller (workeroutput), which merges them and reports once.
+"""
+
+import json
+import math
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is unbounded
+HISTOGRAM_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Duration samples kept per endpoint for the percentiles
+RESERVOIR_SIZE = 10_000
+
+# xdist workeroutput key carrying a worker's stats to the controller
+WORKER_OUTPUT_KEY = "api_latency"
+
+
+def endpoint_key(method: str, url: str) -> Tuple[str, str]:
+    """Return (METHOD, path template) for a request, e.g. ("GET", "/booking/{id}")."""
+    path = urlsplit(url).path or "/"
+    segments = ["{id}" if s.isdigit() else s for s in path.split("/")]
+    return method.upper(), "/".join(segments) or "/"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """
+    Latency samples for one (method, endpoint) pair.
+
+    Memory is bounded: percentiles come from a uniform reservoir of at most
+    RESERVOIR_SIZE samples (exact while fewer calls were made); count, errors, max
+    and the histogram are exact.
+
+    Attributes:
+        durations (list[float]): Reservoir of call durations in seconds.
+        count (int): Calls added.
+        errors (int): Calls that raised or returned status >= 400.
+        max (float | None): Slowest call.
+        buckets (list[int]): Histogram counts aligned with HISTOGRAM_BOUNDS plus overflow.
+    """
+
+    def __init__(self):
+        self.durations: List[float] = []
+        self.count = 0
+        self.errors = 0
+        self.max: Optional[float] = None
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        # Fixed seed: the same run keeps the same samples
+        self._random = random.Random(0)
+
+    def add(self, duration: float, error: bool):
+        self.count += 1
+        if len(self.durations) < RESERVOIR_SIZE:
+            self.durations.append(duration)
+        else:
+            # Algorithm R: every call ends up in the reservoir with equal probability
+            slot = self._random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.durations[slot] = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+        if error:
+            self.errors += 1
+        for i, bound in enumerate(HISTOGRAM_BOUNDS):
+            if duration <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def merge(self, other: "EndpointStats"):
+        """Fold `other` (e.g. another xdist worker's stats) into these stats."""
+        total = self.count + other.count
+        if len(self.durations) + len(other.durations) <= RESERVOIR_SIZE:
+            self.durations += other.durations
+        elif total:
+            # Keep each side in proportion to the calls it stands for
+            mine = min(len(self.durations), round(RESERVOIR_SIZE * self.count / total))
+            theirs = min(len(other.durations), RESERVOIR_SIZE - mine)
+            self.durations = (self._random.sample(self.durations, mine)
+                              + self._random.sample(other.durations, theirs))
+        self.count = total
+        self.errors += other.errors
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def to_dict(self) -> dict:
+        """Plain-data form, e.g. to send through xdist's workeroutput."""
+        return {"durations": list(self.durations), "count": self.count, "errors": self.errors,
+                "max": self.max, "buckets": list(self.buckets)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EndpointStats":
+        stats = cls()
+        stats.durations = list(data["durations"])
+        stats.count = data["count"]
+        stats.errors = data["errors"]
+        stats.max = data["max"]
+        stats.buckets = list(data["buckets"])
+        return stats
+
+    def summary(self) -> dict:
+        values = sorted(self.durations)
+        count = self.count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "p50": percentile(values, 50) if values else None,
+            "p90": percentile(values, 90) if values else None,
+            "p99": percentile(values, 99) if values else None,
+            "max": self.max,
+            "histogram": [
+                {"le": bound, "count": n}
+                for bound, n in zip(list(HISTOGRAM_BOUNDS) + ["+Inf"], self.buckets)
+            ],
+        }
+
+
+class LatencyPlugin:
+    """
+    Pytest plugin aggregating recorded API calls into per-endpoint latency stats.
+
+    Registered from conftest.py; subscribe `on_call` to a CallRecorder.
+    """
+
+    def __init__(self, json_path: str = None):
+        """
+        Args:
+            json_path (str | None): Where to write the JSON summary; None skips it.
+        """
+        self.json_path = json_path
+        self.stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def on_call(self, record):
+        """CallRecorder listener: add one call to the aggregate."""
+        key = endpoint_key(record.method, record.url)
+        error = record.status is None or record.status >= 400
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = EndpointStats()
+            stats.add(record.duration, error)
+
+    def summary(self) -> List[dict]:
+        """Per-endpoint summaries, sorted by method and endpoint."""
+        with self._lock:
+            items = sorted(self.stats.items())
+            return [dict(method=method, endpoint=endpoint, **stats.summary())
+                    for (method, endpoint), stats in items]
+
+    def export(self) -> List[list]:
+        """[[method, endpoint, stats dict], ...] for the controller to merge()."""
+        with self._lock:
+            return [[method, endpoint, stats.to_dict()] for (method, endpoint), stats in self.stats.items()]
+
+    def merge(self, exported: List[list]):
+        """Fold stats exported by another process into this plugin's."""
+        with self._lock:
+            for method, endpoint, data in exported:
+                incoming = EndpointStats.from_dict(data)
+                stats = self.stats.get((method, endpoint))
+                if stats is None:
+                    self.stats[(method, endpoint)] = incoming
+                else:
+                    stats.merge(incoming)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: a worker finished and sent its stats
+        exported = getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY)
+        if exported:
+            self.merge(exported)
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            # xdist worker: the controller writes the JSON and prints the summary
+            workeroutput[WORKER_OUTPUT_KEY] = self.export()
+            return
+        if not self.json_path or not self.stats:
+            return
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump({"unit": "seconds", "endpoints": self.summary()}, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rows = self.summary()
+        if not rows:
+            return
+        tr = terminalreporter
+        tr.write_sep("=", "API latency")
+        tr.write_line(f"{'method':<7} {'endpoint':<32} {'count':>6} {'err%':>6} "
+                      f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for r in rows:
+            tr.write_line(
+                f"{r['method']:<7} {r['endpoint']:<32} {r['count']:>6} "
+                f"{r['error_rate'] * 100:>6.1f} {r['p50'] * 1000:>8.1f} {r['p90'] * 1000:>8.1f} "
+                f"{r['p99'] * 1000:>8.1f} {r['max'] * 1000:>8.1f}"
+            )
+        if self.json_path:
+            tr.write_line(f"latency summary written to {self.json_path}")
@@ -0,0 +1,247 @@
+"""
+Load generation driven by the project's own BookingAPI scenarios.
+
+LoadRunner runs a scenario (api.scenarios.crud_flow by default) in a loop on N
+virtual users (threads, each with its own authenticated BookingAPI) for a fixed
+duration. Users are started evenly over a ramp-up period, and an optional shared
+pacer caps the overall request rate. Every step is timed, and the result reports
+per-step count, errors, throughput and latency percentiles.
+
+Command line:
+
+    python -m utils.load_runner --base-url http://localhost:3001 \\
+        --users 50 --duration 60s --ramp-up 10s --rps 200 --json load.json
+
+`--local` runs against the in-process stand-in (utils/local_booker.py) instead.
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from api.booking_api import BookingAPI
+from api.scenarios import ScenarioError, crud_flow
+from config import config
+from utils.latency import EndpointStats
+
+
+def parse_duration(value) -> float:
+    """Parse "90", "90s", "1.5m" or "1h" into seconds."""
+    text = str(value).strip().lower()
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    for suffix in ("ms", "s", "m", "h"):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * units[suffix]
+    return float(text)
+
+
+def default_payload(n: int) -> dict:
+    """Booking payload for iteration `n`; lastnames are unique within a run."""
+    return {
+        "firstname": "Load",
+        "lastname": f"User{n}",
+        "totalprice": 100 + n % 400,
+        "depositpaid": n % 2 == 0,
+        "bookingdates": {"checkin": "2025-01-01", "checkout": "2025-01-05"},
+        "additionalneeds": "Breakfast",
+    }
+
+
+class Pacer:
+    """
+    Shared request pacer: hands out evenly spaced send slots at `rps` per second.
+
+    Threads call wait() before each request and sleep until their slot.
+    """
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class LoadResult:
+    """
+    Outcome of a load run.
+
+    Attributes:
+        elapsed (float): Wall-clock seconds from start to the last user stopping.
+        iterations (int): Scenario iterations started.
+        failures (int): Iterations that ended with an error.
+        steps (dict[str, EndpointStats]): Timings per scenario step.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.iterations = 0
+        self.failures = 0
+        self.steps: Dict[str, EndpointStats] = {}
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed or 1e-9
+        steps = []
+        for name, stats in self.steps.items():
+            row = stats.summary()
+            row.pop("histogram")
+            steps.append(dict(step=name, throughput=row["count"] / elapsed, **row))
+        return {
+            "elapsed": self.elapsed,
+            "iterations": self.iterations,
+            "failures": self.failures,
+            "iterations_per_second": self.iterations / elapsed,
+            "steps": steps,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        lines = [
+            f"{s['iterations']} iterations ({s['failures']} failed) in {s['elapsed']:.1f}s "
+            f"= {s['iterations_per_second']:.1f} it/s",
+            f"{'step':<10} {'count':>7} {'err%':>6} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+        ]
+        for r in s["steps"]:
+            lines.append(
+                f"{r['step']:<10} {r['count']:>7} {r['error_rate'] * 100:>6.1f} {r['throughput']:>8.1f} "
+                f"{r['p50'] * 1000:>8.1f} {r['p90'] * 1000:>8.1f} {r['p99'] * 1000:>8.1f} {r['max'] * 1000:>8.1f}"
+            )
+        return "\n".join(lines)
+
+
+class LoadRunner:
+    """
+    Run a BookingAPI scenario concurrently on virtual users.
+
+    Attributes:
+        base_url (str): Target API.
+        users (int): Number of concurrent virtual users.
+        duration (float): Seconds each run lasts, ramp-up included.
+        ramp_up (float): Seconds over which users are started.
+        rps (float | None): Overall request-rate cap; None runs unpaced.
+    """
+
+    def __init__(self, base_url: str, users: int = 10, duration: float = 60.0, ramp_up: float = 0.0,
+                 rps: Optional[float] = None, scenario: Callable = crud_flow,
+                 payload_factory: Callable[[int], dict] = default_payload,
+                 username: str = config.USERNAME, password: str = config.PASSWORD):
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.rps = rps
+        self.scenario = scenario
+        self.payload_factory = payload_factory
+        self.username = username
+        self.password = password
+
+    def run(self) -> LoadResult:
+        """Run the load test and block until every user has stopped."""
+        result = LoadResult()
+        lock = threading.Lock()
+        pacer = Pacer(self.rps) if self.rps else None
+        counter = itertools.count()
+        start = time.perf_counter()
+        deadline = start + self.duration
+
+        def record(name, duration, error):
+            with lock:
+                stats = result.steps.get(name)
+                if stats is None:
+                    stats = result.steps[name] = EndpointStats()
+                stats.add(duration, error)
+
+        @contextmanager
+        def step(name):
+            if pacer is not None:
+                pacer.wait()
+            t0 = time.perf_counter()
+            try:
+                yield
+            except Exception:
+                record(name, time.perf_counter() - t0, True)
+                raise
+            record(name, time.perf_counter() - t0, False)
+
+        def user(index):
+            # Evenly spread user start times over the ramp-up period
+            time.sleep(self.ramp_up * index / self.users)
+            api = BookingAPI(self.base_url)
+            try:
+                # Cached: all virtual users share one token
+                api.authenticate(self.username, self.password)
+            except Exception:
+                with lock:
+                    result.failures += 1
+                return
+            while time.perf_counter() < deadline:
+                n = next(counter)
+                try:
+                    self.scenario(api, self.payload_factory(n), step)
+                    failed = False
+                except ScenarioError as e:
+                    # The step itself completed; its response was wrong
+                    failed = True
+                    with lock:
+                        if e.step in result.steps:
+                            result.steps[e.step].errors += 1
+                except Exception:
+                    # Transport errors were already counted by step()
+                    failed = True
+                with lock:
+                    result.iterations += 1
+                    result.failures += failed
+
+        threads = [threading.Thread(target=user, args=(i,), name=f"load-user-{i}", daemon=True)
+                   for i in range(self.users)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the booking CRUD flow as a load test.")
+    parser.add_argument("--base-url", default=config.BASE_URL)
+    parser.add_argument("--local", action="store_true", help="Target the in-process stand-in.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=parse_duration, default=60.0, help="e.g. 60s, 5m")
+    parser.add_argument("--ramp-up", type=parse_duration, default=0.0, help="e.g. 10s")
+    parser.add_argument("--rps", type=float, default=None, help="Overall request-rate cap.")
+    parser.add_argument("--json", dest="json_path", help="Write the summary to this JSON file.")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if args.local:
+        from utils.local_booker import LocalBookerServer
+        server = LocalBookerServer().start()
+        base_url = server.url
+    try:
+        result = LoadRunner(base_url, args.users, args.duration, args.ramp_up, args.rps).run()
+    finally:
+        if server is not None:
+            server.stop()
+    print(result.format())
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result.summary(), f, indent=2)
+    return 1 if result.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,585 @@
+"""
+In-process stand-in for the RESTful Booker service.
+
+Implements the endpoints the framework uses -- /auth, /booking (CRUD plus the
+firstname/lastname/checkin/checkout listing filters) and /ping -- with the same
+status codes and bodies as https://restful-booker.herokuapp.com, so the suite and
+the client can be exercised offline and without remote latency or rate limits.
+
+Routing lives in BookerStore.handle(), independent of the HTTP server, so the same
+behaviour can be mounted on other servers. LocalBookerServer runs it on a
+ThreadingHTTPServer in a daemon thread:
+
+    with LocalBookerServer() as server:
+        api = BookingAPI(server.url)
+
+The same port also speaks cleartext HTTP/2 with prior knowledge (h2c) when the
+optional `h2` package is installed: connections opening with the HTTP/2 preface
+are served by an h2 state machine, with each stream handled on a worker thread so
+requests multiplexed over one connection run concurrently. This is the local h2
+stand-in for BaseClient(transport="http2") (api/transport.py).
+
+Run standalone with `python -m utils.local_booker --port 3001`.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import secrets
+import select
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config import config
+
+# Response triple returned by BookerStore.handle: (status, content type, body)
+Response = Tuple[int, str, bytes]
+
+JSON = "application/json; charset=utf-8"
+TEXT = "text/plain; charset=utf-8"
+
+# First bytes of every HTTP/2 connection (RFC 9113, section 3.4)
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+# Seconds a new connection may take to send enough bytes to tell h2 from HTTP/1.1
+PREFACE_TIMEOUT = 5.0
+
+
+def _text(status: int, message: str) -> Response:
+    return status, TEXT, message.encode("utf-8")
+
+
+def _json(status: int, obj) -> Response:
+    return status, JSON, json.dumps(obj).encode("utf-8")
+
+
+def _valid_booking(data) -> bool:
+    """Return True if `data` has every field the real service requires."""
+    if not isinstance(data, dict):
+        return False
+    dates = data.get("bookingdates")
+    return (
+        isinstance(data.get("firstname"), str)
+        and isinstance(data.get("lastname"), str)
+        and isinstance(data.get("totalprice"), (int, float))
+        and not isinstance(data.get("totalprice"), bool)
+        and isinstance(data.get("depositpaid"), bool)
+        and isinstance(dates, dict)
+        and isinstance(dates.get("checkin"), str)
+        and isinstance(dates.get("checkout"), str)
+    )
+
+
+def _booking_fields(data: dict) -> dict:
+    """Copy only the fields the service stores, in its field order."""
+    booking = {
+        "firstname": data["firstname"],
+        "lastname": data["lastname"],
+        "totalprice": data["totalprice"],
+        "depositpaid": data["depositpaid"],
+        "bookingdates": {
+            "checkin": data["bookingdates"]["checkin"],
+            "checkout": data["bookingdates"]["checkout"],
+        },
+    }
+    if "additionalneeds" in data:
+        booking["additionalneeds"] = data["additionalneeds"]
+    return booking
+
+
+class BookerStore:
+    """
+    Thread-safe in-memory booking store with RESTful Booker routing.
+
+    Attributes:
+        username (str): Accepted username for /auth and Basic auth.
+        password (str): Accepted password for /auth and Basic auth.
+        bookings (dict[int, dict]): Stored bookings keyed by id.
+        tokens (set[str]): Tokens issued by /auth.
+    """
+
+    def __init__(self, username: str = config.USERNAME, password: str = config.PASSWORD):
+        self.username = username
+        self.password = password
+        self.bookings: Dict[int, dict] = {}
+        self.tokens = set()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, path: str, query: Dict[str, list], headers, body: bytes) -> Response:
+        """
+        Route one request.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Request path without the query string.
+            query (dict): Parsed query string (as returned by urllib.parse.parse_qs).
+            headers: Mapping with case-insensitive .get() (e.g. http.client.HTTPMessage).
+            body (bytes): Raw request body.
+
+        Returns:
+            tuple: (status, content type, body bytes).
+        """
+        parts = [p for p in path.split("/") if p]
+        if parts == ["ping"] and method == "GET":
+            return _text(201, "Created")
+        if parts == ["auth"] and method == "POST":
+            return self._auth(body)
+        if parts == ["booking"]:
+            if method == "GET":
+                return self._list(query)
+            if method == "POST":
+                return self._create(body)
+        if len(parts) == 2 and parts[0] == "booking":
+            try:
+                booking_id = int(parts[1])
+            except ValueError:
+                return _text(404, "Not Found")
+            if method == "GET":
+                return self._get(booking_id)
+            if method in ("PUT", "PATCH", "DELETE"):
+                if not self._authorized(headers):
+                    return _text(403, "Forbidden")
+                if method == "DELETE":
+                    return self._delete(booking_id)
+                return self._update(booking_id, body, partial=method == "PATCH")
+        return _text(404, "Not Found")
+
+    # -- auth -----------------------------------------------------------------
+
+    def _auth(self, body: bytes) -> Response:
+        data = _loads(body)
+        if (isinstance(data, dict) and data.get("username") == self.username
+                and data.get("password") == self.password):
+            token = secrets.token_hex(8)
+            with self._lock:
+                self.tokens.add(token)
+            return _json(200, {"token": token})
+        # The real service answers bad credentials with 200 and a reason
+        return _json(200, {"reason": "Bad credentials"})
+
+    def _authorized(self, headers) -> bool:
+        cookie = headers.get("Cookie") or ""
+        for item in cookie.split(";"):
+            name, _, value = item.strip().partition("=")
+            if name == "token" and value in self.tokens:
+                return True
+        auth = headers.get("Authorization") or ""
+        if auth.startswith("Basic "):
+            try:
+                user, _, password = base64.b64decode(auth[6:]).decode("utf-8").partition(":")
+            except Exception:
+                return False
+            return user == self.username and password == self.password
+        return False
+
+    # -- bookings -------------------------------------------------------------
+
+    def _list(self, query: Dict[str, list]) -> Response:
+        firstname = _first(query, "firstname")
+        lastname = _first(query, "lastname")
+        checkin = _first(query, "checkin")
+        checkout = _first(query, "checkout")
+        with self._lock:
+            items = list(self.bookings.items())
+        ids = []
+        for booking_id, booking in items:
+            if firstname is not None and booking["firstname"] != firstname:
+                continue
+            if lastname is not None and booking["lastname"] != lastname:
+                continue
+            # ISO dates compare correctly as strings
+            if checkin is not None and booking["bookingdates"]["checkin"] < checkin:
+                continue
+            if checkout is not None and booking["bookingdates"]["checkout"] < checkout:
+                continue
+            ids.append({"bookingid": booking_id})
+        return _json(200, ids)
+
+    def _create(self, body: bytes) -> Response:
+        data = _loads(body)
+        if not _valid_booking(data):
+            return _text(500, "Internal Server Error")
+        booking = _booking_fields(data)
+        with self._lock:
+            booking_id = self._next_id
+            self._next_id += 1
+            self.bookings[booking_id] = booking
+        return _json(200, {"bookingid": booking_id, "booking": booking})
+
+    def _get(self, booking_id: int) -> Response:
+        with self._lock:
+            booking = self.bookings.get(booking_id)
+        if booking is None:
+            return _text(404, "Not Found")
+        return _json(200, booking)
+
+    def _update(self, booking_id: int, body: bytes, partial: bool) -> Response:
+        data = _loads(body)
+        with self._lock:
+            current = self.bookings.get(booking_id)
+            if current is None:
+                return _text(405, "Method Not Allowed")
+            if partial:
+                if not isinstance(data, dict):
+                    return _text(400, "Bad Request")
+                merged = dict(current, **{k: v for k, v in data.items() if k != "bookingdates"})
+                if isinstance(data.get("bookingdates"), dict):
+                    merged["bookingdates"] = dict(current["bookingdates"], **data["bookingdates"])
+                data = merged
+            if not _valid_booking(data):
+                return _text(400, "Bad Request")
+            booking = self.bookings[booking_id] = _booking_fields(data)
+        return _json(200, booking)
+
+    def _delete(self, booking_id: int) -> Response:
+        with self._lock:
+            if self.bookings.pop(booking_id, None) is None:
+                return _text(405, "Method Not Allowed")
+        return _text(201, "Created")
+
+
+def _respond(store: BookerStore, method: str, target: str, headers, body: bytes):
+    """Run one request through `store`; returns (status, header list, body) for any server."""
+    url = urlsplit(target)
+    status, content_type, payload = store.handle(method, url.path, parse_qs(url.query), headers, body)
+    etag = None
+    if method == "GET" and status == 200:
+        # Weak ETag like the real (Express) service, honouring If-None-Match
+        etag = f'W/"{len(payload):x}-{hashlib.sha1(payload).hexdigest()[:27]}"'
+        if headers.get("If-None-Match") == etag:
+            status, payload = 304, b""
+    response_headers = []
+    if status != 304:
+        response_headers.append(("Content-Type", content_type))
+    if etag:
+        response_headers.append(("ETag", etag))
+    response_headers.append(("Content-Length", str(len(payload))))
+    return status, response_headers, payload
+
+
+def _loads(body: bytes):
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        return None
+
+
+def _first(query: Dict[str, list], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY keep-alive
+    # requests stall ~40ms on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    store: BookerStore = None
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload = _respond(self.store, self.command, self.path, self.headers, body)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        # Keep test output quiet; the capture hooks already record every call
+        pass
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _is_h2(sock, timeout: float = PREFACE_TIMEOUT) -> bool:
+    """
+    Peek (without consuming) whether the client opened with the HTTP/2 preface.
+
+    Gives up after `timeout` seconds, so a silent or stalled client is served as
+    HTTP/1.1 instead of holding the connection's thread here.
+    """
+    deadline = time.monotonic() + timeout
+    data = b""
+    while len(data) < len(H2_PREFACE):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            if not data:
+                if not select.select([sock], [], [], remaining)[0]:
+                    return False
+            else:
+                # Part of the preface is buffered, so the socket stays readable:
+                # pause before peeking again instead of spinning on the same bytes
+                time.sleep(min(0.005, remaining))
+            data = sock.recv(len(H2_PREFACE), socket.MSG_PEEK)
+        except (OSError, ValueError):
+            return False
+        if not data or not H2_PREFACE.startswith(data):
+            return False
+    return True
+
+
+class _H2Connection:
+    """
+    Serve one cleartext HTTP/2 connection.
+
+    The calling thread reads frames and feeds the h2 state machine; every complete
+    request stream is handled on the server's worker pool, so streams multiplexed
+    over the connection are served concurrently. Response bodies larger than the
+    peer's flow-control window are sent as WINDOW_UPDATE frames arrive.
+    """
+
+    def __init__(self, server: "_BookerHTTPServer", sock):
+        import h2.config
+        import h2.connection
+
+        self.server = server
+        self.sock = sock
+        self.conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        # Guards the state machine and socket writes shared with the worker threads
+        self.lock = threading.Lock()
+        self.streams: Dict[int, tuple] = {}
+        self.pending: Dict[int, bytes] = {}
+
+    def serve(self):
+        import h2.events
+        import h2.exceptions
+
+        with self.lock:
+            self.conn.initiate_connection()
+            self._flush()
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            with self.lock:
+                try:
+                    events = self.conn.receive_data(data)
+                except h2.exceptions.ProtocolError:
+                    self._flush()
+                    return
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        self.streams[event.stream_id] = (event.headers, bytearray())
+                    elif isinstance(event, h2.events.DataReceived):
+                        if event.stream_id in self.streams:
+                            self.streams[event.stream_id][1].extend(event.data)
+                        self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = self.streams.pop(event.stream_id, ((), b""))
+                        self.server.workers().submit(self._handle, event.stream_id, headers, bytes(body))
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        self._send_pending(event.stream_id)
+                    elif isinstance(event, h2.events.StreamReset):
+                        self.streams.pop(event.stream_id, None)
+                        self.pending.pop(event.stream_id, None)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        self._flush()
+                        return
+                self._flush()
+
+    def _handle(self, stream_id: int, headers, body: bytes):
+        import h2.exceptions
+
+        pseudo = {}
+        message = HTTPMessage()
+        cookies = []
+        for name, value in headers:
+            if name.startswith(":"):
+                pseudo[name] = value
+            elif name == "cookie":
+                # HTTP/2 may split the Cookie header into one field per crumb
+                cookies.append(value)
+            else:
+                message[name] = value
+        if cookies:
+            message["Cookie"] = "; ".join(cookies)
+        status, response_headers, payload = _respond(
+            self.server.store, pseudo.get(":method", "GET"), pseudo.get(":path", "/"), message, body)
+        with self.lock:
+            try:
+                self.conn.send_headers(
+                    stream_id, [(":status", str(status))] + [(n.lower(), v) for n, v in response_headers],
+                    end_stream=not payload)
+                if payload:
+                    self.pending[stream_id] = payload
+                    self._send_pending(stream_id)
+            except h2.exceptions.ProtocolError:
+                # The client reset the stream meanwhile
+                self.pending.pop(stream_id, None)
+            self._flush()
+
+    def _send_pending(self, stream_id: int):
+        """Send as much pending body as the flow-control windows allow (0 = every stream)."""
+        import h2.exceptions
+
+        for sid in (list(self.pending) if stream_id == 0 else [stream_id]):
+            data = self.pending.get(sid)
+            if data is None:
+                continue
+            try:
+                allowed = min(self.conn.local_flow_control_window(sid), len(data))
+                while allowed > 0:
+                    size = min(allowed, self.conn.max_outbound_frame_size)
+                    self.conn.send_data(sid, data[:size])
+                    data, allowed = data[size:], allowed - size
+                if data:
+                    self.pending[sid] = data
+                else:
+                    del self.pending[sid]
+                    self.conn.end_stream(sid)
+            except h2.exceptions.ProtocolError:
+                self.pending.pop(sid, None)
+
+    def _flush(self):
+        data = self.conn.data_to_send()
+        if data:
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                pass
+
+
+class _BookerHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that hands connections opening with the HTTP/2 preface to h2."""
+
+    daemon_threads = True
+    store: BookerStore = None
+    # Seconds each new connection waits before being served (emulated handshake)
+    connect_delay = 0.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = {"http/1.1": 0, "h2": 0}
+        self._workers = None
+        self._lock = threading.Lock()
+
+    def workers(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._workers is None:
+                self._workers = ThreadPoolExecutor(max_workers=32, thread_name_prefix="local-booker-h2")
+            return self._workers
+
+    def finish_request(self, request, client_address):
+        protocol = "h2" if _h2_available() and _is_h2(request) else "http/1.1"
+        with self._lock:
+            self.connections[protocol] += 1
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
+        if protocol == "h2":
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _H2Connection(self, request).serve()
+        else:
+            super().finish_request(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        if self._workers is not None:
+            self._workers.shutdown(wait=False)
+            self._workers = None
+
+
+class LocalBookerServer:
+    """
+    Run a BookerStore on a local ThreadingHTTPServer in a background thread.
+
+    Attributes:
+        store (BookerStore): The backing store; inspect or seed it directly in tests.
+        url (str): Base URL of the running server, e.g. "http://127.0.0.1:54321".
+        connections (dict): Connections accepted so far per protocol ("http/1.1", "h2").
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, store: BookerStore = None,
+                 connect_delay: float = 0.0):
+        """
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free random port.
+            store (BookerStore): Store to serve; a fresh one is created by default.
+            connect_delay (float): Seconds every new connection waits before its first
+                request is served, emulating the TCP/TLS setup round trips of a
+                remote target (used by benchmarks/bench_transport.py).
+        """
+        self.store = store or BookerStore()
+        handler = type("BookerHandler", (_Handler,), {"store": self.store})
+        self._httpd = _BookerHTTPServer((host, port), handler)
+        self._httpd.store = self.store
+        self._httpd.connect_delay = connect_delay
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> Dict[str, int]:
+        return dict(self._httpd.connections)
+
+    def start(self) -> "LocalBookerServer":
+        """Start serving in a daemon thread and return self."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="local-booker", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted (used by the CLI)."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local RESTful Booker stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    args = parser.parse_args(argv)
+    server = LocalBookerServer(args.host, args.port)
+    print(f"Local Restful Booker listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Deterministic, pre-generated booking payloads.
+
+PayloadPool.generate(size, seed) builds `size` valid booking payloads in one go
+from a seeded random.Random -- varied names (including unicode, apostrophes and
+long names), date ranges, prices and the edge cases the API must accept (zero
+price, same-week and year-long stays, empty additional needs). The same seed
+always produces the same payloads, so failures reproduce and recorded traffic
+stays stable between runs.
+
+A pool can be saved to a compact binary file and re-opened with mmap, so later
+runs skip generation entirely. Every lookup is O(1): an offsets table points at
+each compact JSON record, which is decoded on access into a fresh dict.
+
+File layout (little endian):
+    header   b"BKP1", version (H), seed (Q), count (I)
+    offsets  (count + 1) x uint32, relative to the start of the records
+    records  compact JSON payloads, back to back
+"""
+
+import itertools
+import json
+import mmap
+import os
+import random
+import struct
+from array import array
+from datetime import date, timedelta
+from typing import List, Optional
+
+MAGIC = b"BKP1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHQI")
+
+FIRST_NAMES = (
+    "Jim", "Mary", "Sally", "John", "Eric", "Susan", "Mark", "Josh", "Ana", "Zoë",
+    "José", "Siobhán", "Björn", "Anne-Marie", "Li", "Øyvind", "Chloé", "Mohammed",
+    "Priya", "Kwame", "Yuki", "Olga", "Tomás", "Aleksandr", "Mia",
+)
+LAST_NAMES = (
+    "Brown", "Smith", "Jones", "Wilson", "Jackson", "Ericsson", "O'Neil", "García",
+    "Müller", "Nguyen", "Kowalski", "Smith-Jones", "van der Berg", "Okafor", "Tanaka",
+    "Ivanova", "Dubois", "Rossi", "Haddad", "Fernández-López", "Wolfeschlegelsteinhausenbergerdorff",
+)
+ADDITIONAL_NEEDS = ("Breakfast", "Lunch", "Dinner", "Late checkout", "Extra bed", "Sea view", "")
+# Edge-case prices mixed in with ordinary ones
+EDGE_PRICES = (0, 1, 9999, 99999)
+FIRST_CHECKIN = date(2024, 1, 1)
+
+
+def make_payload(rng: random.Random) -> dict:
+    """Build one valid booking payload from `rng`."""
+    checkin = FIRST_CHECKIN + timedelta(days=rng.randrange(0, 730))
+    roll = rng.random()
+    if roll < 0.05:
+        nights = 365
+    elif roll < 0.15:
+        nights = 1
+    else:
+        nights = rng.randint(2, 21)
+    price = rng.choice(EDGE_PRICES) if rng.random() < 0.1 else rng.randint(50, 500)
+    return {
+        "firstname": rng.choice(FIRST_NAMES),
+        "lastname": rng.choice(LAST_NAMES),
+        "totalprice": price,
+        "depositpaid": rng.random() < 0.5,
+        "bookingdates": {
+            "checkin": checkin.isoformat(),
+            "checkout": (checkin + timedelta(days=nights)).isoformat(),
+        },
+        "additionalneeds": rng.choice(ADDITIONAL_NEEDS),
+    }
+
+
+class PayloadPool:
+    """
+    Fixed, indexable collection of booking payloads.
+
+    Attributes:
+        seed (int): Seed the pool was generated from.
+    """
+
+    def __init__(self, seed: int, offsets: array, records, source=None):
+        self.seed = seed
+        self._offsets = offsets
+        self._records = records
+        self._source = source
+        self._cursor = itertools.count()
+
+    @classmethod
+    def generate(cls, size: int, seed: int = 0) -> "PayloadPool":
+        """Generate `size` payloads from `seed`."""
+        rng = random.Random(seed)
+        offsets = array("I", [0])
+        chunks = []
+        position = 0
+        for _ in range(size):
+            record = json.dumps(make_payload(rng), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            chunks.append(record)
+            position += len(record)
+            offsets.append(position)
+        return cls(seed, offsets, b"".join(chunks))
+
+    @classmethod
+    def load(cls, path: str) -> "PayloadPool":
+        """Open a saved pool with mmap; records are read from the page cache on access."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, seed, count = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not a payload pool file")
+        offsets = array("I")
+        table_start = _HEADER.size
+        table_end = table_start + (count + 1) * offsets.itemsize
+        offsets.frombytes(mapped[table_start:table_end])
+        return cls(seed, offsets, memoryview(mapped)[table_end:], source=mapped)
+
+    @classmethod
+    def open(cls, path: Optional[str], size: int, seed: int = 0) -> "PayloadPool":
+        """Load `path` if it holds a pool for (size, seed); otherwise generate and save it."""
+        if path and os.path.exists(path):
+            try:
+                pool = cls.load(path)
+                if pool.seed == seed and len(pool) == size:
+                    return pool
+                pool.close()
+            except (OSError, ValueError, struct.error):
+                pass
+        pool = cls.generate(size, seed)
+        if path:
+            pool.save(path)
+        return pool
+
+    def save(self, path: str):
+        """Write the pool to `path` (atomically replaced)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.seed, len(self)))
+            f.write(self._offsets.tobytes())
+            f.write(self._records)
+        os.replace(tmp, path)
+
+    def close(self):
+        """Release the mmap of a loaded pool."""
+        if self._source is not None:
+            self._records.release()
+            self._source.close()
+            self._source = None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> dict:
+        """Payload `index` (wrapping around), decoded into a new dict."""
+        index %= len(self)
+        return json.loads(bytes(self._records[self._offsets[index]:self._offsets[index + 1]]))
+
+    def next(self) -> dict:
+        """Hand out payloads round-robin; safe to call from several threads."""
+        return self[next(self._cursor)]
+
+    def sample(self, n: int, start: int = 0) -> List[dict]:
+        """`n` consecutive payloads starting at `start`."""
+        return [self[i] for i in range(start, start + n)]
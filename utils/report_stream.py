@@ -0,0 +1,290 @@
+"""
+Streaming test report: line-delimited JSON written as tests finish, rendered to
+paginated HTML afterwards.
+
+StreamingReportPlugin appends one JSON line per test to the report file at the
+end of its teardown -- outcome, phase durations, failure text and the test's
+captured API calls (utils/capture.py) -- and flushes it straight to the OS, so
+nothing accumulates in memory and a crashed run still leaves every finished
+test in the file. Lines are written with a single O_APPEND write, which lets
+pytest-xdist workers share one file. Request/response bodies are included for
+failed tests only by default.
+
+render_html() reads the file line by line and writes an index page plus one
+HTML page per `page_size` tests, holding at most one page in memory:
+
+    pytest --report-jsonl=report.jsonl --report-html-dir=report/
+    python -m utils.report_stream render report.jsonl report/ --page-size 500
+
+Line types: {"type": "session"} starts a run, {"type": "test"} is one test and
+{"type": "summary"} marks a run that finished (missing after a crash).
+"""
+
+import argparse
+import html as html_lib
+import json
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+import pytest
+
+BODY_MODES = ("failed", "all", "none")
+
+
+def _call_entry(record, bodies: bool) -> dict:
+    entry = {
+        "method": record.method,
+        "url": record.url,
+        "status": record.status,
+        "duration": round(record.duration, 6),
+    }
+    if record.exception:
+        entry["exception"] = record.exception
+    if record.timed_out:
+        entry["timed_out"] = record.timed_out
+    if bodies:
+        entry["request_body"] = record.request_body
+        entry["response_body"] = record.response_body
+        for key, content in (("request_spill", record.request_content),
+                             ("response_spill", record.response_content)):
+            if content.spill_path:
+                entry[key] = content.spill_path
+    return entry
+
+
+class ReportWriter:
+    """Append JSON lines to a report file, one write() per line."""
+
+    def __init__(self, path: str, truncate: bool = False):
+        self.path = path
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        self._fd = os.open(path, flags, 0o644)
+        self._lock = threading.Lock()
+
+    def write(self, entry: dict):
+        line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        with self._lock:
+            os.write(self._fd, line)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class StreamingReportPlugin:
+    """
+    pytest plugin writing one report line per test.
+
+    Attributes:
+        writer (ReportWriter): Open report file.
+        bodies (str): "failed", "all" or "none" -- which tests get API call bodies.
+        html_dir (str | None): Directory the HTML view is rendered to at session end.
+    """
+
+    def __init__(self, path: str, bodies: str = "failed", controller: bool = True,
+                 html_dir: Optional[str] = None, page_size: int = 500):
+        """
+        Args:
+            path (str): Report file (JSON lines).
+            bodies (str): Which tests get request/response bodies in their calls.
+            controller (bool): False in pytest-xdist workers; only the controller
+                starts a new file, writes the session/summary lines and renders HTML.
+            html_dir (str | None): Render the HTML view here when the session ends.
+            page_size (int): Tests per HTML page.
+        """
+        self.path = path
+        self.writer = ReportWriter(path, truncate=controller)
+        self.bodies = bodies
+        self.controller = controller
+        self.html_dir = html_dir
+        self.page_size = page_size
+        self._started = time.time()
+        # Reports of the test currently running, keyed by phase
+        self._phases = {}
+        if controller:
+            self.writer.write({"type": "session", "started": self._started})
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        self._phases[report.when] = report
+        if report.when == "teardown":
+            self.writer.write(self.entry(item, self._phases))
+            self._phases = {}
+
+    def entry(self, item, phases: dict) -> dict:
+        """Build the report line for `item` from its setup/call/teardown reports."""
+        outcome = "passed"
+        longrepr = []
+        for when in ("setup", "call", "teardown"):
+            report = phases.get(when)
+            if report is None:
+                continue
+            if report.failed:
+                outcome = "failed" if when == "call" else "error"
+                longrepr.append(f"[{when}] {report.longreprtext}")
+            elif report.skipped and outcome == "passed":
+                outcome = "xfailed" if hasattr(report, "wasxfail") else "skipped"
+                longrepr.append(report.longreprtext)
+        call_report = phases.get("call")
+        if outcome == "passed" and call_report is not None and hasattr(call_report, "wasxfail"):
+            outcome = "xpassed"
+
+        calls = getattr(item, "_api_calls", None) or []
+        bodies = self.bodies == "all" or (self.bodies == "failed" and outcome in ("failed", "error"))
+        entry = {
+            "type": "test",
+            "nodeid": item.nodeid,
+            "outcome": outcome,
+            "duration": round(sum(r.duration for r in phases.values()), 6),
+            "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+            "calls": [_call_entry(c, bodies) for c in calls],
+        }
+        if getattr(calls, "dropped", 0):
+            entry["calls_dropped"] = calls.dropped
+        if longrepr:
+            entry["longrepr"] = "\n".join(longrepr)
+        return entry
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if not self.controller:
+            return
+        self.writer.write({"type": "summary", "exitstatus": int(exitstatus),
+                           "duration": round(time.time() - self._started, 3)})
+        if self.html_dir:
+            render_html(self.path, self.html_dir, self.page_size)
+
+    def pytest_unconfigure(self, config):
+        self.writer.close()
+
+
+def iter_report(path: str) -> Iterator[dict]:
+    """Yield the lines of a report file; a torn last line (crashed run) is skipped."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+_STYLE = (
+    "body{font-family:sans-serif;margin:1em}table{border-collapse:collapse}"
+    "td,th{border:1px solid #ccc;padding:4px;vertical-align:top}"
+    ".passed{color:#080}.failed,.error{color:#c00}.skipped,.xfailed,.xpassed{color:#a60}"
+    "pre{white-space:pre-wrap;max-width:1000px}"
+)
+
+
+def _esc(value) -> str:
+    return html_lib.escape(str("" if value is None else value))
+
+
+def _page_name(number: int) -> str:
+    return f"page-{number:04d}.html"
+
+
+def _test_row(entry: dict) -> str:
+    outcome = entry.get("outcome", "")
+    details = []
+    if entry.get("longrepr"):
+        details.append(f"<details><summary>failure</summary><pre>{_esc(entry['longrepr'])}</pre></details>")
+    calls = entry.get("calls") or []
+    if calls or entry.get("calls_dropped"):
+        rows = []
+        if entry.get("calls_dropped"):
+            rows.append(f"<tr><td colspan='4'>... {entry['calls_dropped']} earlier calls not kept</td></tr>")
+        for c in calls:
+            body = ""
+            if "request_body" in c or "response_body" in c:
+                body = (f"<details><summary>bodies</summary><pre>{_esc(c.get('request_body'))}</pre>"
+                        f"<pre>{_esc(c.get('response_body'))}</pre></details>")
+            rows.append(f"<tr><td>{_esc(c['method'])}</td><td>{_esc(c['url'])}</td>"
+                        f"<td>{_esc(c['status'])} {_esc(c.get('exception'))}</td>"
+                        f"<td>{c['duration'] * 1000:.1f} ms{body}</td></tr>")
+        details.append(f"<details><summary>{len(calls)} API calls</summary>"
+                       f"<table>{''.join(rows)}</table></details>")
+    return (f"<tr><td>{_esc(entry.get('nodeid'))}</td><td class='{_esc(outcome)}'>{_esc(outcome)}</td>"
+            f"<td>{entry.get('duration', 0):.3f}s</td><td>{''.join(details)}</td></tr>")
+
+
+def _write_page(out_dir: str, number: int, pages_hint: str, rows: list):
+    with open(os.path.join(out_dir, _page_name(number)), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Tests, page {number}</title>"
+                f"<style>{_STYLE}</style></head><body><p><a href='index.html'>index</a>{pages_hint}</p>"
+                "<table><thead><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Details</th></tr></thead><tbody>")
+        f.writelines(rows)
+        f.write("</tbody></table></body></html>")
+
+
+def render_html(path: str, out_dir: str, page_size: int = 500) -> dict:
+    """
+    Render a report file to `out_dir`/index.html plus one page per `page_size` tests.
+
+    Returns:
+        dict: {"tests": n, "pages": n, "outcomes": {outcome: n}, "complete": bool}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    outcomes = {}
+    failures = []
+    rows = []
+    pages = 0
+    tests = 0
+    summary: Optional[dict] = None
+    for entry in iter_report(path):
+        kind = entry.get("type")
+        if kind == "summary":
+            summary = entry
+        if kind != "test":
+            continue
+        tests += 1
+        outcome = entry.get("outcome", "unknown")
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        rows.append(_test_row(entry))
+        if outcome in ("failed", "error"):
+            # Only ids and page numbers are kept for the index, not the rows
+            failures.append((entry.get("nodeid"), pages + 1))
+        if len(rows) >= page_size:
+            pages += 1
+            _write_page(out_dir, pages, f" | <a href='{_page_name(pages + 1)}'>next</a>", rows)
+            rows = []
+    # Always written: the previous full page already links to it
+    pages += 1
+    _write_page(out_dir, pages, "", rows)
+
+    status = ("finished in {:.1f}s".format(summary["duration"]) if summary
+              else "incomplete: the run did not finish")
+    counts = ", ".join(f"{n} {name}" for name, n in sorted(outcomes.items()))
+    links = " ".join(f"<a href='{_page_name(i)}'>{i}</a>" for i in range(1, pages + 1))
+    failed = "".join(f"<li><a href='{_page_name(page)}'>{_esc(nodeid)}</a></li>" for nodeid, page in failures)
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Test report</title>"
+                f"<style>{_STYLE}</style></head><body><h1>Test report</h1>"
+                f"<p>{tests} tests: {_esc(counts)} ({_esc(status)})</p><p>Pages: {links}</p>"
+                + (f"<h2>Failures</h2><ul>{failed}</ul>" if failed else "")
+                + "</body></html>")
+    return {"tests": tests, "pages": pages, "outcomes": outcomes, "complete": summary is not None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render streaming test reports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    render = sub.add_parser("render", help="Render a JSON-lines report to paginated HTML.")
+    render.add_argument("report")
+    render.add_argument("out_dir")
+    render.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    result = render_html(args.report, args.out_dir, args.page_size)
+    print(f"{result['tests']} tests on {result['pages']} pages -> "
+          f"{os.path.join(args.out_dir, 'index.html')}"
+          + ("" if result["complete"] else " (run did not finish)"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""
+Test data isolation and cleanup for parallel (pytest-xdist) runs.
+
+ResourceTracker listens to the shared call recorder (utils/capture.py): every
+successful POST /booking registers the new booking, tagged with the xdist worker
+and the test that created it, and every successful DELETE /booking/{id}
+unregisters it. Whatever is left at the end of the session -- bookings leaked by
+failing or careless tests -- is deleted in batches of concurrent requests by
+cleanup(), which conftest.py calls from pytest_sessionfinish.
+
+unique_name() makes generated names collision-free across workers and runs.
+"""
+
+import itertools
+import json
+import os
+import secrets
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import config
+
+# Shared by every xdist worker of one run; random for a plain pytest run
+RUN_ID = (os.getenv("PYTEST_XDIST_TESTRUNUID") or secrets.token_hex(4))[:8]
+
+_name_counter = itertools.count(1)
+
+
+def worker_id() -> str:
+    """The pytest-xdist worker id ("gw0", "gw1", ...), or "main" without xdist."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def unique_name(prefix: str) -> str:
+    """Return `prefix` tagged with the run, worker and a per-process counter."""
+    return f"{prefix}-{RUN_ID}-{worker_id()}-{next(_name_counter)}"
+
+
+class TrackedBooking:
+    __slots__ = ("base_url", "booking_id", "worker", "owner")
+
+    def __init__(self, base_url: str, booking_id: int, worker: str, owner: Optional[str]):
+        self.base_url = base_url
+        self.booking_id = booking_id
+        self.worker = worker
+        self.owner = owner
+
+
+class ResourceTracker:
+    """
+    Registry of bookings created during the session that still exist.
+
+    Attributes:
+        owner (str | None): Node id of the running test; set by conftest.py and
+            recorded on every booking created while it runs.
+    """
+
+    def __init__(self):
+        self.owner: Optional[str] = None
+        self._items: Dict[Tuple[str, int], TrackedBooking] = {}
+        self._lock = threading.Lock()
+
+    def track(self, base_url: str, booking_id: int, owner: Optional[str] = None):
+        """Register a booking for cleanup."""
+        item = TrackedBooking(base_url, booking_id, worker_id(), owner or self.owner)
+        with self._lock:
+            self._items[(base_url, booking_id)] = item
+
+    def untrack(self, base_url: str, booking_id: int):
+        """Forget a booking (it was deleted)."""
+        with self._lock:
+            self._items.pop((base_url, booking_id), None)
+
+    def forget(self, base_url: str):
+        """Drop every booking of `base_url`, e.g. when a stand-in server shut down."""
+        with self._lock:
+            for key in [k for k in self._items if k[0] == base_url]:
+                del self._items[key]
+
+    def leftovers(self) -> List[TrackedBooking]:
+        with self._lock:
+            return list(self._items.values())
+
+    def on_call(self, record):
+        """CallRecorder listener: track creations and deletions of bookings."""
+        if record.status is None or record.status >= 300:
+            return
+        parts = urlsplit(record.url)
+        path = parts.path.rstrip("/")
+        base_url = f"{parts.scheme}://{parts.netloc}{path.rsplit('/booking', 1)[0]}"
+        if record.method == "POST" and path.endswith("/booking"):
+            data = record.response_content.data
+            if not data or record.response_content.truncated:
+                return
+            try:
+                booking_id = json.loads(data).get("bookingid")
+            except (ValueError, AttributeError):
+                return
+            if booking_id is not None:
+                self.track(base_url, booking_id)
+        elif record.method == "DELETE" and "/booking/" in path:
+            tail = path.rsplit("/", 1)[-1]
+            if tail.isdigit():
+                self.untrack(base_url, int(tail))
+
+    def cleanup(self, batch_size: int = 100, max_in_flight: int = None) -> dict:
+        """
+        Delete every leftover booking, in concurrent batches per target API.
+
+        Returns:
+            dict: {"deleted": n, "failed": n, "owners": {nodeid: leaked count}}.
+        """
+        from api.booking_api import BookingAPI
+
+        leftovers = self.leftovers()
+        owners: Dict[str, int] = {}
+        for item in leftovers:
+            owners[item.owner or "<outside tests>"] = owners.get(item.owner or "<outside tests>", 0) + 1
+        by_base: Dict[str, List[int]] = {}
+        for item in leftovers:
+            by_base.setdefault(item.base_url, []).append(item.booking_id)
+
+        deleted = failed = 0
+        for base_url, ids in by_base.items():
+            api = BookingAPI(base_url)
+            try:
+                api.authenticate(config.USERNAME, config.PASSWORD)
+            except Exception:
+                failed += len(ids)
+                continue
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                kwargs = {"max_in_flight": max_in_flight} if max_in_flight else {}
+                for result in api.delete_bookings(batch, **kwargs):
+                    # 405: already gone, nothing left to clean up
+                    if result.ok or getattr(result.response, "status_code", None) == 405:
+                        deleted += 1
+                        self.untrack(base_url, result.item)
+                    else:
+                        failed += 1
+        return {"deleted": deleted, "failed": failed, "owners": owners}
+
+
+# Shared tracker wired into the recorder by conftest.py
+resource_tracker = ResourceTracker()